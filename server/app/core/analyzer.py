@@ -1,10 +1,22 @@
-import os
 import re
 from pathlib import Path
 from typing import Tuple, List, Dict, Set
 from pygments.lexers import guess_lexer
 from pygments.util import ClassNotFound
 
+from app.core.js_source import extract_js_packages
+from app.core.languages import get_extension, language_from_extension, resolve_language
+from app.core.python_source import parse_python_source
+
+# Extensions reported as React flavours of their base language
+REACT_LANGUAGES = {
+    '.jsx': 'JavaScript/React',
+    '.tsx': 'TypeScript/React',
+}
+
+# Python standard modules not reported as libraries
+PYTHON_STANDARD_LIBS = {'os', 'sys', 're', 'json', 'time', 'datetime', 'math', 'random', 'typing'}
+
 def analyze_code(file_path: str) -> Tuple[str, List[str]]:
     """
     Analyze code file to detect language and libraries used
@@ -15,12 +27,8 @@ def analyze_code(file_path: str) -> Tuple[str, List[str]]:
     Returns:
         Tuple[str, List[str]]: Detected language and list of libraries
     """
-    # Get file extension
-    _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
-    
-    # Determine language based on extension
-    language = determine_language(ext)
+    # Determine language based on extension, reporting React variants separately
+    language = REACT_LANGUAGES.get(get_extension(file_path)) or resolve_language(file_path)
     
     # Read file content
     with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -49,31 +57,11 @@ def determine_language(ext: str) -> str:
     Returns:
         str: Detected language
     """
-    language_map = {
-        '.py': 'Python',
-        '.js': 'JavaScript',
-        '.jsx': 'JavaScript/React',
-        '.ts': 'TypeScript',
-        '.tsx': 'TypeScript/React',
-        '.html': 'HTML',
-        '.css': 'CSS',
-        '.scss': 'SCSS',
-        '.sass': 'Sass',
-        '.less': 'Less',
-        '.php': 'PHP',
-        '.java': 'Java',
-        '.rb': 'Ruby',
-        '.go': 'Go',
-        '.rs': 'Rust',
-        '.c': 'C',
-        '.cpp': 'C++',
-        '.cs': 'C#',
-        '.swift': 'Swift',
-        '.kt': 'Kotlin',
-        '.dart': 'Dart',
-    }
+    # React variants are reported separately so JSX can be detected
+    if ext in REACT_LANGUAGES:
+        return REACT_LANGUAGES[ext]
     
-    return language_map.get(ext, 'Unknown')
+    return language_from_extension(ext) or 'Unknown'
 
 def detect_libraries(content: str, language: str) -> List[str]:
     """
@@ -88,8 +76,16 @@ def detect_libraries(content: str, language: str) -> List[str]:
     """
     libraries = set()
     
-    if language == 'Python':
-        # Match import statements
+    python_source = parse_python_source(content) if language == 'Python' else None
+    
+    if python_source is not None:
+        # Imports of the parsed module
+        for lib in python_source.imports:
+            if lib not in PYTHON_STANDARD_LIBS:
+                libraries.add(lib)
+    
+    elif language == 'Python':
+        # Code that does not parse: match import statements
         import_patterns = [
             r'import\s+(\w+)',
             r'from\s+(\w+)(?:\.\w+)?\s+import',
@@ -99,28 +95,19 @@ def detect_libraries(content: str, language: str) -> List[str]:
         for pattern in import_patterns:
             for match in re.finditer(pattern, content):
                 lib = match.group(1)
-                if lib not in ['os', 'sys', 're', 'json', 'time', 'datetime', 'math', 'random', 'typing']:
+                if lib not in PYTHON_STANDARD_LIBS:
                     libraries.add(lib)
     
     elif language in ['JavaScript', 'JavaScript/React', 'TypeScript', 'TypeScript/React']:
-        # Match import statements and require calls
-        import_patterns = [
-            r'import\s+.*\s+from\s+[\'"]([^\.][^\'"/]+)[\'"]',
-            r'import\s+[\'"]([^\.][^\'"/]+)[\'"]',
-            r'require\([\'"]([^\.][^\'"/]+)[\'"]\)',
-        ]
-        
-        for pattern in import_patterns:
-            for match in re.finditer(pattern, content):
-                lib = match.group(1)
-                libraries.add(lib)
-        
-        # Check for React
-        if 'import React' in content or 'from \'react\'' in content or 'from "react"' in content:
-            libraries.add('react')
+        # Module specifiers of imports, re-exports and require calls. React is
+        # found by its specifier; text like "import React" is no longer
+        # matched, as it also matched comments and React imported from
+        # other packages.
+        is_jsx = language in ('JavaScript/React', 'TypeScript/React')
+        libraries.update(extract_js_packages(content, jsx=is_jsx))
         
         # Check for JSX
-        if '</' in content and '>' in content and (language == 'JavaScript/React' or language == 'TypeScript/React'):
+        if '</' in content and '>' in content and is_jsx:
             libraries.add('jsx')
     
     # Convert set to sorted list
@@ -0,0 +1,148 @@
+"""
+Precomputed skill catalog responses
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional
+
+from starlette.responses import Response
+
+from app.core.skill_index import normalize_token
+
+# Registry view holding the catalog payloads
+CATALOG_VIEW = "catalog"
+
+# Seconds clients may reuse a catalog response before revalidating it
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "300"))
+
+@dataclass(frozen=True)
+class CatalogPayload:
+    """A serialized catalog response and its strong ETag"""
+    body: bytes
+    etag: str
+
+def make_payload(content: Any) -> CatalogPayload:
+    """
+    Serialize a response body the way FastAPI's JSONResponse does
+
+    Args:
+        content: JSON-serializable content
+
+    Returns:
+        CatalogPayload: Serialized body with its ETag
+    """
+    body = json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    return CatalogPayload(body=body, etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+
+def summarize_skill(skill_name: str, skill_info: Mapping[str, Any]) -> Dict[str, str]:
+    """
+    Get the catalog entry of a skill
+
+    Args:
+        skill_name: Skill key in resources.json
+        skill_info: Skill information
+
+    Returns:
+        Dict[str, str]: Name and description of the skill
+    """
+    return {
+        "name": skill_info.get("name", skill_name.title()),
+        "description": skill_info.get("description", f"{skill_name.title()} programming skill"),
+    }
+
+def group_by_category(resources: Mapping[str, Any], sort: bool) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Group the catalog entries of all skills by category
+
+    Args:
+        resources: Resources by skill
+        sort: Whether to sort the skills of each category by name
+
+    Returns:
+        Dict[str, List[Dict[str, str]]]: Skills by category
+    """
+    skills_by_category: Dict[str, List[Dict[str, str]]] = {}
+    for skill_name, skill_info in resources.items():
+        category = skill_info.get("category", "Other")
+        skills_by_category.setdefault(category, []).append(summarize_skill(skill_name, skill_info))
+
+    if sort:
+        for skills in skills_by_category.values():
+            skills.sort(key=lambda x: x["name"])
+
+    return skills_by_category
+
+def build_catalog(resources: Mapping[str, Any], skill_rules: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Build the catalog payloads of a registry snapshot
+
+    Args:
+        resources: Resources by skill
+        skill_rules: Skill rules
+
+    Returns:
+        Dict[str, Any]: Payloads of the catalog lists, and of each known
+            skill under "resources", by the skill's token in the skill index
+    """
+    skills = []
+    for skill_name, skill_info in resources.items():
+        entry = summarize_skill(skill_name, skill_info)
+        skills.append({
+            "name": entry["name"],
+            "category": skill_info.get("category", "Other"),
+            "description": entry["description"],
+        })
+    skills.sort(key=lambda x: x["name"])
+
+    return {
+        "skills": make_payload({"skills": skills}),
+        "skill_categories": make_payload({"categories": group_by_category(resources, sort=True)}),
+        "resource_categories": make_payload({"categories": group_by_category(resources, sort=False)}),
+        "resources": {
+            normalize_token(skill_name): make_payload(skill_info) for skill_name, skill_info in resources.items()
+        },
+    }
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+
+    Args:
+        if_none_match: Header value, if sent
+        etag: Current ETag
+
+    Returns:
+        bool: Whether the client's copy is current
+    """
+    if not if_none_match:
+        return False
+
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def catalog_response(payload: CatalogPayload, if_none_match: Optional[str] = None) -> Response:
+    """
+    Serve a catalog payload, or 304 if the client's copy is current
+
+    Args:
+        payload: Precomputed payload
+        if_none_match: If-None-Match request header
+
+    Returns:
+        Response: JSON or Not Modified response
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": f"public, max-age={CATALOG_MAX_AGE}"}
+
+    if etag_matches(if_none_match, payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=payload.body, media_type="application/json", headers=headers)
@@ -0,0 +1,307 @@
+"""
+Linear-time extraction of module imports from JavaScript and TypeScript
+"""
+import re
+from typing import Dict, List, Optional
+
+# One token, after any whitespace. Every alternative either matches in a
+# single forward pass or stops at the end of the line, so scanning never
+# backtracks over the rest of the file.
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<string>'[^'\\\n]*(?:\\[\s\S][^'\\\n]*)*'?|"[^"\\\n]*(?:\\[\s\S][^"\\\n]*)*"?)
+  | (?P<template>`)
+  | (?P<name>[^\W\d][\w$]*|\$[\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<punct>\S)
+)""", re.VERBOSE)
+
+# Whitespace before a token
+_SPACE = re.compile(r"\s*")
+
+# Text of a template literal up to its end or its next substitution
+_TEMPLATE_TEXT = re.compile(r"[^`\\$]*(?:(?:\\[\s\S]|\$(?!\{))[^`\\$]*)*")
+
+# A regular expression literal, which cannot span lines
+_REGEX_LITERAL = re.compile(r"/[^/\\\[\n]*(?:(?:\\.|\[[^\]\\\n]*(?:\\.[^\]\\\n]*)*\])[^/\\\[\n]*)*/[\w$]*")
+
+# Keywords after which a "/" starts a regular expression rather than a division
+_REGEX_KEYWORDS = {
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void",
+    "throw", "case", "do", "else", "yield", "await",
+}
+
+# Declarations that follow "export" without a module specifier
+_EXPORT_DECLARATIONS = {
+    "const", "let", "var", "function", "class", "default", "async", "enum",
+    "interface", "abstract", "declare", "namespace", "module",
+}
+
+# Tokens that cannot occur in an import or export clause
+_CLAUSE_END = {";", "(", "="}
+
+# Extensions of files that may hold JSX
+JSX_EXTENSIONS = {".jsx", ".tsx"}
+
+# The name of a JSX element, after "<" or "</"; empty for fragments
+_JSX_TAG = re.compile(r"<\s*(?P<closing>/)?\s*(?P<name>[^\s{}<>/=,\"']*)")
+
+# One part of a JSX tag after its name: an attribute name or value, or
+# the "/>" or ">" that ends it
+_JSX_ATTRIBUTE = re.compile(r"""\s*(?:
+    (?P<end>/?>)
+  | (?P<expression>\{)
+  | "[^"]*"?|'[^']*'?
+  | [^\s{}<>/="']+
+  | [\s\S]
+)""", re.VERBOSE)
+
+# Text between JSX tags
+_JSX_TEXT = re.compile(r"[^<{]*")
+
+# What follows the type parameter of a generic arrow function in TSX
+_TYPE_PARAMETER = re.compile(r"\s*(?:,|extends\b)")
+
+def scan_module_specifiers(content: str, jsx: bool = False) -> List[str]:
+    """
+    Find the module specifiers a file imports
+
+    Covers static imports ("import x from 'm'", "import 'm'"), re-exports
+    ("export * from 'm'", "export { x } from 'm'"), dynamic "import('m')"
+    and "require('m')". Strings, comments, template literals and regular
+    expressions are skipped, so text inside them never counts. With jsx,
+    so are the tags and text of JSX elements, but not their embedded
+    expressions. Without it, JSX text is read as code.
+
+    Args:
+        content: JavaScript or TypeScript source code
+        jsx: Whether the file may hold JSX, as .jsx and .tsx files do
+
+    Returns:
+        List[str]: Specifiers in first-seen order, without duplicates
+    """
+    if "import" not in content and "require" not in content and "from" not in content:
+        return []
+
+    specifiers = {}
+    _scan_code(content, 0, specifiers, jsx, nested=False)
+    return list(specifiers)
+
+def _skip_jsx_element(content: str, position: int, specifiers: Dict[str, None]) -> Optional[int]:
+    """
+    Skip a JSX element with everything nested in it
+
+    Args:
+        content: Source code
+        position: Index of the element's "<"
+        specifiers: Specifiers found so far, extended with those imported
+            by expressions embedded in the element
+
+    Returns:
+        Optional[int]: Index after the element, or None if the "<" opens
+            the type parameters of a generic arrow function instead
+    """
+    length = len(content)
+    depth = 0
+    while True:
+        tag = _JSX_TAG.match(content, position)
+        if depth == 0 and tag.group("name") and _TYPE_PARAMETER.match(content, tag.end()):
+            return None
+        position = tag.end()
+
+        # Attributes, up to the end of the tag
+        end = None
+        while position < length:
+            part = _JSX_ATTRIBUTE.match(content, position)
+            position = part.end()
+            if part.lastgroup == "end":
+                end = part.group("end")
+                break
+            if part.lastgroup == "expression":
+                position = _scan_code(content, position, specifiers, jsx=True, nested=True)
+
+        if tag.group("closing"):
+            depth -= 1
+        elif end == ">":
+            depth += 1
+        if depth <= 0 or position >= length:
+            return position
+
+        # Children: text, embedded expressions and nested elements
+        position = _JSX_TEXT.match(content, position).end()
+        while content.startswith("{", position):
+            position = _scan_code(content, position + 1, specifiers, jsx=True, nested=True)
+            position = _JSX_TEXT.match(content, position).end()
+        if position >= length:
+            return position
+
+def _scan_code(content: str, position: int, specifiers: Dict[str, None], jsx: bool, nested: bool) -> int:
+    """
+    Scan code for module specifiers
+
+    Args:
+        content: Source code
+        position: Index to start at
+        specifiers: Specifiers found so far, extended in place
+        jsx: Whether "<" may open a JSX element
+        nested: Whether the code is a JSX expression, which ends at the
+            first unmatched "}"
+
+    Returns:
+        int: Index after the code
+    """
+    # Closing braces of template substitutions ("`") and of code blocks ("{")
+    braces: List[str] = []
+    # What the previous significant token was, to tell keywords from
+    # property names and regular expressions from divisions
+    previous = ""
+    regex_allowed = True
+    # Parser state: None, or which part of an import form comes next
+    expecting: Optional[str] = None
+
+    length = len(content)
+    while position < length:
+        if regex_allowed:
+            position = _SPACE.match(content, position).end()
+            if jsx and content.startswith("<", position):
+                end = _skip_jsx_element(content, position, specifiers)
+                if end is not None:
+                    position = end
+                    previous, regex_allowed, expecting = "jsx", False, None
+                    continue
+            if content.startswith("/", position) and not content.startswith(("//", "/*"), position):
+                match = _REGEX_LITERAL.match(content, position)
+                if match:
+                    position = match.end()
+                    previous, regex_allowed, expecting = "regex", False, None
+                    continue
+
+        match = _TOKEN.match(content, position)
+        if match is None:
+            # Only whitespace is left
+            break
+        kind = match.lastgroup
+        position = match.end()
+        value = match.group(kind)
+
+        if kind == "comment":
+            continue
+
+        if kind == "template" or (kind == "punct" and value == "}" and braces and braces[-1] == "`"):
+            if kind == "punct":
+                braces.pop()
+            # Skip template text; stop at its end or at the next substitution
+            position = _TEMPLATE_TEXT.match(content, position).end()
+            if content.startswith("${", position):
+                braces.append("`")
+                position += 2
+                previous, regex_allowed = "${", True
+            else:
+                position += 1
+                previous, regex_allowed = "template", False
+            expecting = None
+            continue
+
+        if kind == "string":
+            if expecting in ("specifier", "call", "from-string") and len(value) >= 2 and value[-1] == value[0]:
+                specifiers.setdefault(value[1:-1], None)
+                expecting = None
+            elif expecting != "clause":
+                expecting = None
+            previous, regex_allowed = "string", False
+            continue
+
+        if kind == "name":
+            is_keyword = previous != "."
+            if expecting == "clause":
+                if value == "from":
+                    expecting = "from-string"
+            elif expecting == "from-string":
+                # "from" was an imported name
+                expecting = "from-string" if value == "from" else "clause"
+            elif expecting == "specifier":
+                # Default or namespace import: its clause ends in "from"
+                expecting = "clause"
+            elif expecting == "export":
+                expecting = None if value in _EXPORT_DECLARATIONS else "clause"
+            elif is_keyword and value == "import":
+                expecting = "specifier"
+            elif is_keyword and value == "export":
+                expecting = "export"
+            elif is_keyword and value == "require":
+                expecting = "require"
+            else:
+                expecting = None
+            previous = value
+            regex_allowed = value in _REGEX_KEYWORDS
+            continue
+
+        if kind == "number":
+            expecting = None
+            previous, regex_allowed = "number", False
+            continue
+
+        # Punctuation
+        if value == "{":
+            braces.append("{")
+        elif value == "}" and braces:
+            braces.pop()
+        elif value == "}" and nested:
+            return position
+
+        if expecting == "specifier":
+            # "import(" is dynamic, "import." is import.meta, anything else opens a clause
+            expecting = "call" if value == "(" else None if value == "." else "clause"
+        elif expecting == "require":
+            expecting = "call" if value == "(" else None
+        elif expecting == "export":
+            expecting = "clause"
+        elif expecting == "from-string":
+            expecting = None if value in _CLAUSE_END else "clause"
+        elif expecting != "clause" or value in _CLAUSE_END:
+            expecting = None
+
+        previous = value
+        regex_allowed = value not in (")", "]", "}")
+
+    return length
+
+def package_name(specifier: str) -> Optional[str]:
+    """
+    Get the package a module specifier refers to
+
+    Args:
+        specifier: Module specifier, e.g. "lodash/fp" or "@angular/core"
+
+    Returns:
+        Optional[str]: Package name ("lodash", "@angular/core"), without a
+            "node:" prefix, or None for relative paths, URLs and path aliases
+    """
+    if not specifier or specifier[0] in "./~#" or "://" in specifier or specifier.startswith("@/"):
+        return None
+
+    if specifier.startswith("node:"):
+        specifier = specifier[len("node:"):]
+
+    parts = specifier.split("/")
+    if specifier.startswith("@"):
+        return "/".join(parts[:2])
+    return parts[0]
+
+def extract_js_packages(content: str, jsx: bool = False) -> List[str]:
+    """
+    Get the packages a JavaScript or TypeScript file imports
+
+    Args:
+        content: JavaScript or TypeScript source code
+        jsx: Whether the file may hold JSX, as .jsx and .tsx files do
+
+    Returns:
+        List[str]: Package names in first-seen order, without duplicates
+    """
+    packages = {}
+    for specifier in scan_module_specifiers(content, jsx):
+        name = package_name(specifier)
+        if name:
+            packages.setdefault(name, None)
+    return list(packages)
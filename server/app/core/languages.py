@@ -0,0 +1,131 @@
+"""
+Language resolution shared by upload handling, parsing and skill extraction
+"""
+import os
+from typing import Optional
+
+from app.core.matcher import MultiPatternMatcher
+
+# Language name for each known file extension
+EXTENSION_LANGUAGES = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.jsx': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.tsx': 'TypeScript',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.scss': 'SCSS',
+    '.sass': 'Sass',
+    '.less': 'Less',
+    '.java': 'Java',
+    '.c': 'C',
+    '.cpp': 'C++',
+    '.cs': 'C#',
+    '.go': 'Go',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+    '.rs': 'Rust',
+    '.swift': 'Swift',
+    '.kt': 'Kotlin',
+    '.dart': 'Dart',
+}
+
+# Content patterns used only when the extension is unknown
+LANGUAGE_PATTERNS = {
+    "python": [r'import\s+\w+', r'from\s+\w+\s+import', r'def\s+\w+\(', r'class\s+\w+:'],
+    "javascript": [r'const\s+\w+\s*=', r'let\s+\w+\s*=', r'function\s+\w+\(', r'import\s[^\n]*?\sfrom\b'],
+    "typescript": [r'interface\s+\w+', r'type\s+\w+\s*=', r'const\s+\w+:\s*\w+'],
+    "java": [r'public\s+class', r'private\s+\w+\s+\w+;', r'package\s+\w+'],
+    "html": [r'<!DOCTYPE\s+html>', r'<html', r'<head', r'<body'],
+    "css": [r'\.\w+\s*{', r'#\w+\s*{', r'@media']
+}
+
+# Language names for the keys of LANGUAGE_PATTERNS
+_DETECTED_LANGUAGES = {
+    "python": "Python",
+    "javascript": "JavaScript",
+    "typescript": "TypeScript",
+    "java": "Java",
+    "html": "HTML",
+    "css": "CSS",
+}
+
+_language_matcher = MultiPatternMatcher(LANGUAGE_PATTERNS)
+
+def get_extension(path: str) -> str:
+    """
+    Get the normalized extension of a file path
+
+    Args:
+        path: File path or name
+
+    Returns:
+        str: Lowercase extension including the dot, or an empty string
+    """
+    return os.path.splitext(path)[1].lower()
+
+def language_from_extension(ext: str) -> Optional[str]:
+    """
+    Get language from file extension
+
+    Args:
+        ext: File extension including the dot
+
+    Returns:
+        Optional[str]: Language name or None if the extension is unknown
+    """
+    return EXTENSION_LANGUAGES.get(ext.lower())
+
+def language_key(language: str) -> str:
+    """
+    Get the lowercase key used for a language in skill rules
+
+    Args:
+        language: Language name
+
+    Returns:
+        str: Language key
+    """
+    return language.lower()
+
+def detect_language(code: str) -> str:
+    """
+    Detect the language of code from its content
+
+    Args:
+        code: The code content
+
+    Returns:
+        str: Language key with the most pattern matches, or "unknown"
+    """
+    matches = {
+        language: sum(counts)
+        for language, counts in _language_matcher.count(code).items()
+    }
+
+    language, count = max(matches.items(), key=lambda x: x[1])
+    return language if count else "unknown"
+
+def resolve_language(path: str, content: Optional[str] = None) -> str:
+    """
+    Resolve the language of a file
+
+    The extension is authoritative. Content is only inspected when the
+    extension is unknown.
+
+    Args:
+        path: File path or name
+        content: Optional file content for unknown extensions
+
+    Returns:
+        str: Language name, or "Unknown"
+    """
+    language = language_from_extension(get_extension(path))
+    if language:
+        return language
+
+    if content:
+        return _DETECTED_LANGUAGES.get(detect_language(content), "Unknown")
+
+    return "Unknown"
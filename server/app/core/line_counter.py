@@ -0,0 +1,438 @@
+"""
+In-memory counting of code, comment and blank lines
+"""
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Pattern, Set, Tuple
+
+from app.core.languages import get_extension, language_from_extension
+
+@dataclass(frozen=True)
+class CommentSyntax:
+    """
+    How comments and string literals are written in a language
+
+    Triple-quoted and backtick strings may span lines; other strings end at
+    the end of the line. With docstrings, a string literal that starts the
+    file or follows a colon counts as documentation, like a comment.
+    Expressions interpolated into strings, like f-string fields, are code.
+    With keys, a string followed by a colon is an object key, which is code.
+    """
+    line: Tuple[str, ...] = ()
+    block: Tuple[Tuple[str, str], ...] = ()
+    strings: Tuple[str, ...] = ()
+    # Letters that may prefix a string literal, like r or b, at most two at a time
+    string_prefixes: str = ""
+    docstrings: bool = False
+    # Prefix letters or delimiters of strings that interpolate expressions
+    interpolated: str = ""
+    # What opens an interpolated expression, and the characters that end it
+    interpolation: Tuple[str, str] = ()
+    keys: bool = False
+    # Words that are not code when they are all that is left on a line
+    white_words: Tuple[str, ...] = ()
+
+@dataclass(frozen=True)
+class LineCounts:
+    """Line counts of one file"""
+    code: int
+    comment: int
+    blank: int
+    # Lines holding nothing but string literals
+    string: int = 0
+
+_C_STYLE = CommentSyntax(line=("//",), block=(("/*", "*/"),), strings=('"', "'"))
+_HASH = CommentSyntax(line=("#",), strings=('"', "'"))
+_MARKUP = CommentSyntax(block=(("<!--", "-->"),))
+_SCRIPT = CommentSyntax(
+    line=("//",),
+    block=(("/*", "*/"),),
+    strings=('"', "'", "`"),
+    interpolated="`",
+    interpolation=("${", "}"),
+)
+
+# Characters that are not code when they are all that is left on a line
+WHITE_CHARACTERS = "(),:;[]{}"
+
+# Comment grammar of each language, by the name files are reported under
+COMMENT_SYNTAX = {
+    "Python": CommentSyntax(
+        line=("#",),
+        strings=('"""', "'''", '"', "'"),
+        string_prefixes="rRbBuUfF",
+        docstrings=True,
+        interpolated="fF",
+        interpolation=("{", "}!:"),
+        white_words=("pass",),
+    ),
+    "JavaScript": _SCRIPT,
+    "TypeScript": _SCRIPT,
+    "Go": CommentSyntax(line=("//",), block=(("/*", "*/"),), strings=('"', "'", "`")),
+    "Java": _C_STYLE,
+    "C": _C_STYLE,
+    "C++": _C_STYLE,
+    "C#": _C_STYLE,
+    "Kotlin": _C_STYLE,
+    "Swift": _C_STYLE,
+    "Dart": _C_STYLE,
+    "Scala": _C_STYLE,
+    "Groovy": _C_STYLE,
+    # Single quotes also start lifetimes, so only double quotes delimit strings
+    "Rust": CommentSyntax(line=("//",), block=(("/*", "*/"),), strings=('"',)),
+    "PHP": CommentSyntax(line=("//", "#"), block=(("/*", "*/"),), strings=('"', "'")),
+    "CSS": CommentSyntax(block=(("/*", "*/"),), strings=('"', "'")),
+    "SCSS": _C_STYLE,
+    "Sass": _C_STYLE,
+    "Less": _C_STYLE,
+    "HTML": _MARKUP,
+    "XML": _MARKUP,
+    "Markdown": _MARKUP,
+    "Ruby": _HASH,
+    "Bash": _HASH,
+    "YAML": _HASH,
+    "TOML": _HASH,
+    "Perl": _HASH,
+    "R": _HASH,
+    "PowerShell": CommentSyntax(line=("#",), block=(("<#", "#>"),), strings=('"', "'")),
+    "Docker": _HASH,
+    "Makefile": _HASH,
+    "INI": CommentSyntax(line=(";", "#")),
+    "SQL": CommentSyntax(line=("--",), block=(("/*", "*/"),), strings=("'",), white_words=("begin", "end")),
+    "Lua": CommentSyntax(line=("--",), block=(("--[[", "]]"),), strings=('"', "'")),
+    "JSON": CommentSyntax(strings=('"',), keys=True),
+    "reStructuredText": CommentSyntax(),
+    "Text only": CommentSyntax(),
+}
+
+# Languages of text files the analyzers do not support, named as pygount names them
+LINE_COUNT_EXTENSIONS = {
+    '.md': 'Markdown',
+    '.markdown': 'Markdown',
+    '.rst': 'reStructuredText',
+    '.json': 'JSON',
+    '.yml': 'YAML',
+    '.yaml': 'YAML',
+    '.toml': 'TOML',
+    '.ini': 'INI',
+    '.cfg': 'INI',
+    '.xml': 'XML',
+    '.sh': 'Bash',
+    '.bash': 'Bash',
+    '.sql': 'SQL',
+    '.txt': 'Text only',
+    '.h': 'C',
+    '.hpp': 'C++',
+    '.cc': 'C++',
+    '.cxx': 'C++',
+    '.scala': 'Scala',
+    '.groovy': 'Groovy',
+    '.gradle': 'Groovy',
+    '.kts': 'Kotlin',
+    '.pl': 'Perl',
+    '.ps1': 'PowerShell',
+    '.lua': 'Lua',
+    '.htm': 'HTML',
+}
+
+# Languages of files known by name rather than extension
+LINE_COUNT_FILENAMES = {
+    'Dockerfile': 'Docker',
+    'Makefile': 'Makefile',
+}
+
+def line_count_language(path: str) -> Optional[str]:
+    """
+    Resolve the language lines of a file are counted as
+
+    Args:
+        path: File path or name
+
+    Returns:
+        Optional[str]: Language name, or None if no comment grammar is known
+    """
+    ext = get_extension(path)
+    language = language_from_extension(ext) or LINE_COUNT_EXTENSIONS.get(ext)
+    if language is None:
+        language = LINE_COUNT_FILENAMES.get(os.path.basename(path))
+    return language if language in COMMENT_SYNTAX else None
+
+def _string_pattern(delimiter: str) -> str:
+    """
+    Build the pattern of a string literal
+
+    Args:
+        delimiter: Opening and closing delimiter
+
+    Returns:
+        str: Pattern matching the literal, or the rest of the file or line
+            if it is not closed
+    """
+    quote = re.escape(delimiter)
+    if len(delimiter) > 1:
+        return rf'{quote}[\s\S]*?(?:{quote}|\Z)'
+    if delimiter == '`':
+        return rf'{quote}[^{quote}\\]*(?:\\[\s\S][^{quote}\\]*)*{quote}?'
+    return rf'{quote}[^{quote}\\\n]*(?:\\.[^{quote}\\\n]*)*{quote}?'
+
+# Stand-ins for the text of strings and comments while lines are classified
+_STRING_MARK = "\x00"
+_COMMENT_MARK = "\x01"
+# Marks a line of a string that holds interpolated code
+_CODE_MARK = "\x02"
+
+# Finds code in what is left of a line
+_CODE_CHARACTER = re.compile(rf"[^\s{re.escape(WHITE_CHARACTERS)}{_STRING_MARK}{_COMMENT_MARK}]")
+
+@lru_cache(maxsize=None)
+def _scanner(syntax: CommentSyntax) -> Optional[Pattern]:
+    """
+    Compile the pattern finding the strings and comments of a grammar
+
+    Every alternative ends at its closing delimiter or, if there is none,
+    at the end of the line or file, so scanning is linear. String prefixes
+    are left to _prefix_length, as a pattern starting with them would have
+    to be tried at every letter.
+
+    Args:
+        syntax: Comment grammar
+
+    Returns:
+        Optional[Pattern]: Pattern with "key", "string" and "comment" groups,
+            or None if the language has neither strings nor comments
+    """
+    alternatives = []
+    if syntax.keys:
+        keys = "|".join(
+            rf'{re.escape(quote)}[^{re.escape(quote)}\\\n]*(?:\\.[^{re.escape(quote)}\\\n]*)*{re.escape(quote)}'
+            for quote in syntax.strings
+        )
+        alternatives.append(rf"(?P<key>{keys})(?=\s*:)")
+    if syntax.strings:
+        strings = "|".join(_string_pattern(delimiter) for delimiter in syntax.strings)
+        # Strings come first so markers inside them are skipped
+        alternatives.append(f"(?P<string>{strings})")
+
+    comments = [
+        rf'{re.escape(start)}[\s\S]*?(?:{re.escape(end)}|\Z)' for start, end in syntax.block
+    ] + [rf'{re.escape(marker)}[^\n]*' for marker in syntax.line]
+    if comments:
+        alternatives.append(f"(?P<comment>{'|'.join(comments)})")
+
+    return re.compile('|'.join(alternatives)) if alternatives else None
+
+@lru_cache(maxsize=None)
+def _white_words(syntax: CommentSyntax) -> Optional[Pattern]:
+    """
+    Compile the pattern finding the white words of a grammar
+
+    Args:
+        syntax: Comment grammar
+
+    Returns:
+        Optional[Pattern]: Pattern matching any white word and whatever word
+            characters precede it, or None if there are none
+    """
+    if not syntax.white_words:
+        return None
+    # Checking the start of the word only on a match keeps the search fast
+    return re.compile(rf"(?:{'|'.join(map(re.escape, syntax.white_words))})(?!\w)")
+
+def _is_word_start(content: str, index: int) -> bool:
+    """
+    Check whether a word starts at an index of the content
+
+    Args:
+        content: Text
+        index: Index of the first character
+
+    Returns:
+        bool: True if no word character precedes the index
+    """
+    return index == 0 or not (content[index - 1].isalnum() or content[index - 1] == "_")
+
+def _prefix_length(content: str, start: int, syntax: CommentSyntax) -> int:
+    """
+    Measure the prefix of a string literal
+
+    Args:
+        content: File content
+        start: Index of the literal's opening delimiter
+        syntax: Comment grammar of the file
+
+    Returns:
+        int: Number of prefix letters before the delimiter, or 0 if they
+            are the end of a longer word
+    """
+    length = 0
+    while length < 2 and start > length and content[start - length - 1] in syntax.string_prefixes:
+        length += 1
+    return length if _is_word_start(content, start - length) else 0
+
+@lru_cache(maxsize=None)
+def _expression_tokens(syntax: CommentSyntax) -> Pattern:
+    """
+    Compile the pattern reading an interpolated expression of a grammar
+
+    Args:
+        syntax: Comment grammar
+
+    Returns:
+        Pattern: Pattern matching a run of code characters as "code", or
+            any other character that is not whitespace
+    """
+    stops = re.escape(WHITE_CHARACTERS + syntax.interpolation[1] + "'\"`")
+    return re.compile(rf"(?P<code>[^\s{stops}]+)|\S")
+
+def _interpolated_code_lines(text: str, syntax: CommentSyntax) -> Set[int]:
+    """
+    Find the lines of an interpolated string that hold code
+
+    Strings inside an expression are skipped, and brackets nest, so only
+    a closing character outside them ends the expression. A doubled
+    single-character opener, like {{, is an escape and not an expression.
+
+    Args:
+        text: String literal, including its prefix and delimiters
+        syntax: Comment grammar of the file
+
+    Returns:
+        Set[int]: Indices of the literal's lines with code in an expression
+    """
+    opener, closers = syntax.interpolation
+    tokens = _expression_tokens(syntax)
+    lines = set()
+    line = counted = 0
+    index = text.find(opener)
+    while index != -1:
+        index += len(opener)
+        if len(opener) == 1 and text.startswith(opener, index):
+            index = text.find(opener, index + 1)
+            continue
+        depth = 0
+        token = tokens.search(text, index)
+        while token:
+            index = token.end()
+            character = token.group()
+            if token.lastgroup == "code":
+                line += text.count("\n", counted, index)
+                counted = index
+                lines.add(line)
+            elif character in "([{":
+                depth += 1
+            elif depth and character in ")]}":
+                depth -= 1
+            elif character in closers:
+                break
+            elif character in "'\"`":
+                index = text.find(character, index) + 1
+                if not index:
+                    return lines
+            token = tokens.search(text, index)
+        index = text.find(opener, index)
+    return lines
+
+def _mark(content: str, scanner: Pattern, syntax: CommentSyntax) -> str:
+    """
+    Replace each string and comment by a mark on every line it spans
+
+    Args:
+        content: File content
+        scanner: _scanner pattern of the grammar
+        syntax: Comment grammar of the file
+
+    Returns:
+        str: Content with strings and comments marked
+    """
+    parts = []
+    position = 0
+    # Whether the code before a string leaves it a docstring
+    is_after_colon = True
+    for match in scanner.finditer(content):
+        start, end = match.span()
+        code_lines = ()
+        if match.lastgroup == "key":
+            continue
+        if match.lastgroup == "comment":
+            mark = _COMMENT_MARK
+        else:
+            if syntax.string_prefixes:
+                start -= _prefix_length(content, start, syntax)
+            mark = _STRING_MARK
+            if syntax.docstrings:
+                code = content[position:start].rstrip()
+                if code:
+                    is_after_colon = code.endswith(":")
+                if is_after_colon:
+                    mark = _COMMENT_MARK
+            if (
+                syntax.interpolated
+                and syntax.interpolation[0] in match.group()
+                and any(letter in syntax.interpolated for letter in content[start:match.start() + 1])
+            ):
+                code_lines = _interpolated_code_lines(content[start:end], syntax)
+        parts.append(content[position:start])
+        if code_lines:
+            marks = [mark] * (content.count("\n", start, end) + 1)
+            for line in code_lines:
+                marks[line] += _CODE_MARK
+            parts.append("\n".join(marks))
+        else:
+            parts.append((mark + "\n") * content.count("\n", start, end) + mark)
+        position = end
+    parts.append(content[position:])
+    return "".join(parts)
+
+def count_lines(content: str, syntax: CommentSyntax) -> LineCounts:
+    """
+    Count code, comment, string and blank lines
+
+    Lines are classified approximately the way pygount does. A line is code
+    if anything is left once strings, comments, white characters and white
+    words are removed. Otherwise it is a string line if it holds a string
+    literal, a comment line if it holds a comment or docstring, and blank
+    if not. Like pygount, blank lines at the start and end are not counted.
+
+    Strings are found by their delimiters alone, which is where counts
+    can differ: pygments may read an apostrophe in text between JSX tags
+    as the start of a string, and it lexes Markdown code fences and
+    PowerShell here-strings as strings, which count as code here.
+
+    Args:
+        content: File content
+        syntax: Comment grammar of the file's language
+
+    Returns:
+        LineCounts: Line counts
+    """
+    if not content:
+        return LineCounts(code=0, comment=0, blank=0)
+    # Lexers drop line breaks around the content but end it with one
+    content = content.strip("\n") + "\n"
+
+    scanner = _scanner(syntax)
+    if scanner:
+        content = _mark(content, scanner, syntax)
+    white_words = _white_words(syntax)
+    if white_words:
+        # A white word is never code, whatever else is on its line
+        content = white_words.sub(
+            lambda match: " " if _is_word_start(match.string, match.start()) else match.group(), content
+        )
+
+    lines = content.split("\n")
+    # The final line break does not start another line
+    lines.pop()
+
+    code = string = comment = 0
+    for line in lines:
+        if _CODE_CHARACTER.search(line):
+            code += 1
+        elif _STRING_MARK in line:
+            string += 1
+        elif _COMMENT_MARK in line:
+            comment += 1
+
+    return LineCounts(code=code, comment=comment, blank=len(lines) - code - string - comment, string=string)
@@ -0,0 +1,182 @@
+"""
+Compiled multi-pattern matcher for skill and language detection
+"""
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+# Literal runs shorter than this are too common to be worth checking
+MIN_LITERAL_LENGTH = 2
+
+# Characters that cannot be part of a literal run
+_REGEX_META = set('.^$*+?{}[]|()')
+
+def required_literals(pattern: str) -> List[str]:
+    """
+    Get the literal substrings every match of a pattern must contain
+
+    The extraction is conservative: anything it cannot prove to be mandatory
+    (groups, classes, optional or repeated characters) ends the current run.
+
+    Args:
+        pattern: Regular expression source
+
+    Returns:
+        List[str]: Mandatory literal runs, empty if none can be derived
+    """
+    # Alternation and inline flags make literal runs unreliable
+    if re.search(r'(?<!\\)\|', pattern) or re.search(r'\(\?[aiLmsux]', pattern):
+        return []
+
+    runs = []
+    current = []
+
+    def flush():
+        if len(current) >= MIN_LITERAL_LENGTH:
+            runs.append(''.join(current))
+        current.clear()
+
+    i = 0
+    length = len(pattern)
+    while i < length:
+        char = pattern[i]
+        literal = None
+
+        if char == '\\':
+            # Escaped punctuation is literal, escaped letters are classes (\s, \w, ...)
+            if i + 1 < length and not pattern[i + 1].isalnum():
+                literal = pattern[i + 1]
+            i += 2
+        elif char == '[':
+            # Skip character class
+            i += 1
+            if i < length and pattern[i] == '^':
+                i += 1
+            if i < length and pattern[i] == ']':
+                i += 1
+            while i < length and pattern[i] != ']':
+                i += 2 if pattern[i] == '\\' else 1
+            i += 1
+        elif char == '(':
+            # Skip group
+            depth = 0
+            while i < length:
+                if pattern[i] == '\\':
+                    i += 2
+                    continue
+                if pattern[i] == '(':
+                    depth += 1
+                elif pattern[i] == ')':
+                    depth -= 1
+                    if depth == 0:
+                        break
+                i += 1
+            i += 1
+        else:
+            if char not in _REGEX_META:
+                literal = char
+            i += 1
+
+        quantifier = pattern[i] if i < length else ''
+
+        if quantifier in ('*', '?', '{'):
+            # Optional atom: it cannot extend the run
+            flush()
+            if quantifier == '{':
+                while i < length and pattern[i] != '}':
+                    i += 1
+            i += 1
+            if i < length and pattern[i] in '?+':
+                i += 1
+            continue
+
+        if literal is None:
+            flush()
+        else:
+            current.append(literal)
+
+        if quantifier == '+':
+            # Repeated atom: present at least once, but the run ends here
+            flush()
+            i += 1
+            if i < length and pattern[i] in '?+':
+                i += 1
+
+    flush()
+    return runs
+
+class MultiPatternMatcher:
+    """
+    Counts matches of many regular expressions against the same text
+
+    Each pattern is compiled once together with the literal substrings it
+    requires. Literal presence is checked once per text and shared between
+    patterns, so a pattern is only run when all of its literals occur. Counts
+    are identical to running ``re.findall`` per pattern, up to an optional cap.
+
+    Patterns that can match are still run one at a time rather than as one
+    combined alternation or automaton: matches of different patterns may
+    overlap, and a single pass reports only one of them at each position, so
+    its counts would differ from the per-pattern ones callers rely on.
+    """
+
+    def __init__(self, rules: Dict[str, List[str]]):
+        """
+        Compile a set of rules
+
+        Args:
+            rules: Dictionary mapping labels to lists of regex patterns
+        """
+        self.rules: List[Tuple[str, List[Tuple[Pattern, List[str]]]]] = [
+            (label, [(re.compile(pattern), required_literals(pattern)) for pattern in patterns])
+            for label, patterns in rules.items()
+        ]
+
+    def count(self, text: str, cap: Optional[int] = None) -> Dict[str, List[int]]:
+        """
+        Count non-overlapping matches of every pattern
+
+        Args:
+            text: Text to scan
+            cap: Optional maximum count per pattern; a pattern stops scanning
+                once it reaches it
+
+        Returns:
+            Dict[str, List[int]]: Match counts per label, in pattern order
+        """
+        # Literal presence, shared by all patterns for this text
+        present: Dict[str, bool] = {}
+
+        result = {}
+        for label, patterns in self.rules:
+            counts = []
+            for compiled, literals in patterns:
+                count = 0
+                if self._literals_present(text, literals, present):
+                    for _ in compiled.finditer(text):
+                        count += 1
+                        if cap is not None and count >= cap:
+                            break
+                counts.append(count)
+            result[label] = counts
+
+        return result
+
+    def _literals_present(self, text: str, literals: List[str], present: Dict[str, bool]) -> bool:
+        """
+        Check that every required literal occurs in the text
+
+        Args:
+            text: Text to scan
+            literals: Required literal substrings
+            present: Cache of literal presence for this text
+
+        Returns:
+            bool: True if the pattern can match
+        """
+        for literal in literals:
+            found = present.get(literal)
+            if found is None:
+                found = present[literal] = literal in text
+            if not found:
+                return False
+        return True
@@ -0,0 +1,145 @@
+"""
+Single-parse analysis of Python source code
+"""
+import ast
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+_FUNCTION_TYPES = {ast.FunctionDef, ast.AsyncFunctionDef}
+
+# Nodes that add decision points to the cyclomatic complexity
+_DECISION_TYPES = {
+    ast.If, ast.IfExp, ast.BoolOp, ast.comprehension, ast.Try, ast.Match,
+    ast.For, ast.AsyncFor, ast.While,
+}
+
+# Where a node sits: in the module body, directly in a module-level class, or deeper
+_MODULE = "module"
+_CLASS = "class"
+_NESTED = "nested"
+
+@dataclass
+class PythonSource:
+    """What one parse of a Python file yields"""
+    imports: List[str] = field(default_factory=list)
+    functions: int = 0
+    classes: int = 0
+    complexity: float = 0.0
+    complexity_blocks: int = 0
+
+def parse_python_source(content: str) -> Optional[PythonSource]:
+    """
+    Parse Python code once and extract imports, definitions and complexity
+
+    Imports are the top-level packages of absolute imports, so
+    "import a.b, c" gives a and c, "from x.y import z" gives x, and
+    relative imports are skipped as local code.
+
+    Complexity follows radon's cyclomatic complexity: one block per
+    module-level function and per method of a module-level class, each
+    scoring 1 plus its decision points, nested definitions excluded.
+
+    Args:
+        content: Python source code
+
+    Returns:
+        Optional[PythonSource]: Extracted facts, or None if the code does not parse
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    return summarize_tree(tree)
+
+def summarize_tree(tree: ast.Module) -> PythonSource:
+    """
+    Extract imports, definitions and complexity from a parsed module
+
+    Args:
+        tree: Parsed module
+
+    Returns:
+        PythonSource: Extracted facts
+    """
+    source = PythonSource()
+    imports = {}
+    blocks: List[int] = []
+
+    # One walk. Each node carries its scope (module body, directly in a
+    # module-level class, or anything nested deeper) and the complexity
+    # block its decision points count towards, if any. Children are pushed
+    # in reverse so imports come out in source order.
+    stack = [(child, _MODULE, None) for child in reversed(tree.body)]
+    while stack:
+        node, scope, block = stack.pop()
+        node_type = type(node)
+
+        if node_type in _FUNCTION_TYPES:
+            source.functions += 1
+            if scope is not _NESTED:
+                block = len(blocks)
+                blocks.append(1)
+            else:
+                block = None
+            # Decorators, arguments and annotations do not count
+            stack.extend((child, _NESTED, block) for child in reversed(node.body))
+            continue
+
+        if node_type is ast.ClassDef:
+            source.classes += 1
+            inner = _CLASS if scope is _MODULE else _NESTED
+            stack.extend((child, inner, None) for child in reversed(node.body))
+            continue
+
+        if node_type is ast.Import:
+            for alias in node.names:
+                imports.setdefault(alias.name.partition(".")[0], None)
+            continue
+        if node_type is ast.ImportFrom:
+            if node.level == 0 and node.module:
+                imports.setdefault(node.module.partition(".")[0], None)
+            continue
+
+        if block is not None:
+            if node_type is ast.Assert:
+                # Nothing inside an assert counts
+                blocks[block] += 1
+                continue
+            if node_type in _DECISION_TYPES:
+                blocks[block] += decisions(node)
+
+        children = [(child, scope, block) for child in ast.iter_child_nodes(node)]
+        children.reverse()
+        stack.extend(children)
+
+    source.imports = list(imports)
+    source.complexity = float(sum(blocks))
+    source.complexity_blocks = len(blocks)
+    return source
+
+def decisions(node: ast.AST) -> int:
+    """
+    Count the decision points a single node adds, as radon does
+
+    Args:
+        node: Node of a type in _DECISION_TYPES
+
+    Returns:
+        int: Number of decision points
+    """
+    node_type = type(node)
+    if node_type is ast.If or node_type is ast.IfExp:
+        return 1
+    if node_type is ast.BoolOp:
+        return len(node.values) - 1
+    if node_type is ast.comprehension:
+        return 1 + len(node.ifs)
+    if node_type is ast.Try:
+        return len(node.handlers) + bool(node.orelse)
+    if node_type is ast.Match:
+        # A catch-all case is the match's "else"
+        catch_all = any(isinstance(case.pattern, ast.MatchAs) and case.pattern.pattern is None for case in node.cases)
+        return max(0, len(node.cases) - catch_all)
+    # For, AsyncFor and While
+    return 1 + bool(node.orelse)
@@ -0,0 +1,243 @@
+"""
+Shared registry of skill rules and learning resources
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+# Seconds between checks of the source files for changes
+RELOAD_CHECK_INTERVAL = float(os.getenv("REGISTRY_RELOAD_INTERVAL", "2"))
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """
+    One consistent, read-only version of the rule and resource files
+
+    Consumers keep a reference to the snapshot they started with, so a
+    reload never changes data under a running request. The nested values
+    are shared and must not be modified.
+
+    version counts reloads in this process only. digest is a hash of the
+    file contents, the same in every process and across restarts, so keys
+    of caches that outlive a reload or the process use it instead.
+    """
+    version: int
+    digest: str
+    loaded_at: float
+    resources: Mapping[str, Any]
+    skill_rules: Mapping[str, Any]
+    views: Mapping[str, Any]
+
+    def view(self, name: str) -> Any:
+        """
+        Get data derived from this snapshot when it was loaded
+
+        Args:
+            name: View name
+
+        Returns:
+            Any: The view
+        """
+        return self.views[name]
+
+# Builds derived data from the loaded resources and skill rules
+ViewBuilder = Callable[[Mapping[str, Any], Mapping[str, Any]], Any]
+
+def load_json_file(path: Path, default_factory: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Load a JSON file, creating it from defaults if it does not exist
+
+    Args:
+        path: File path
+        default_factory: Function returning the default content
+
+    Returns:
+        Dict[str, Any]: File content
+    """
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(default_factory(), f, indent=2)
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+class RuleRegistry:
+    """
+    Loads skill_rules.json and resources.json once and reloads them when
+    their modification time changes
+
+    A reload builds a complete new snapshot, including its views, and swaps
+    it in with a single assignment; if a file fails to load or a view fails
+    to build, the previous snapshot stays.
+    """
+
+    def __init__(
+        self,
+        resources_path: Path,
+        skill_rules_path: Path,
+        default_resources: Callable[[], Dict[str, Any]],
+        default_skill_rules: Callable[[], Dict[str, Any]],
+        check_interval: float = RELOAD_CHECK_INTERVAL,
+        views: Optional[Dict[str, ViewBuilder]] = None,
+    ):
+        """
+        Initialize registry and load the files
+
+        Args:
+            resources_path: Path of resources.json
+            skill_rules_path: Path of skill_rules.json
+            default_resources: Function returning default resources
+            default_skill_rules: Function returning default skill rules
+            check_interval: Seconds between modification time checks
+            views: Builders of data derived from each snapshot, by name
+        """
+        self.sources = {
+            "resources": (Path(resources_path), default_resources),
+            "skill_rules": (Path(skill_rules_path), default_skill_rules),
+        }
+        self.check_interval = check_interval
+        self.views = dict(views or {})
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._mtimes: Tuple[int, ...] = ()
+        self._checked_at = 0.0
+        self._snapshot: Optional[RegistrySnapshot] = None
+        self.reload()
+
+    def snapshot(self) -> RegistrySnapshot:
+        """
+        Get the current snapshot, reloading first if a file changed
+
+        Returns:
+            RegistrySnapshot: Current snapshot
+        """
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            if self._read_mtimes() != self._mtimes:
+                self.reload()
+
+        return self._snapshot
+
+    def reload(self) -> RegistrySnapshot:
+        """
+        Load the files and publish a new snapshot
+
+        Returns:
+            RegistrySnapshot: Current snapshot (the previous one if loading failed)
+        """
+        with self._lock:
+            mtimes = self._read_mtimes()
+            if self._snapshot is not None and mtimes == self._mtimes:
+                # Another thread already reloaded
+                return self._snapshot
+
+            try:
+                data = {
+                    name: load_json_file(path, default_factory)
+                    for name, (path, default_factory) in self.sources.items()
+                }
+                snapshot = self._build_snapshot(data)
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                self.last_error = f"Failed to reload registry: {str(e)}"
+                return self._snapshot
+
+            self._snapshot = snapshot
+            # Files created from defaults only have an mtime after loading
+            self._mtimes = self._read_mtimes()
+            self.last_error = None
+            return self._snapshot
+
+    def _build_snapshot(self, data: Dict[str, Dict[str, Any]]) -> RegistrySnapshot:
+        """
+        Build a snapshot from loaded file contents
+
+        Args:
+            data: Loaded content of each source
+
+        Returns:
+            RegistrySnapshot: New snapshot
+        """
+        digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        resources = MappingProxyType(data["resources"])
+        skill_rules = MappingProxyType(data["skill_rules"])
+
+        return RegistrySnapshot(
+            version=version,
+            digest=digest,
+            loaded_at=time.time(),
+            resources=resources,
+            skill_rules=skill_rules,
+            views=MappingProxyType({
+                name: build(resources, skill_rules) for name, build in self.views.items()
+            }),
+        )
+
+    def _read_mtimes(self) -> Tuple[int, ...]:
+        """
+        Get the modification times of the source files
+
+        Returns:
+            Tuple[int, ...]: Modification time of each file in nanoseconds, 0 if missing
+        """
+        mtimes = []
+        for path, _ in self.sources.values():
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(0)
+        return tuple(mtimes)
+
+_registry: Optional[RuleRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> RuleRegistry:
+    """
+    Get the shared registry, loading it on first use
+
+    Returns:
+        RuleRegistry: Shared registry
+    """
+    global _registry
+
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                # Imported here: these modules consume the registry themselves
+                from app.core.resources import RESOURCES_PATH, create_default_resources
+                from app.core.score import SKILL_RULES_PATH, create_default_rules
+                from app.core.catalog import CATALOG_VIEW, build_catalog
+                from app.core.skill_index import SKILL_INDEX_VIEW, build_skill_index
+
+                _registry = RuleRegistry(
+                    resources_path=RESOURCES_PATH,
+                    skill_rules_path=SKILL_RULES_PATH,
+                    default_resources=create_default_resources,
+                    default_skill_rules=create_default_rules,
+                    views={CATALOG_VIEW: build_catalog, SKILL_INDEX_VIEW: build_skill_index},
+                )
+
+    return _registry
+
+def registry_digest() -> str:
+    """
+    Get the content hash of the current rule and resource files
+
+    Include it in the keys of cached results that embed registry data,
+    like skill categories and learning resources, so a reload stops
+    serving them.
+
+    Returns:
+        str: SHA-256 of the loaded file contents
+    """
+    return get_registry().snapshot().digest
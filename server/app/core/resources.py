@@ -1,41 +1,248 @@
 """
 Learning resources mapping for skills
 """
-from typing import Dict, List, Any, Optional
-import json
-import os
+from typing import Dict, List, Any, Mapping, Optional
 from pathlib import Path
 
+from app.core.catalog import CATALOG_VIEW
+from app.core.registry import RuleRegistry, get_registry
+from app.core.skill_index import SKILL_INDEX_VIEW, SkillIndex
+
 # Path to resources file
 RESOURCES_PATH = Path(__file__).parent.parent.parent / "resources.json"
 
+def create_default_resources() -> Dict[str, Any]:
+    """
+    Create default resources
+    
+    Returns:
+        Dict[str, Any]: Default resources
+    """
+    return {
+        "python": {
+            "name": "Python",
+            "category": "Backend",
+            "description": "Python is a high-level, interpreted programming language known for its readability and versatility.",
+            "resources": [
+                {
+                    "title": "Python Official Documentation",
+                    "url": "https://docs.python.org/3/",
+                    "description": "The official Python documentation"
+                },
+                {
+                    "title": "Python Crash Course",
+                    "url": "https://www.youtube.com/watch?v=_uQrJ0TkZlc",
+                    "description": "Comprehensive Python tutorial for beginners"
+                },
+                {
+                    "title": "Python for Everybody",
+                    "url": "https://www.py4e.com/",
+                    "description": "Free Python course for beginners"
+                }
+            ]
+        },
+        "javascript": {
+            "name": "JavaScript",
+            "category": "Frontend",
+            "description": "JavaScript is a programming language that enables interactive web pages and is an essential part of web applications.",
+            "resources": [
+                {
+                    "title": "MDN JavaScript Guide",
+                    "url": "https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide",
+                    "description": "Comprehensive JavaScript guide by Mozilla"
+                },
+                {
+                    "title": "JavaScript Crash Course",
+                    "url": "https://www.youtube.com/watch?v=hdI2bqOjy3c",
+                    "description": "Quick introduction to JavaScript fundamentals"
+                },
+                {
+                    "title": "JavaScript.info",
+                    "url": "https://javascript.info/",
+                    "description": "Modern JavaScript tutorial"
+                }
+            ]
+        },
+        "react": {
+            "name": "React",
+            "category": "Frontend",
+            "description": "React is a JavaScript library for building user interfaces, particularly single-page applications.",
+            "resources": [
+                {
+                    "title": "React Documentation",
+                    "url": "https://reactjs.org/docs/getting-started.html",
+                    "description": "Official React documentation"
+                },
+                {
+                    "title": "React Crash Course",
+                    "url": "https://www.youtube.com/watch?v=w7ejDZ8SWv8",
+                    "description": "Quick introduction to React"
+                },
+                {
+                    "title": "React Tutorial",
+                    "url": "https://react-tutorial.app/",
+                    "description": "Interactive React tutorial"
+                }
+            ]
+        },
+        "flask": {
+            "name": "Flask",
+            "category": "Backend",
+            "description": "Flask is a micro web framework for Python, known for its simplicity and flexibility.",
+            "resources": [
+                {
+                    "title": "Flask Documentation",
+                    "url": "https://flask.palletsprojects.com/",
+                    "description": "Official Flask documentation"
+                },
+                {
+                    "title": "Flask Mega-Tutorial",
+                    "url": "https://blog.miguelgrinberg.com/post/the-flask-mega-tutorial-part-i-hello-world",
+                    "description": "Comprehensive Flask tutorial"
+                },
+                {
+                    "title": "Flask Crash Course",
+                    "url": "https://www.youtube.com/watch?v=Z1RJmh_OqeA",
+                    "description": "Quick introduction to Flask"
+                }
+            ]
+        },
+        "django": {
+            "name": "Django",
+            "category": "Backend",
+            "description": "Django is a high-level Python web framework that encourages rapid development and clean, pragmatic design.",
+            "resources": [
+                {
+                    "title": "Django Documentation",
+                    "url": "https://docs.djangoproject.com/",
+                    "description": "Official Django documentation"
+                },
+                {
+                    "title": "Django for Beginners",
+                    "url": "https://djangoforbeginners.com/",
+                    "description": "Django tutorial for beginners"
+                },
+                {
+                    "title": "Django Crash Course",
+                    "url": "https://www.youtube.com/watch?v=e1IyzVyrLSU",
+                    "description": "Quick introduction to Django"
+                }
+            ]
+        },
+        "fastapi": {
+            "name": "FastAPI",
+            "category": "Backend",
+            "description": "FastAPI is a modern, fast web framework for building APIs with Python based on standard Python type hints.",
+            "resources": [
+                {
+                    "title": "FastAPI Documentation",
+                    "url": "https://fastapi.tiangolo.com/",
+                    "description": "Official FastAPI documentation"
+                },
+                {
+                    "title": "FastAPI Tutorial",
+                    "url": "https://fastapi.tiangolo.com/tutorial/",
+                    "description": "Official FastAPI tutorial"
+                },
+                {
+                    "title": "FastAPI Crash Course",
+                    "url": "https://www.youtube.com/watch?v=7t2alSnE2-I",
+                    "description": "Quick introduction to FastAPI"
+                }
+            ]
+        },
+        "pandas": {
+            "name": "Pandas",
+            "category": "Data Science",
+            "description": "Pandas is a fast, powerful, flexible and easy to use open source data analysis and manipulation tool, built on top of Python.",
+            "resources": [
+                {
+                    "title": "Pandas Documentation",
+                    "url": "https://pandas.pydata.org/docs/",
+                    "description": "Official Pandas documentation"
+                },
+                {
+                    "title": "Pandas Tutorial",
+                    "url": "https://www.youtube.com/watch?v=vmEHCJofslg",
+                    "description": "Pandas tutorial for beginners"
+                },
+                {
+                    "title": "10 Minutes to Pandas",
+                    "url": "https://pandas.pydata.org/docs/user_guide/10min.html",
+                    "description": "Quick introduction to Pandas"
+                }
+            ]
+        },
+        "express": {
+            "name": "Express",
+            "category": "Backend",
+            "description": "Express is a minimal and flexible Node.js web application framework that provides a robust set of features for web and mobile applications.",
+            "resources": [
+                {
+                    "title": "Express Documentation",
+                    "url": "https://expressjs.com/",
+                    "description": "Official Express documentation"
+                },
+                {
+                    "title": "Express Crash Course",
+                    "url": "https://www.youtube.com/watch?v=L72fhGm1tfE",
+                    "description": "Quick introduction to Express"
+                },
+                {
+                    "title": "Express Tutorial",
+                    "url": "https://developer.mozilla.org/en-US/docs/Learn/Server-side/Express_Nodejs",
+                    "description": "Express tutorial by MDN"
+                }
+            ]
+        }
+    }
+
 class ResourceManager:
     """
     Manages learning resources for skills
     """
     
-    def __init__(self):
-        # Load resources
-        self.resources = self._load_resources()
+    def __init__(self, registry: Optional[RuleRegistry] = None):
+        """
+        Initialize resource manager
+        
+        Args:
+            registry: Registry holding the resources (default: the shared registry)
+        """
+        self.registry = registry or get_registry()
+    
+    @property
+    def resources(self) -> Mapping[str, Any]:
+        """Resources of the current registry snapshot"""
+        return self.registry.snapshot().resources
+    
+    @property
+    def catalog(self) -> Mapping[str, Any]:
+        """Catalog payloads of the current registry snapshot"""
+        return self.registry.snapshot().view(CATALOG_VIEW)
+    
+    @property
+    def index(self) -> SkillIndex:
+        """Skill index of the current registry snapshot"""
+        return self.registry.snapshot().view(SKILL_INDEX_VIEW)
     
     def get_resources(self, skill_name: str) -> List[Dict[str, str]]:
         """
         Get learning resources for a skill
         
         Args:
-            skill_name: Name of the skill
+            skill_name: Name of the skill, or an alias of it
             
         Returns:
             List[Dict[str, str]]: List of learning resources
         """
-        # Normalize skill name
-        skill_name = skill_name.lower()
-        
         # Check if skill exists in resources
-        if skill_name in self.resources:
-            return self.resources[skill_name].get("resources", [])
+        entry = self.index.lookup(skill_name)
+        if entry and entry.resources is not None:
+            return entry.resources
         
         # Return default resources if skill not found
+        skill_name = skill_name.lower()
         return [
             {
                 "title": f"Learn {skill_name.title()}",
@@ -49,259 +256,21 @@ class ResourceManager:
         Get information about a skill
         
         Args:
-            skill_name: Name of the skill
+            skill_name: Name of the skill, or an alias of it
             
         Returns:
             Dict[str, Any]: Skill information
         """
-        # Normalize skill name
-        skill_name = skill_name.lower()
-        
         # Check if skill exists in resources
-        if skill_name in self.resources:
-            return self.resources[skill_name]
+        entry = self.index.lookup(skill_name)
+        if entry and entry.info is not None:
+            return entry.info
         
         # Return default info if skill not found
+        name = entry.name if entry else skill_name.lower().title()
         return {
-            "name": skill_name.title(),
-            "category": self._guess_category(skill_name),
-            "description": f"{skill_name.title()} programming skill",
+            "name": name,
+            "category": (entry and entry.category) or "Other",
+            "description": f"{name} programming skill",
             "resources": self.get_resources(skill_name)
         }
-    
-    def _load_resources(self) -> Dict[str, Any]:
-        """
-        Load resources from file
-        
-        Returns:
-            Dict[str, Any]: Resources dictionary
-        """
-        # Check if file exists
-        if not os.path.exists(RESOURCES_PATH):
-            # Create default resources
-            self._create_default_resources()
-        
-        # Load resources
-        with open(RESOURCES_PATH, 'r') as f:
-            return json.load(f)
-    
-    def _create_default_resources(self):
-        """Create default resources file"""
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(RESOURCES_PATH), exist_ok=True)
-        
-        # Default resources
-        default_resources = {
-            "python": {
-                "name": "Python",
-                "category": "Backend",
-                "description": "Python is a high-level, interpreted programming language known for its readability and versatility.",
-                "resources": [
-                    {
-                        "title": "Python Official Documentation",
-                        "url": "https://docs.python.org/3/",
-                        "description": "The official Python documentation"
-                    },
-                    {
-                        "title": "Python Crash Course",
-                        "url": "https://www.youtube.com/watch?v=_uQrJ0TkZlc",
-                        "description": "Comprehensive Python tutorial for beginners"
-                    },
-                    {
-                        "title": "Python for Everybody",
-                        "url": "https://www.py4e.com/",
-                        "description": "Free Python course for beginners"
-                    }
-                ]
-            },
-            "javascript": {
-                "name": "JavaScript",
-                "category": "Frontend",
-                "description": "JavaScript is a programming language that enables interactive web pages and is an essential part of web applications.",
-                "resources": [
-                    {
-                        "title": "MDN JavaScript Guide",
-                        "url": "https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide",
-                        "description": "Comprehensive JavaScript guide by Mozilla"
-                    },
-                    {
-                        "title": "JavaScript Crash Course",
-                        "url": "https://www.youtube.com/watch?v=hdI2bqOjy3c",
-                        "description": "Quick introduction to JavaScript fundamentals"
-                    },
-                    {
-                        "title": "JavaScript.info",
-                        "url": "https://javascript.info/",
-                        "description": "Modern JavaScript tutorial"
-                    }
-                ]
-            },
-            "react": {
-                "name": "React",
-                "category": "Frontend",
-                "description": "React is a JavaScript library for building user interfaces, particularly single-page applications.",
-                "resources": [
-                    {
-                        "title": "React Documentation",
-                        "url": "https://reactjs.org/docs/getting-started.html",
-                        "description": "Official React documentation"
-                    },
-                    {
-                        "title": "React Crash Course",
-                        "url": "https://www.youtube.com/watch?v=w7ejDZ8SWv8",
-                        "description": "Quick introduction to React"
-                    },
-                    {
-                        "title": "React Tutorial",
-                        "url": "https://react-tutorial.app/",
-                        "description": "Interactive React tutorial"
-                    }
-                ]
-            },
-            "flask": {
-                "name": "Flask",
-                "category": "Backend",
-                "description": "Flask is a micro web framework for Python, known for its simplicity and flexibility.",
-                "resources": [
-                    {
-                        "title": "Flask Documentation",
-                        "url": "https://flask.palletsprojects.com/",
-                        "description": "Official Flask documentation"
-                    },
-                    {
-                        "title": "Flask Mega-Tutorial",
-                        "url": "https://blog.miguelgrinberg.com/post/the-flask-mega-tutorial-part-i-hello-world",
-                        "description": "Comprehensive Flask tutorial"
-                    },
-                    {
-                        "title": "Flask Crash Course",
-                        "url": "https://www.youtube.com/watch?v=Z1RJmh_OqeA",
-                        "description": "Quick introduction to Flask"
-                    }
-                ]
-            },
-            "django": {
-                "name": "Django",
-                "category": "Backend",
-                "description": "Django is a high-level Python web framework that encourages rapid development and clean, pragmatic design.",
-                "resources": [
-                    {
-                        "title": "Django Documentation",
-                        "url": "https://docs.djangoproject.com/",
-                        "description": "Official Django documentation"
-                    },
-                    {
-                        "title": "Django for Beginners",
-                        "url": "https://djangoforbeginners.com/",
-                        "description": "Django tutorial for beginners"
-                    },
-                    {
-                        "title": "Django Crash Course",
-                        "url": "https://www.youtube.com/watch?v=e1IyzVyrLSU",
-                        "description": "Quick introduction to Django"
-                    }
-                ]
-            },
-            "fastapi": {
-                "name": "FastAPI",
-                "category": "Backend",
-                "description": "FastAPI is a modern, fast web framework for building APIs with Python based on standard Python type hints.",
-                "resources": [
-                    {
-                        "title": "FastAPI Documentation",
-                        "url": "https://fastapi.tiangolo.com/",
-                        "description": "Official FastAPI documentation"
-                    },
-                    {
-                        "title": "FastAPI Tutorial",
-                        "url": "https://fastapi.tiangolo.com/tutorial/",
-                        "description": "Official FastAPI tutorial"
-                    },
-                    {
-                        "title": "FastAPI Crash Course",
-                        "url": "https://www.youtube.com/watch?v=7t2alSnE2-I",
-                        "description": "Quick introduction to FastAPI"
-                    }
-                ]
-            },
-            "pandas": {
-                "name": "Pandas",
-                "category": "Data Science",
-                "description": "Pandas is a fast, powerful, flexible and easy to use open source data analysis and manipulation tool, built on top of Python.",
-                "resources": [
-                    {
-                        "title": "Pandas Documentation",
-                        "url": "https://pandas.pydata.org/docs/",
-                        "description": "Official Pandas documentation"
-                    },
-                    {
-                        "title": "Pandas Tutorial",
-                        "url": "https://www.youtube.com/watch?v=vmEHCJofslg",
-                        "description": "Pandas tutorial for beginners"
-                    },
-                    {
-                        "title": "10 Minutes to Pandas",
-                        "url": "https://pandas.pydata.org/docs/user_guide/10min.html",
-                        "description": "Quick introduction to Pandas"
-                    }
-                ]
-            },
-            "express": {
-                "name": "Express",
-                "category": "Backend",
-                "description": "Express is a minimal and flexible Node.js web application framework that provides a robust set of features for web and mobile applications.",
-                "resources": [
-                    {
-                        "title": "Express Documentation",
-                        "url": "https://expressjs.com/",
-                        "description": "Official Express documentation"
-                    },
-                    {
-                        "title": "Express Crash Course",
-                        "url": "https://www.youtube.com/watch?v=L72fhGm1tfE",
-                        "description": "Quick introduction to Express"
-                    },
-                    {
-                        "title": "Express Tutorial",
-                        "url": "https://developer.mozilla.org/en-US/docs/Learn/Server-side/Express_Nodejs",
-                        "description": "Express tutorial by MDN"
-                    }
-                ]
-            }
-        }
-        
-        # Write to file
-        with open(RESOURCES_PATH, 'w') as f:
-            json.dump(default_resources, f, indent=2)
-    
-    def _guess_category(self, skill_name: str) -> str:
-        """
-        Guess category for a skill
-        
-        Args:
-            skill_name: Name of the skill
-            
-        Returns:
-            str: Category name
-        """
-        # Define category mappings
-        frontend_skills = {'javascript', 'typescript', 'react', 'vue', 'angular', 'svelte', 'html', 'css', 'bootstrap', 'tailwind'}
-        backend_skills = {'python', 'java', 'node', 'express', 'django', 'flask', 'fastapi', 'spring'}
-        data_skills = {'pandas', 'numpy', 'matplotlib', 'seaborn', 'plotly', 'scikit-learn', 'tensorflow', 'pytorch'}
-        database_skills = {'mongodb', 'mongoose', 'postgresql', 'mysql', 'sqlite', 'prisma', 'sequelize'}
-        
-        # Normalize skill name
-        skill_name = skill_name.lower()
-        
-        # Check categories
-        if skill_name in frontend_skills:
-            return "Frontend"
-        elif skill_name in backend_skills:
-            return "Backend"
-        elif skill_name in data_skills:
-            return "Data Science"
-        elif skill_name in database_skills:
-            return "Database"
-        
-        # Default category
-        return "Other"
@@ -1,251 +1,298 @@
-import os
-import json
-from typing import Dict, List, Tuple, Any
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple, Any, Mapping, Optional, Sequence
 from pathlib import Path
+
+import numpy as np
+
+from app.core.registry import RuleRegistry, get_registry
+from app.core.skill_index import SKILL_INDEX_VIEW, SkillIndex
 from app.models.skill_models import SkillScore
-from app.utils.helpers import calculate_skill_scores
 
 # Path to skill rules file
 SKILL_RULES_PATH = Path(__file__).parent.parent.parent / "skill_rules.json"
 
-class SkillScorer:
-    """Scorer for programming skills"""
+# Matches a detected language and library add to its category
+LANGUAGE_WEIGHT = 3
+LIBRARY_WEIGHT = 1
+
+# Skill levels, and the score percentages where each level above Beginner starts
+SKILL_LEVELS = ("Beginner", "Intermediate", "Advanced", "Expert")
+SKILL_LEVEL_THRESHOLDS = (40, 70, 90)
+
+def create_default_rules() -> Dict[str, Any]:
+    """
+    Create default skill rules
     
-    def __init__(self):
-        # Load skill rules
-        self.rules = self._load_rules()
-        
-        # Initialize skill categories
-        self.categories = {
-            "Frontend": ["HTML", "CSS", "JavaScript", "TypeScript", "react", "vue", "angular", "svelte"],
-            "Backend": ["Python", "Node.js", "express", "django", "flask", "fastapi"],
-            "Data Science": ["pandas", "numpy", "scipy", "matplotlib", "seaborn", "plotly"],
-            "Machine Learning": ["tensorflow", "pytorch", "scikit-learn", "keras"],
-            "DevOps": ["docker", "kubernetes", "jenkins", "terraform", "ansible"],
-            "Mobile": ["react-native", "flutter", "ionic", "swift", "kotlin"],
-            "Database": ["mongodb", "mongoose", "postgresql", "mysql", "sqlite", "prisma", "sequelize"]
+    Returns:
+        Dict[str, Any]: Default skill rules
+    """
+    return {
+        "categories": {
+            "Frontend": {
+                "description": "Frontend development skills",
+                "libraries": ["react", "vue", "angular", "svelte", "jquery"],
+                "learning_resources": [
+                    {"title": "Modern JavaScript", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9haFPT7J25Q9GRB_ZkFrQAc"},
+                    {"title": "React Tutorial", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9gZD-Tvwfod2gaISzfRiP9d"},
+                    {"title": "CSS Crash Course", "url": "https://www.youtube.com/watch?v=yfoY53QXEnI"}
+                ]
+            },
+            "Backend": {
+                "description": "Backend development skills",
+                "libraries": ["express", "django", "flask", "fastapi", "spring"],
+                "learning_resources": [
+                    {"title": "Node.js Crash Course", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9jsz4LDYc6kv3ymONOKxwBU"},
+                    {"title": "Python Backend Development", "url": "https://www.youtube.com/playlist?list=PLillGF-RfqbYhQsN5WMXy6VsDMKGadrJ-"},
+                    {"title": "FastAPI Tutorial", "url": "https://www.youtube.com/watch?v=7t2alSnE2-I"}
+                ]
+            },
+            "Data Science": {
+                "description": "Data science and analysis skills",
+                "libraries": ["pandas", "numpy", "matplotlib", "seaborn", "plotly"],
+                "learning_resources": [
+                    {"title": "Data Science Full Course", "url": "https://www.youtube.com/watch?v=ua-CiDNNj30"},
+                    {"title": "Pandas Tutorial", "url": "https://www.youtube.com/playlist?list=PL-osiE80TeTsWmV9i9c58mdDCSskIFdDS"},
+                    {"title": "Data Visualization with Python", "url": "https://www.youtube.com/watch?v=a9UrKTVEeZA"}
+                ]
+            },
+            "Machine Learning": {
+                "description": "Machine learning and AI skills",
+                "libraries": ["tensorflow", "pytorch", "scikit-learn", "keras"],
+                "learning_resources": [
+                    {"title": "Machine Learning Course", "url": "https://www.youtube.com/playlist?list=PLeo1K3hjS3uvCeTYTeyfe0-rN5r8zn9rw"},
+                    {"title": "TensorFlow Tutorial", "url": "https://www.youtube.com/playlist?list=PLhhyoLH6IjfxVOdVC1P1L5z5azs0XjMsb"},
+                    {"title": "PyTorch for Deep Learning", "url": "https://www.youtube.com/watch?v=GIsg-ZUy0MY"}
+                ]
+            },
+            "DevOps": {
+                "description": "DevOps and deployment skills",
+                "libraries": ["docker", "kubernetes", "jenkins", "terraform", "ansible"],
+                "learning_resources": [
+                    {"title": "Docker Tutorial", "url": "https://www.youtube.com/watch?v=fqMOX6JJhGo"},
+                    {"title": "Kubernetes Tutorial", "url": "https://www.youtube.com/watch?v=X48VuDVv0do"},
+                    {"title": "CI/CD Pipeline Tutorial", "url": "https://www.youtube.com/watch?v=R8_veQiYBjI"}
+                ]
+            },
+            "Mobile": {
+                "description": "Mobile app development skills",
+                "libraries": ["react-native", "flutter", "ionic", "swift", "kotlin"],
+                "learning_resources": [
+                    {"title": "React Native Tutorial", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9ixPU-QkScoRBVxtPPzVjrQ"},
+                    {"title": "Flutter Tutorial", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9jLYyp2Aoh6hcWuxFDX6PBJ"},
+                    {"title": "iOS Development Course", "url": "https://www.youtube.com/watch?v=comQ1-x2a1Q"}
+                ]
+            },
+            "Database": {
+                "description": "Database and data storage skills",
+                "libraries": ["mongodb", "mongoose", "postgresql", "mysql", "sqlite", "prisma", "sequelize"],
+                "learning_resources": [
+                    {"title": "SQL Tutorial", "url": "https://www.youtube.com/watch?v=HXV3zeQKqGY"},
+                    {"title": "MongoDB Tutorial", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9h77dJ-QJlwGlZlTd4ecZOA"},
+                    {"title": "Database Design Course", "url": "https://www.youtube.com/watch?v=ztHopE5Wnpc"}
+                ]
+            }
+        },
+        "languages": {
+            "Python": "Backend",
+            "JavaScript": "Frontend",
+            "TypeScript": "Frontend",
+            "HTML": "Frontend",
+            "CSS": "Frontend",
+            "Java": "Backend",
+            "C#": "Backend",
+            "PHP": "Backend",
+            "Ruby": "Backend",
+            "Go": "Backend",
+            "Rust": "Backend",
+            "Swift": "Mobile",
+            "Kotlin": "Mobile"
+        },
+        "libraries": {
+            "react": "Frontend",
+            "vue": "Frontend",
+            "angular": "Frontend",
+            "svelte": "Frontend",
+            "jquery": "Frontend",
+            "express": "Backend",
+            "django": "Backend",
+            "flask": "Backend",
+            "fastapi": "Backend",
+            "spring": "Backend",
+            "pandas": "Data Science",
+            "numpy": "Data Science",
+            "matplotlib": "Data Science",
+            "seaborn": "Data Science",
+            "plotly": "Data Science",
+            "tensorflow": "Machine Learning",
+            "pytorch": "Machine Learning",
+            "scikit-learn": "Machine Learning",
+            "keras": "Machine Learning",
+            "docker": "DevOps",
+            "kubernetes": "DevOps",
+            "jenkins": "DevOps",
+            "terraform": "DevOps",
+            "ansible": "DevOps",
+            "react-native": "Mobile",
+            "flutter": "Mobile",
+            "ionic": "Mobile",
+            "mongodb": "Database",
+            "mongoose": "Database",
+            "postgresql": "Database",
+            "mysql": "Database",
+            "sqlite": "Database",
+            "prisma": "Database",
+            "sequelize": "Database"
         }
+    }
+
+@dataclass
+class BatchScores:
+    """
+    Category scores of many profiles
     
-    def score_skills(self, language_libraries: Dict[str, List[str]]) -> List[SkillScore]:
+    Arrays have one row per profile and one column per category, in the
+    order of categories.
+    """
+    categories: Tuple[str, ...]
+    counts: np.ndarray
+    scores: np.ndarray
+    detected: np.ndarray
+    rankings: np.ndarray
+    level_distribution: np.ndarray
+    
+    def skill_scores(self, row: int, learning_resources: Callable[[str], List[Dict[str, str]]]) -> List[SkillScore]:
         """
-        Score skills based on detected languages and libraries
+        Get the detected categories of one profile, best first
         
         Args:
-            language_libraries: Dictionary of languages and libraries
+            row: Profile position in the batch
+            learning_resources: Function returning the resources of a category
             
         Returns:
             List[SkillScore]: List of skill scores
         """
-        # Initialize skill counts
-        skill_counts = {}
-        total_matches = 0
-        
-        # Process languages
-        for language, libraries in language_libraries.items():
-            # Add language to skill counts
-            language_category = self._get_language_category(language)
-            if language_category:
-                skill_counts[language_category] = skill_counts.get(language_category, 0) + 3
-                total_matches += 3
-            
-            # Process libraries
-            for library in libraries:
-                # Get library category
-                library_category = self._get_library_category(language, library)
-                if library_category:
-                    skill_counts[library_category] = skill_counts.get(library_category, 0) + 1
-                    total_matches += 1
-        
-        # Calculate scores
-        skill_scores = calculate_skill_scores(skill_counts, total_matches)
-        
-        # Create SkillScore objects
         result = []
-        for category, score in skill_scores.items():
+        for column in self.rankings[row]:
+            if not self.detected[row, column]:
+                break
+            
+            category = self.categories[column]
             result.append(
                 SkillScore(
                     name=category,
-                    score=score / 100,  # Convert to 0-1 range
+                    score=float(self.scores[row, column]),
                     category=category,
                     description=f"{category} skills",
-                    learning_resources=self._get_learning_resources(category)
+                    learning_resources=learning_resources(category)
                 )
             )
         
-        # Sort by score (descending)
-        result.sort(key=lambda x: x.score, reverse=True)
-        
         return result
     
-    def _load_rules(self) -> Dict[str, Any]:
+    def levels(self, row: int) -> Dict[str, int]:
         """
-        Load skill rules from JSON file
+        Get the skill level distribution of one profile
         
+        Args:
+            row: Profile position in the batch
+            
         Returns:
-            Dict[str, Any]: Skill rules
+            Dict[str, int]: Number of detected categories per level
         """
-        # Check if file exists
-        if not os.path.exists(SKILL_RULES_PATH):
-            # Create default rules
-            self._create_default_rules()
-        
-        # Load rules
-        with open(SKILL_RULES_PATH, 'r') as f:
-            return json.load(f)
+        return dict(zip(SKILL_LEVELS, self.level_distribution[row].tolist()))
+
+class SkillScorer:
+    """Scorer for programming skills"""
     
-    def _create_default_rules(self):
-        """Create default skill rules file"""
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(SKILL_RULES_PATH), exist_ok=True)
-        
-        # Default rules
-        default_rules = {
-            "categories": {
-                "Frontend": {
-                    "description": "Frontend development skills",
-                    "libraries": ["react", "vue", "angular", "svelte", "jquery"],
-                    "learning_resources": [
-                        {"title": "Modern JavaScript", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9haFPT7J25Q9GRB_ZkFrQAc"},
-                        {"title": "React Tutorial", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9gZD-Tvwfod2gaISzfRiP9d"},
-                        {"title": "CSS Crash Course", "url": "https://www.youtube.com/watch?v=yfoY53QXEnI"}
-                    ]
-                },
-                "Backend": {
-                    "description": "Backend development skills",
-                    "libraries": ["express", "django", "flask", "fastapi", "spring"],
-                    "learning_resources": [
-                        {"title": "Node.js Crash Course", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9jsz4LDYc6kv3ymONOKxwBU"},
-                        {"title": "Python Backend Development", "url": "https://www.youtube.com/playlist?list=PLillGF-RfqbYhQsN5WMXy6VsDMKGadrJ-"},
-                        {"title": "FastAPI Tutorial", "url": "https://www.youtube.com/watch?v=7t2alSnE2-I"}
-                    ]
-                },
-                "Data Science": {
-                    "description": "Data science and analysis skills",
-                    "libraries": ["pandas", "numpy", "matplotlib", "seaborn", "plotly"],
-                    "learning_resources": [
-                        {"title": "Data Science Full Course", "url": "https://www.youtube.com/watch?v=ua-CiDNNj30"},
-                        {"title": "Pandas Tutorial", "url": "https://www.youtube.com/playlist?list=PL-osiE80TeTsWmV9i9c58mdDCSskIFdDS"},
-                        {"title": "Data Visualization with Python", "url": "https://www.youtube.com/watch?v=a9UrKTVEeZA"}
-                    ]
-                },
-                "Machine Learning": {
-                    "description": "Machine learning and AI skills",
-                    "libraries": ["tensorflow", "pytorch", "scikit-learn", "keras"],
-                    "learning_resources": [
-                        {"title": "Machine Learning Course", "url": "https://www.youtube.com/playlist?list=PLeo1K3hjS3uvCeTYTeyfe0-rN5r8zn9rw"},
-                        {"title": "TensorFlow Tutorial", "url": "https://www.youtube.com/playlist?list=PLhhyoLH6IjfxVOdVC1P1L5z5azs0XjMsb"},
-                        {"title": "PyTorch for Deep Learning", "url": "https://www.youtube.com/watch?v=GIsg-ZUy0MY"}
-                    ]
-                },
-                "DevOps": {
-                    "description": "DevOps and deployment skills",
-                    "libraries": ["docker", "kubernetes", "jenkins", "terraform", "ansible"],
-                    "learning_resources": [
-                        {"title": "Docker Tutorial", "url": "https://www.youtube.com/watch?v=fqMOX6JJhGo"},
-                        {"title": "Kubernetes Tutorial", "url": "https://www.youtube.com/watch?v=X48VuDVv0do"},
-                        {"title": "CI/CD Pipeline Tutorial", "url": "https://www.youtube.com/watch?v=R8_veQiYBjI"}
-                    ]
-                },
-                "Mobile": {
-                    "description": "Mobile app development skills",
-                    "libraries": ["react-native", "flutter", "ionic", "swift", "kotlin"],
-                    "learning_resources": [
-                        {"title": "React Native Tutorial", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9ixPU-QkScoRBVxtPPzVjrQ"},
-                        {"title": "Flutter Tutorial", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9jLYyp2Aoh6hcWuxFDX6PBJ"},
-                        {"title": "iOS Development Course", "url": "https://www.youtube.com/watch?v=comQ1-x2a1Q"}
-                    ]
-                },
-                "Database": {
-                    "description": "Database and data storage skills",
-                    "libraries": ["mongodb", "mongoose", "postgresql", "mysql", "sqlite", "prisma", "sequelize"],
-                    "learning_resources": [
-                        {"title": "SQL Tutorial", "url": "https://www.youtube.com/watch?v=HXV3zeQKqGY"},
-                        {"title": "MongoDB Tutorial", "url": "https://www.youtube.com/playlist?list=PL4cUxeGkcC9h77dJ-QJlwGlZlTd4ecZOA"},
-                        {"title": "Database Design Course", "url": "https://www.youtube.com/watch?v=ztHopE5Wnpc"}
-                    ]
-                }
-            },
-            "languages": {
-                "Python": "Backend",
-                "JavaScript": "Frontend",
-                "TypeScript": "Frontend",
-                "HTML": "Frontend",
-                "CSS": "Frontend",
-                "Java": "Backend",
-                "C#": "Backend",
-                "PHP": "Backend",
-                "Ruby": "Backend",
-                "Go": "Backend",
-                "Rust": "Backend",
-                "Swift": "Mobile",
-                "Kotlin": "Mobile"
-            },
-            "libraries": {
-                "react": "Frontend",
-                "vue": "Frontend",
-                "angular": "Frontend",
-                "svelte": "Frontend",
-                "jquery": "Frontend",
-                "express": "Backend",
-                "django": "Backend",
-                "flask": "Backend",
-                "fastapi": "Backend",
-                "spring": "Backend",
-                "pandas": "Data Science",
-                "numpy": "Data Science",
-                "matplotlib": "Data Science",
-                "seaborn": "Data Science",
-                "plotly": "Data Science",
-                "tensorflow": "Machine Learning",
-                "pytorch": "Machine Learning",
-                "scikit-learn": "Machine Learning",
-                "keras": "Machine Learning",
-                "docker": "DevOps",
-                "kubernetes": "DevOps",
-                "jenkins": "DevOps",
-                "terraform": "DevOps",
-                "ansible": "DevOps",
-                "react-native": "Mobile",
-                "flutter": "Mobile",
-                "ionic": "Mobile",
-                "mongodb": "Database",
-                "mongoose": "Database",
-                "postgresql": "Database",
-                "mysql": "Database",
-                "sqlite": "Database",
-                "prisma": "Database",
-                "sequelize": "Database"
-            }
-        }
-        
-        # Write to file
-        with open(SKILL_RULES_PATH, 'w') as f:
-            json.dump(default_rules, f, indent=2)
+    def __init__(self, registry: Optional[RuleRegistry] = None):
+        # Skill rules come from the shared registry
+        self.registry = registry or get_registry()
+    
+    @property
+    def rules(self) -> Mapping[str, Any]:
+        """Skill rules of the current registry snapshot"""
+        return self.registry.snapshot().skill_rules
+    
+    @property
+    def index(self) -> SkillIndex:
+        """Skill index of the current registry snapshot"""
+        return self.registry.snapshot().view(SKILL_INDEX_VIEW)
     
-    def _get_language_category(self, language: str) -> str:
+    def score_skills(self, language_libraries: Dict[str, List[str]]) -> List[SkillScore]:
         """
-        Get category for a language
+        Score skills based on detected languages and libraries
         
         Args:
-            language: Programming language
+            language_libraries: Dictionary of languages and libraries
             
         Returns:
-            str: Category name or None
+            List[SkillScore]: List of skill scores
         """
-        return self.rules.get("languages", {}).get(language)
+        return self.score_batch([language_libraries]).skill_scores(0, self._get_learning_resources)
     
-    def _get_library_category(self, language: str, library: str) -> str:
+    def score_batch(self, profiles: Sequence[Dict[str, List[str]]]) -> BatchScores:
         """
-        Get category for a library
+        Score many profiles at once
+        
+        Each profile maps languages to libraries, as for score_skills.
+        Only the token lookups run per item; counting, scoring, ranking
+        and level bucketing are array operations over all profiles.
         
         Args:
-            language: Programming language
-            library: Library name
+            profiles: Languages and libraries of each profile
             
         Returns:
-            str: Category name or None
+            BatchScores: Scores with one row per profile
         """
-        return self.rules.get("libraries", {}).get(library)
+        index = self.index
+        categories = index.categories
+        
+        # Flatten every match into (profile, category, weight) triples
+        rows, columns, weights = [], [], []
+        for row, language_libraries in enumerate(profiles):
+            for language, libraries in language_libraries.items():
+                column = index.category_id(language)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    weights.append(LANGUAGE_WEIGHT)
+                
+                for library in libraries:
+                    column = index.category_id(library)
+                    if column is not None:
+                        rows.append(row)
+                        columns.append(column)
+                        weights.append(LIBRARY_WEIGHT)
+        
+        shape = (len(profiles), len(categories))
+        cells = np.asarray(rows, dtype=np.int64) * len(categories) + np.asarray(columns, dtype=np.int64)
+        counts = np.bincount(cells, weights=weights, minlength=shape[0] * shape[1]).reshape(shape)
+        
+        # Same as calculate_skill_scores: share of all matches, truncated to a percentage
+        totals = counts.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percents = np.where(totals > 0, np.floor(counts / totals * 100), 0)
+        percents = np.minimum(percents, 100)
+        
+        detected = counts > 0
+        
+        # Highest score first; undetected categories sort last
+        rankings = np.argsort(np.where(detected, -percents, 1), axis=1, kind="stable")
+        
+        levels = np.digitize(percents, SKILL_LEVEL_THRESHOLDS)
+        level_distribution = np.stack(
+            [((levels == level) & detected).sum(axis=1) for level in range(len(SKILL_LEVELS))],
+            axis=1
+        )
+        
+        return BatchScores(
+            categories=categories,
+            counts=counts,
+            scores=percents / 100,
+            detected=detected,
+            rankings=rankings,
+            level_distribution=level_distribution,
+        )
     
     def _get_learning_resources(self, category: str) -> List[Dict[str, str]]:
         """
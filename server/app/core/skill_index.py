@@ -0,0 +1,192 @@
+"""
+Inverted index from library and language tokens to skills
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+# Registry view holding the skill index
+SKILL_INDEX_VIEW = "skill_index"
+
+# Other spellings of skills, by canonical token
+ALIASES = {
+    "scikit-learn": ["sklearn", "scikit"],
+    "pytorch": ["torch"],
+    "tensorflow": ["tf"],
+    "numpy": ["np"],
+    "pandas": ["pd"],
+    "node": ["node.js", "nodejs"],
+    "react": ["react.js", "reactjs"],
+    "react-native": ["react native"],
+    "vue": ["vue.js", "vuejs"],
+    "next": ["next.js", "nextjs"],
+    "express": ["express.js", "expressjs"],
+    "angular": ["angularjs", "@angular/core"],
+    "javascript": ["js"],
+    "typescript": ["ts"],
+    "python": ["py"],
+    "postgresql": ["postgres", "psycopg2"],
+    "mongodb": ["mongo", "pymongo"],
+    "tailwind": ["tailwindcss"],
+    "go": ["golang"],
+    "prisma": ["@prisma/client"],
+}
+
+# Categories of skills no rule or resource file mentions
+FALLBACK_CATEGORIES = {
+    "Frontend": ["html", "css", "javascript", "typescript", "react", "vue", "angular", "svelte", "bootstrap", "tailwind"],
+    "Backend": ["python", "java", "node", "express", "django", "flask", "fastapi", "spring"],
+    "Data Science": ["pandas", "numpy", "scipy", "matplotlib", "seaborn", "plotly"],
+    "Machine Learning": ["tensorflow", "pytorch", "scikit-learn", "keras"],
+    "DevOps": ["docker", "kubernetes", "jenkins", "terraform", "ansible"],
+    "Mobile": ["react-native", "flutter", "ionic", "swift", "kotlin"],
+    "Database": ["mongodb", "mongoose", "postgresql", "mysql", "sqlite", "prisma", "sequelize"],
+}
+
+def normalize_token(token: str) -> str:
+    """
+    Normalize a library or language name for lookup
+
+    Args:
+        token: Name as detected or requested
+
+    Returns:
+        str: Lowercase name with "_" and spaces as "-"
+    """
+    return token.strip().lower().replace("_", "-").replace(" ", "-")
+
+@dataclass(frozen=True)
+class SkillEntry:
+    """What is known about one skill"""
+    key: str
+    name: str
+    category: Optional[str]
+    info: Optional[Mapping[str, Any]] = None
+
+    @property
+    def description(self) -> str:
+        """Description from resources.json, or a generic one"""
+        if self.info and "description" in self.info:
+            return self.info["description"]
+        return f"{self.name} programming skill"
+
+    @property
+    def resources(self) -> Optional[List[Dict[str, str]]]:
+        """Learning resources from resources.json, None if it lacks the skill"""
+        return self.info.get("resources", []) if self.info is not None else None
+
+class SkillIndex:
+    """
+    Maps every known spelling of a skill to one SkillEntry
+
+    Entries merge, per canonical token, resources.json, the "libraries",
+    "languages" and category "libraries" of skill_rules.json, and
+    FALLBACK_CATEGORIES, in that order of precedence.
+    """
+
+    def __init__(self, entries: Dict[str, SkillEntry], aliases: Mapping[str, List[str]] = ALIASES):
+        """
+        Initialize index
+
+        Args:
+            entries: Entries by canonical token
+            aliases: Other spellings by canonical token
+        """
+        self.entries = entries
+        self._lookup: Dict[str, SkillEntry] = dict(entries)
+
+        # Fixed category order, e.g. for the columns of score matrices
+        self.categories: Tuple[str, ...] = tuple(sorted({
+            entry.category for entry in entries.values() if entry.category
+        }))
+        self._category_ids = {category: i for i, category in enumerate(self.categories)}
+        for key, spellings in aliases.items():
+            entry = entries.get(key)
+            if entry:
+                for spelling in spellings:
+                    self._lookup.setdefault(normalize_token(spelling), entry)
+
+    def lookup(self, token: str) -> Optional[SkillEntry]:
+        """
+        Find the skill a token names
+
+        Args:
+            token: Library, language or skill name, in any case
+
+        Returns:
+            Optional[SkillEntry]: The skill, or None if unknown
+        """
+        entry = self._lookup.get(token)
+        if entry is None:
+            entry = self._lookup.get(normalize_token(token))
+        return entry
+
+    def category(self, token: str) -> Optional[str]:
+        """
+        Get the category of the skill a token names
+
+        Args:
+            token: Library, language or skill name
+
+        Returns:
+            Optional[str]: Category name, or None if unknown
+        """
+        entry = self.lookup(token)
+        return entry.category if entry else None
+
+    def category_id(self, token: str) -> Optional[int]:
+        """
+        Get the position in categories of the skill a token names
+
+        Args:
+            token: Library, language or skill name
+
+        Returns:
+            Optional[int]: Category position, or None if unknown
+        """
+        category = self.category(token)
+        return self._category_ids[category] if category else None
+
+def build_skill_index(resources: Mapping[str, Any], skill_rules: Mapping[str, Any]) -> SkillIndex:
+    """
+    Build the skill index of a registry snapshot
+
+    Args:
+        resources: Resources by skill
+        skill_rules: Skill rules
+
+    Returns:
+        SkillIndex: Index over all rule sources
+    """
+    categories: Dict[str, str] = {}
+
+    def add(token: str, category: str) -> None:
+        # Sources are added from the lowest precedence up
+        categories[normalize_token(token)] = category
+
+    for category, tokens in FALLBACK_CATEGORIES.items():
+        for token in tokens:
+            add(token, category)
+    for category, rule in skill_rules.get("categories", {}).items():
+        for token in rule.get("libraries", []):
+            add(token, category)
+    for token, category in skill_rules.get("languages", {}).items():
+        add(token, category)
+    for token, category in skill_rules.get("libraries", {}).items():
+        add(token, category)
+
+    entries = {
+        key: SkillEntry(key=key, name=key.title(), category=category)
+        for key, category in categories.items()
+    }
+
+    for skill_name, skill_info in resources.items():
+        key = normalize_token(skill_name)
+        known = entries.get(key)
+        entries[key] = SkillEntry(
+            key=key,
+            name=skill_info.get("name", skill_name.title()),
+            category=skill_info.get("category") or (known.category if known else None),
+            info=skill_info,
+        )
+
+    return SkillIndex(entries)
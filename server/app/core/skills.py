@@ -1,9 +1,28 @@
 """
 Skill extraction logic for code analysis
 """
-import re
 from typing import Dict, List, Set, Optional
 
+from app.core.languages import LANGUAGE_PATTERNS, detect_language, language_from_extension, language_key
+from app.core.matcher import MultiPatternMatcher
+
+# Confidence added per pattern match, and the most a single pattern can add
+PATTERN_MATCH_WEIGHT = 0.05
+PATTERN_MAX_CONFIDENCE = 0.3
+
+# Matches beyond this count no longer change a pattern's confidence
+PATTERN_MATCH_CAP = 6
+
+# Start of an ES import up to its module specifier. The clause only spans
+# names, braces, commas and "*", so a match cannot run past the statement
+# and long minified lines are not rescanned for every "import".
+_IMPORT_FROM = r'\bimport\b[\w$\s{},*]*\bfrom\s*[\'"]'
+
+# Languages that reuse the skill patterns of another language
+PATTERN_FAMILIES = {
+    "typescript": "javascript",
+}
+
 class SkillExtractor:
     """
     Extracts skills from code files based on patterns and signatures
@@ -28,16 +47,16 @@ class SkillExtractor:
             
             # JavaScript/TypeScript patterns
             "javascript": {
-                "react": [r'import\s+.*\s+from\s+[\'"]react[\'"]', r'React\.', r'useState', r'useEffect', r'<\w+\s+', r'<\/\w+>'],
-                "vue": [r'import\s+.*\s+from\s+[\'"]vue[\'"]', r'createApp', r'Vue\.'],
-                "angular": [r'import\s+.*\s+from\s+[\'"]@angular', r'NgModule', r'Component'],
-                "express": [r'import\s+.*\s+from\s+[\'"]express[\'"]', r'require\([\'"]express[\'"]\)', r'app\.get', r'app\.post'],
-                "node": [r'import\s+.*\s+from\s+[\'"]node:', r'require\([\'"]node:', r'process\.env'],
-                "next": [r'import\s+.*\s+from\s+[\'"]next', r'NextPage', r'getServerSideProps'],
-                "mongodb": [r'import\s+.*\s+from\s+[\'"]mongodb[\'"]', r'MongoClient', r'ObjectId'],
-                "mongoose": [r'import\s+.*\s+from\s+[\'"]mongoose[\'"]', r'Schema', r'model\('],
-                "redux": [r'import\s+.*\s+from\s+[\'"]redux[\'"]', r'createStore', r'useSelector'],
-                "axios": [r'import\s+.*\s+from\s+[\'"]axios[\'"]', r'axios\.'],
+                "react": [_IMPORT_FROM + r'react[\'"]', r'React\.', r'useState', r'useEffect', r'<\w+\s+', r'<\/\w+>'],
+                "vue": [_IMPORT_FROM + r'vue[\'"]', r'createApp', r'Vue\.'],
+                "angular": [_IMPORT_FROM + r'@angular', r'NgModule', r'Component'],
+                "express": [_IMPORT_FROM + r'express[\'"]', r'require\([\'"]express[\'"]\)', r'app\.get', r'app\.post'],
+                "node": [_IMPORT_FROM + r'node:', r'require\([\'"]node:', r'process\.env'],
+                "next": [_IMPORT_FROM + r'next', r'NextPage', r'getServerSideProps'],
+                "mongodb": [_IMPORT_FROM + r'mongodb[\'"]', r'MongoClient', r'ObjectId'],
+                "mongoose": [_IMPORT_FROM + r'mongoose[\'"]', r'Schema', r'model\('],
+                "redux": [_IMPORT_FROM + r'redux[\'"]', r'createStore', r'useSelector'],
+                "axios": [_IMPORT_FROM + r'axios[\'"]', r'axios\.'],
             },
             
             # Java patterns
@@ -54,14 +73,13 @@ class SkillExtractor:
             }
         }
         
-        # Define language detection patterns
-        self.language_patterns = {
-            "python": [r'import\s+\w+', r'from\s+\w+\s+import', r'def\s+\w+\(', r'class\s+\w+:'],
-            "javascript": [r'const\s+\w+\s*=', r'let\s+\w+\s*=', r'function\s+\w+\(', r'import\s+.*\s+from'],
-            "typescript": [r'interface\s+\w+', r'type\s+\w+\s*=', r'const\s+\w+:\s*\w+'],
-            "java": [r'public\s+class', r'private\s+\w+\s+\w+;', r'package\s+\w+'],
-            "html": [r'<!DOCTYPE\s+html>', r'<html', r'<head', r'<body'],
-            "css": [r'\.\w+\s*{', r'#\w+\s*{', r'@media']
+        # Language detection patterns, used only when the extension is unknown
+        self.language_patterns = LANGUAGE_PATTERNS
+        
+        # Compile each pattern set once into a shared matcher
+        self._skill_matchers = {
+            language: MultiPatternMatcher(skills)
+            for language, skills in self.patterns.items()
         }
         
     def detect_language(self, code: str) -> str:
@@ -74,20 +92,7 @@ class SkillExtractor:
         Returns:
             str: Detected language
         """
-        matches = {}
-        
-        # Count matches for each language
-        for language, patterns in self.language_patterns.items():
-            count = 0
-            for pattern in patterns:
-                count += len(re.findall(pattern, code))
-            matches[language] = count
-        
-        # Return language with most matches
-        if not matches:
-            return "unknown"
-        
-        return max(matches.items(), key=lambda x: x[1])[0]
+        return detect_language(code)
     
     def extract_skills(self, code: str, file_extension: Optional[str] = None) -> Dict[str, float]:
         """
@@ -109,14 +114,15 @@ class SkillExtractor:
         skills = {}
         
         # Check for language-specific patterns
-        if language in self.patterns:
-            for skill, patterns in self.patterns[language].items():
+        matcher = self._skill_matchers.get(PATTERN_FAMILIES.get(language, language))
+        if matcher:
+            pattern_counts = matcher.count(code, cap=PATTERN_MATCH_CAP)
+            for skill, counts in pattern_counts.items():
                 confidence = 0
-                for pattern in patterns:
-                    matches = re.findall(pattern, code)
-                    if matches:
+                for count in counts:
+                    if count:
                         # Increase confidence based on number of matches
-                        confidence += min(0.3, len(matches) * 0.05)
+                        confidence += min(PATTERN_MAX_CONFIDENCE, count * PATTERN_MATCH_WEIGHT)
                 
                 if confidence > 0:
                     skills[skill] = min(1.0, confidence)
@@ -137,17 +143,6 @@ class SkillExtractor:
         Returns:
             Optional[str]: Language name or None
         """
-        extension = extension.lower()
-        
-        extension_map = {
-            '.py': 'python',
-            '.js': 'javascript',
-            '.jsx': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-            '.java': 'java',
-            '.html': 'html',
-            '.css': 'css',
-        }
+        language = language_from_extension(extension)
         
-        return extension_map.get(extension)
+        return language_key(language) if language else None
@@ -1,8 +1,9 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 import uvicorn
 import os
+import time
 from pathlib import Path
 import json
 from typing import List, Optional
@@ -10,13 +11,18 @@ from typing import List, Optional
 # Import local modules
 from app.models.skill_models import AnalysisRequest, AnalysisResponse, SkillScore
 from app.services.file_service import save_upload, validate_file
-from app.routes import analyze, feedback, resources, skills, analysis
+from app.services.executor import shutdown_executor
+from app.services.github_service import close_http_client
+from app.services.profiling import FORMATS, PROFILE_MODES, check_token, end_profile, start_profile
+from app.services.tracing import TracedJSONResponse, end_trace, metrics, start_trace
+from app.routes import analyze, feedback, resources, skills, analysis, jobs, profiles
 
 # Create FastAPI app
 app = FastAPI(
     title="SkillLens API",
     description="API for analyzing code and identifying developer skills",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=TracedJSONResponse
 )
 
 # Configure CORS
@@ -58,11 +64,81 @@ async def limit_request_size(request: Request, call_next):
     response = await call_next(request)
     return response
 
+# Profile requests on demand for admins: X-Profile names the mode
+# (cprofile or sampling) and X-Profile-Token authorizes it. The profile is
+# stored for download from /admin/profiles under the id in X-Profile-Id,
+# or returned instead of the response with X-Profile-Output: inline.
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    mode = request.headers.get("x-profile")
+    if not mode:
+        return await call_next(request)
+    
+    if not check_token(request.headers.get("x-profile-token")):
+        return JSONResponse(status_code=403, content={"detail": "Profiling requires a valid X-Profile-Token"})
+    if mode not in PROFILE_MODES:
+        return JSONResponse(
+            status_code=400,
+            content={"detail": f"Unknown profiling mode. Supported modes: {', '.join(PROFILE_MODES)}"}
+        )
+    
+    started = start_profile(mode, request.url.path)
+    if started is None:
+        return JSONResponse(status_code=409, content={"detail": "Another request is being profiled"})
+    profile, token = started
+    try:
+        response = await call_next(request)
+    finally:
+        end_profile(profile, token)
+    
+    if request.headers.get("x-profile-output") == "inline":
+        output_format = profile.formats[0]
+        response = Response(content=profile.render(output_format), media_type=FORMATS[output_format][0])
+    response.headers["X-Profile-Id"] = profile.id
+    return response
+
+# Time every request by phase, reporting phases in Server-Timing and /metrics
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    trace, token = start_trace()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+    finally:
+        end_trace(token)
+        elapsed = time.perf_counter() - start
+        # The route template, not the raw path, keeps label values bounded
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.observe_request(route, request.method, status, elapsed, trace)
+    
+    response.headers["Server-Timing"] = trace.server_timing(elapsed)
+    return response
+
 # Health check endpoint
 @app.get("/health", tags=["health"])
 async def health_check():
     return {"status": "ok", "message": "Server is running"}
 
+# Metrics in the Prometheus text format
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# Expire cached results in the background while the server runs
+@app.on_event("startup")
+async def start_cache_sweep():
+    analyze.cache_service.start_expiry_sweep()
+
+# Stop jobs, analysis worker processes, the cache sweep and HTTP connections with the server
+@app.on_event("shutdown")
+async def stop_workers():
+    jobs.job_queue.shutdown()
+    shutdown_executor()
+    analyze.cache_service.stop_expiry_sweep()
+    await close_http_client()
+
 # Include routers
 app.include_router(analyze.router, prefix="/analyze", tags=["analyze"])
 app.include_router(analyze.api_router, prefix="/api", tags=["api"])
@@ -70,6 +146,8 @@ app.include_router(feedback.router, prefix="/feedback", tags=["feedback"])
 app.include_router(resources.router, prefix="/resources", tags=["resources"])
 app.include_router(skills.router, prefix="/skills", tags=["skills"])
 app.include_router(analysis.router, prefix="/api", tags=["analysis"])
+app.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+app.include_router(profiles.router, prefix="/admin", tags=["admin"])
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,11 +1,15 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from app.models.skill_models import AnalysisResponse
 
 class DeveloperRankResponse(BaseModel):
     """Model for developer ranking response"""
     complexity_score: float = Field(..., description="Average cyclomatic complexity score")
     diversity_score: int = Field(..., description="Number of detected languages/frameworks")
     rank: str = Field(..., description="Developer rank based on scores")
+    partial: bool = Field(False, description="Whether analysis stopped before reading every file")
+    partial_reason: Optional[str] = Field(None, description="Why analysis stopped early: max_files or max_bytes")
 
 class SkillProgressResponse(BaseModel):
     """Model for skill progress chart response"""
@@ -19,10 +23,31 @@ class SkillProgressResponse(BaseModel):
 class UploadSummaryResponse(BaseModel):
     """Model for upload analysis summary response"""
     total_files: int = Field(..., description="Total number of files analyzed")
-    lines_of_code: int = Field(..., description="Total lines of code")
+    lines_of_code: int = Field(
+        ...,
+        description="Total lines of code, counted approximately like pygount: comments, docstrings and lines holding only strings are not code"
+    )
     most_used_languages: Dict[str, int] = Field(
         ..., 
         description="Most used languages with line counts"
     )
     processing_time_ms: float = Field(..., description="Processing time in milliseconds")
+    partial: bool = Field(False, description="Whether analysis stopped before reading every file")
     error: Optional[str] = None
+
+class ProfileRepository(BaseModel):
+    """Model for one repository of a user profile"""
+    name: str
+    url: str
+    branch: str
+    pushed_at: Optional[str] = None
+    lines_of_code: Optional[int] = None
+    weight: float = Field(..., description="Weight of the repository in the profile")
+    error: Optional[str] = None
+
+class UserProfileResponse(BaseModel):
+    """Model for a profile merged from all of a user's repositories"""
+    username: str
+    analysis: AnalysisResponse
+    rank: DeveloperRankResponse
+    repositories: List[ProfileRepository]
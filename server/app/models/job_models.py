@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class JobStatusResponse(BaseModel):
+    """Model for background analysis job status"""
+    job_id: str
+    kind: str = Field(..., description="Kind of analysis (file or github)")
+    target: str = Field(..., description="File name or repository URL being analyzed")
+    status: str = Field(..., description="queued, running, completed, failed or cancelled")
+    phase: str = Field(..., description="Current phase of the analysis")
+    files_total: int = Field(0, description="Number of files to analyze, once known")
+    files_done: int = Field(0, description="Number of files analyzed so far")
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
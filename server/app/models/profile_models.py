@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class ProfileSummary(BaseModel):
+    """Model for a stored request profile"""
+    profile_id: str
+    mode: str = Field(..., description="cprofile or sampling")
+    target: str = Field(..., description="Path of the profiled request")
+    formats: List[str] = Field(..., description="Formats the profile can be downloaded in")
+    started_at: float
+    finished_at: Optional[float] = None
@@ -20,6 +20,11 @@ class RepoAnalysisRequest(BaseModel):
     """Model for the new GitHub repository analysis request format"""
     github_url: AnyHttpUrl
 
+class BatchRepoAnalysisRequest(BaseModel):
+    """Model for analyzing several GitHub repositories in one request"""
+    github_urls: List[AnyHttpUrl] = Field(..., min_length=1)
+    branch: Optional[str] = "main"
+
 class AnalysisResponse(BaseModel):
     """Model for analysis response"""
     filename: str
@@ -27,5 +32,25 @@ class AnalysisResponse(BaseModel):
     libraries: List[str]
     skills: List[SkillScore]
     recommendations: List[str]
+    lines_of_code: Optional[int] = None
+    complexity: Optional[float] = None  # Average cyclomatic complexity
     error: Optional[str] = None
+    partial: bool = False  # Analysis stopped before reading every file
+    partial_reason: Optional[str] = None  # max_files, max_bytes or saturated
+    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+class DeveloperProfile(BaseModel):
+    """Model for the skills aggregated over several analyses"""
+    repositories: int  # Repositories analyzed without error
+    languages: Dict[str, int]  # Primary language of each repository, counted
+    libraries: List[str]
+    skills: List[SkillScore]  # Highest score of each skill across repositories
+    categories: List[SkillScore]  # Category scores over all languages and libraries
+    level_distribution: Dict[str, int]
+    recommendations: List[str]
+
+class BatchAnalysisResponse(BaseModel):
+    """Model for batch analysis response"""
+    results: List[AnalysisResponse]
+    profile: DeveloperProfile
     timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
@@ -1,24 +1,21 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request, Body
 from typing import Dict, List, Any, Optional
 import os
-import tempfile
-import shutil
 import json
 import time
 from pathlib import Path
 
 from app.models.analysis_models import DeveloperRankResponse, SkillProgressResponse, UploadSummaryResponse
 from app.utils.code_analysis import (
-    calculate_cyclomatic_complexity, 
     calculate_tech_diversity, 
     determine_developer_rank,
     calculate_skill_level_distribution,
-    calculate_category_average,
-    analyze_upload_content,
-    analyze_directory_content
+    calculate_category_average
 )
-from app.services.file_service import validate_file, process_file_upload
-from app.utils.helpers import get_timestamp, clone_github_repo
+from app.core.languages import get_extension
+from app.services.file_service import validate_file
+from app.services.pipeline import AnalysisBudget, analyze_upload, average_complexity, summarize_lines
+from app.utils.helpers import get_timestamp
 
 # Create router
 router = APIRouter(prefix="/api", tags=["analysis"])
@@ -27,7 +24,7 @@ router = APIRouter(prefix="/api", tags=["analysis"])
 async def developer_rank(file: UploadFile = File(...)):
     """
     Analyze a user's uploaded repo and return a developer_rank based on:
-    - Cyclomatic complexity (using radon)
+    - Cyclomatic complexity (computed as radon does)
     - Tech stack diversity (number of detected languages/frameworks)
     
     Args:
@@ -43,50 +40,25 @@ async def developer_rank(file: UploadFile = File(...)):
             detail="Invalid file type. Supported types: .py, .js, .jsx, .ts, .tsx, .html, .css, .java, .c, .cpp, .go, .rb, .php, .zip"
         )
     
-    # Process file upload
-    language_contents, error = await process_file_upload(file)
+    # Analyze each file once
+    # Complexity and diversity need every file, so the rank never stops on saturated skills
+    budget = AnalysisBudget(saturation_files=0)
+    analyses, error = await analyze_upload(file, budget=budget)
     
     # Check for errors
     if error:
         raise HTTPException(status_code=422, detail=error)
     
-    # Extract libraries from language contents
+    # Collect libraries detected in each file
     all_libraries = set()
-    for language, contents in language_contents.items():
-        for content in contents:
-            # Simple library detection (this is a basic implementation)
-            if language.lower() == "python":
-                # Detect Python imports
-                import_lines = [line for line in content.split('\n') if line.strip().startswith(('import ', 'from '))]
-                for line in import_lines:
-                    parts = line.split()
-                    if len(parts) > 1:
-                        lib = parts[1].split('.')[0]
-                        if lib not in ['os', 'sys', 'time', 'datetime', 'math', 'random']:
-                            all_libraries.add(lib)
-            
-            elif language.lower() in ["javascript", "typescript"]:
-                # Detect JS/TS imports
-                import_lines = [line for line in content.split('\n') if 'import ' in line or 'require(' in line]
-                for line in import_lines:
-                    if "from '" in line or 'from "' in line:
-                        parts = line.split('from ')
-                        if len(parts) > 1:
-                            lib = parts[1].strip("'\" ;")
-                            if not lib.startswith('.'):
-                                all_libraries.add(lib)
-                    elif 'require(' in line:
-                        parts = line.split('require(')
-                        if len(parts) > 1:
-                            lib = parts[1].split(')')[0].strip("'\" ")
-                            if not lib.startswith('.'):
-                                all_libraries.add(lib)
+    for analysis in analyses:
+        all_libraries.update(analysis.libraries)
     
     # Calculate complexity score
-    complexity_score = calculate_cyclomatic_complexity(language_contents)
+    complexity_score = average_complexity(analyses)
     
     # Calculate diversity score
-    diversity_score = calculate_tech_diversity(language_contents, list(all_libraries))
+    diversity_score = calculate_tech_diversity({analysis.language for analysis in analyses}, list(all_libraries))
     
     # Determine developer rank
     rank = determine_developer_rank(complexity_score, diversity_score)
@@ -95,7 +67,9 @@ async def developer_rank(file: UploadFile = File(...)):
     return DeveloperRankResponse(
         complexity_score=complexity_score,
         diversity_score=diversity_score,
-        rank=rank
+        rank=rank,
+        partial=budget.stopped is not None,
+        partial_reason=budget.stopped
     )
 
 @router.post("/skill_progress_chart", response_model=SkillProgressResponse)
@@ -165,39 +139,18 @@ async def upload_summary(file: UploadFile = File(...)):
         )
     
     try:
-        # Read file content
-        content = await file.read()
+        # Analyze every file in the upload, not only supported source files
+        # Line counts need every file, so the summary never stops on saturated skills
+        budget = AnalysisBudget(saturation_files=0)
+        analyses, error = await analyze_upload(file, extensions=None, budget=budget)
+        if error:
+            raise ValueError(error)
         
-        # Check if it's a zip file
-        _, ext = os.path.splitext(file.filename)
-        if ext.lower() == '.zip':
-            # Create temporary directory
-            temp_dir = tempfile.mkdtemp()
-            
-            try:
-                # Create temporary file for the zip
-                temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-                temp_zip.write(content)
-                temp_zip.close()
-                
-                # Extract zip file
-                import zipfile
-                with zipfile.ZipFile(temp_zip.name, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                
-                # Analyze directory content
-                total_lines, language_counts, processing_time, file_count = analyze_directory_content(temp_dir)
-                
-                # Clean up
-                os.unlink(temp_zip.name)
-                
-            finally:
-                # Clean up temporary directory
-                shutil.rmtree(temp_dir, ignore_errors=True)
-                
-        else:
-            # Analyze single file
-            total_lines, language_counts, processing_time = analyze_upload_content(content, file.filename)
+        total_lines, language_counts, file_count = summarize_lines(analyses)
+        processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+        
+        # A single file upload always counts as one file
+        if get_extension(file.filename) != '.zip':
             file_count = 1
         
         # Sort languages by line count (descending)
@@ -212,7 +165,8 @@ async def upload_summary(file: UploadFile = File(...)):
             total_files=file_count,
             lines_of_code=total_lines,
             most_used_languages=most_used_languages,
-            processing_time_ms=processing_time
+            processing_time_ms=processing_time,
+            partial=budget.stopped is not None
         )
         
     except Exception as e:
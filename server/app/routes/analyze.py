@@ -1,5 +1,8 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, List, Any, Optional
+import asyncio
 import os
 import tempfile
 import shutil
@@ -7,99 +10,71 @@ import json
 import re
 from pathlib import Path
 
-from app.models.skill_models import AnalysisRequest, RepoAnalysisRequest, AnalysisResponse, SkillScore
-from app.services.file_service import validate_file, save_upload, process_file_upload
-from app.services.parser import CodeParser
+from app.models.analysis_models import ProfileRepository, UserProfileResponse
+from app.models.skill_models import (
+    AnalysisRequest, RepoAnalysisRequest, BatchRepoAnalysisRequest, AnalysisResponse, BatchAnalysisResponse, SkillScore
+)
+from app.services.file_service import save_upload, validate_file
 from app.services.cache_service import CacheService
-from app.core.skills import SkillExtractor
+from app.services.github_service import fetch_github_archive, list_user_repos, parse_github_url, resolve_commit_sha
+from app.services.manifest_service import RepoManifestService, analyze_archive_entries, read_archive_changes
+from app.services.pipeline import RULES_VERSION, AnalysisBudget, AnalysisProgress, FileAnalysis, SkillMerger, analyze_upload_content
+from app.services.profile_service import build_developer_profile, merge_weighted, rank_developer, repo_weight
+from app.services.profiling import profiled
+from app.services.tracing import record_count, trace_phase
+from app.core.registry import registry_digest
 from app.core.resources import ResourceManager
-from app.utils.helpers import clone_github_repo, get_file_paths, get_timestamp
+from app.utils.helpers import format_sse, get_timestamp
 
 # Create routers
 router = APIRouter(prefix="/analyze", tags=["analyze"])
 api_router = APIRouter(prefix="/api", tags=["api"])
 
 # Initialize services
-skill_extractor = SkillExtractor()
 resource_manager = ResourceManager()
 cache_service = CacheService(cache_expiry=3600)  # 1 hour cache expiry
-code_parser = CodeParser()  # Initialize CodeParser instance
+repo_manifests = RepoManifestService()
 
-@router.post("/file", response_model=AnalysisResponse)
-async def analyze_file(file: UploadFile = File(...)):
+# Expiry for results keyed by commit SHA (7 days)
+COMMIT_CACHE_EXPIRY = 7 * 24 * 3600
+
+# Repositories accepted by one batch request, and analyzed at the same time
+MAX_BATCH_REPOS = int(os.getenv("ANALYSIS_MAX_BATCH_REPOS", "20"))
+MAX_BATCH_CONCURRENCY = int(os.getenv("ANALYSIS_BATCH_CONCURRENCY", "4"))
+
+_GITHUB_USERNAME = re.compile(r"[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})")
+
+def build_merged_response(filename: str, merger: SkillMerger, partial_reason: Optional[str] = None) -> AnalysisResponse:
     """
-    Analyze uploaded code file
+    Build analysis response from merged skills
     
     Args:
-        file: Uploaded file (.py, .js, .zip)
+        filename: Name of the uploaded file or repository
+        merger: Skills merged so far
+        partial_reason: Why analysis stopped before reading every file, if it did
         
     Returns:
         AnalysisResponse: Analysis results
     """
-    # Validate file
-    if not validate_file(file):
-        raise HTTPException(
-            status_code=400, 
-            detail="Invalid file type. Supported types: .py, .js, .jsx, .ts, .tsx, .html, .css, .java, .c, .cpp, .go, .rb, .php, .zip"
-        )
-    
-    # Process file upload
-    language_contents, error = await process_file_upload(file)
-    
-    # Check for errors
-    if error:
-        return AnalysisResponse(
-            filename=file.filename,
-            language="Unknown",
-            libraries=[],
-            skills=[],
-            recommendations=[],
-            error=error,
-            timestamp=get_timestamp()
-        )
-    
-    # Extract skills from each file content
-    all_skills = {}
-    primary_language = "Unknown"
-    all_libraries = set()
-    
-    # Process each language and its file contents
-    for language, contents in language_contents.items():
-        # Set primary language to the first one found
-        if primary_language == "Unknown":
-            primary_language = language
-        
-        # Process each file content
-        for content in contents:
-            # Extract skills from content
-            file_skills = skill_extractor.extract_skills(content, f".{language.lower()}")
-            
-            # Merge skills
-            for skill, score in file_skills.items():
-                if skill in all_skills:
-                    all_skills[skill] = max(all_skills[skill], score)
-                else:
-                    all_skills[skill] = score
-                
-                # Add to libraries if not a language itself
-                if skill.lower() != language.lower():
-                    all_libraries.add(skill)
+    with trace_phase("scoring"):
+        all_skills, primary_language, all_libraries = merger.result()
     
     # Create skill score objects
     skill_scores = []
-    for skill_name, score in all_skills.items():
-        # Get skill info
-        skill_info = resource_manager.get_skill_info(skill_name)
-        
-        skill_scores.append(
-            SkillScore(
-                name=skill_name.title(),
-                score=score,
-                category=skill_info.get("category", "Other"),
-                description=skill_info.get("description", f"{skill_name.title()} programming skill"),
-                learning_resources=skill_info.get("resources", [])
+    with trace_phase("resources"):
+        for skill_name, score in all_skills.items():
+            # Get skill info
+            skill_info = resource_manager.get_skill_info(skill_name)
+            
+            skill_scores.append(
+                SkillScore(
+                    name=skill_name.title(),
+                    score=score,
+                    category=skill_info.get("category", "Other"),
+                    description=skill_info.get("description", f"{skill_name.title()} programming skill"),
+                    learning_resources=skill_info.get("resources", [])
+                )
             )
-        )
     
     # Sort skills by score (descending)
     skill_scores.sort(key=lambda x: x.score, reverse=True)
@@ -107,185 +82,425 @@ async def analyze_file(file: UploadFile = File(...)):
     # Get recommendations (top 3 skills)
     recommendations = [skill.name for skill in skill_scores[:3]] if skill_scores else []
     
-    # Create response
     return AnalysisResponse(
-        filename=file.filename,
+        filename=filename,
         language=primary_language,
         libraries=sorted(list(all_libraries)),
         skills=skill_scores,
         recommendations=recommendations,
+        lines_of_code=merger.lines_of_code,
+        complexity=merger.average_complexity(),
+        partial=partial_reason is not None,
+        partial_reason=partial_reason,
         timestamp=get_timestamp()
     )
 
-@router.post("/github", response_model=AnalysisResponse)
-async def analyze_github(request: AnalysisRequest):
+def build_analysis_response(
+    filename: str,
+    analyses: List[FileAnalysis],
+    partial_reason: Optional[str] = None,
+) -> AnalysisResponse:
     """
-    Analyze GitHub repository
+    Build analysis response from per-file analysis records
     
     Args:
-        request: Analysis request with repository URL
+        filename: Name of the uploaded file or repository
+        analyses: Analysis records
+        partial_reason: Why analysis stopped before reading every file, if it did
         
     Returns:
         AnalysisResponse: Analysis results
     """
-    # Extract repository name from URL
-    repo_name = str(request.repository_url).split("/")[-1]
+    # Merge skills from each file, keeping the highest score
+    merger = SkillMerger()
+    with trace_phase("scoring"):
+        merger.add(analyses)
+    return build_merged_response(filename, merger, partial_reason)
+
+def build_error_response(filename: str, error: str) -> AnalysisResponse:
+    """
+    Build analysis response for a failed analysis
+    
+    Args:
+        filename: Name of the uploaded file or repository
+        error: Error message
+        
+    Returns:
+        AnalysisResponse: Empty analysis results with the error
+    """
+    return AnalysisResponse(
+        filename=filename,
+        language="Unknown",
+        libraries=[],
+        skills=[],
+        recommendations=[],
+        error=error,
+        timestamp=get_timestamp()
+    )
+
+def get_results_version() -> str:
+    """
+    Get a version string identifying everything a cached analysis result depends on
+    
+    Results hold per-file analyses as well as skill categories and learning
+    resources from the registry, so either changing invalidates them.
+    
+    Returns:
+        str: Rules version and registry content hash
+    """
+    return f"{RULES_VERSION}:{registry_digest()[:16]}"
+
+def get_cached_response(cache_key: str) -> Optional[AnalysisResponse]:
+    """
+    Get a cached analysis result, counting the lookup as a hit or miss
+    
+    Args:
+        cache_key: Cache key
+        
+    Returns:
+        Optional[AnalysisResponse]: Cached result or None
+    """
+    cached_result = cache_service.get_cached_result(cache_key)
+    if not cached_result:
+        record_count("result_cache_misses")
+        return None
+    
+    record_count("result_cache_hits")
+    return AnalysisResponse(**cached_result)
+
+def get_repo_name(repo_url: str) -> str:
+    """
+    Extract repository name from URL
+    
+    Args:
+        repo_url: Repository URL
+        
+    Returns:
+        str: Repository name
+    """
+    repo_name = repo_url.split("/")[-1]
     if repo_name.endswith(".git"):
         repo_name = repo_name[:-4]
+    return repo_name
+
+async def run_file_analysis(
+    filename: str,
+    content: bytes,
+    progress: Optional[AnalysisProgress] = None,
+) -> AnalysisResponse:
+    """
+    Analyze the content of an uploaded code file or zip archive
+    
+    Args:
+        filename: Name of the uploaded file
+        content: Uploaded bytes
+        progress: Optional receiver of progress events
         
-    # Generate cache key from repository URL and branch
-    cache_key = cache_service.get_cache_key(f"{request.repository_url}:{request.branch}")
+    Returns:
+        AnalysisResponse: Analysis results
+    """
+    # Analyze uploaded files
+    budget = AnalysisBudget()
+    analyses, error = await analyze_upload_content(filename, content, progress=progress, budget=budget)
+    
+    # Check for errors
+    if error:
+        return build_error_response(filename, error)
+    
+    # Create response
+    if progress:
+        progress.phase("aggregating")
+    return build_analysis_response(filename, analyses, budget.stopped)
+
+async def run_github_analysis(
+    request: AnalysisRequest,
+    progress: Optional[AnalysisProgress] = None,
+) -> AnalysisResponse:
+    """
+    Analyze GitHub repository
+    
+    Args:
+        request: Analysis request with repository URL
+        progress: Optional receiver of progress events
+        
+    Returns:
+        AnalysisResponse: Analysis results
+    """
+    progress = progress or AnalysisProgress()
+    
+    # Extract repository name from URL
+    repo_name = get_repo_name(str(request.repository_url))
+    
+    # Resolve the branch head so results are keyed by the commit analyzed
+    progress.phase("resolving")
+    commit_sha = None
+    parsed = parse_github_url(str(request.repository_url))
+    if parsed:
+        owner, repo = parsed
+        commit_sha, _ = await resolve_commit_sha(owner, repo, request.branch)
+    
+    if commit_sha:
+        # A commit never changes, so its result stays valid until the rules or resources do
+        cache_key = cache_service.get_cache_key(f"{owner}/{repo}@{commit_sha}:{get_results_version()}")
+        cache_expiry = COMMIT_CACHE_EXPIRY
+    else:
+        # Branch could not be resolved (e.g. API rate limit): key on URL and branch
+        cache_key = cache_service.get_cache_key(f"{request.repository_url}:{request.branch}:{get_results_version()}")
+        cache_expiry = None
     
     # Check if result is cached
-    cached_result = cache_service.get_cached_result(cache_key)
-    if cached_result:
+    cached_response = get_cached_response(cache_key)
+    if cached_response:
         # Return cached result
-        return AnalysisResponse(**cached_result)
+        return cached_response
     
-    # Clone GitHub repository
-    repo_dir, error = clone_github_repo(
+    # Download repository archive
+    progress.phase("downloading")
+    archive, error = await fetch_github_archive(
         repo_url=str(request.repository_url),
-        branch=request.branch
+        branch=request.branch,
+        commit_sha=commit_sha
     )
     
     # Check for errors
     if error:
-        return AnalysisResponse(
-            filename=repo_name,
-            language="Unknown",
-            libraries=[],
-            skills=[],
-            recommendations=[],
-            error=error,
-            timestamp=get_timestamp()
-        )
+        return build_error_response(repo_name, error)
     
-    # Get file paths from repository
-    from app.services.file_service import ALLOWED_EXTENSIONS
-    file_paths = get_file_paths(repo_dir, ALLOWED_EXTENSIONS)
+    # Re-analyze only files changed since the last run of this branch
+    progress.phase("reading")
+    owner, repo = parsed
+    previous = await run_in_threadpool(profiled(repo_manifests.load), owner, repo, request.branch)
+    try:
+        entries = await run_in_threadpool(profiled(read_archive_changes), archive, previous)
+    except Exception as e:
+        return build_error_response(repo_name, f"Error reading repository archive: {str(e)}")
     
-    # Process files
-    language_contents = {}
-    for file_path in file_paths:
-        # Get file extension
-        _, ext = os.path.splitext(file_path)
-        ext = ext.lower()
-        
-        # Skip zip files
-        if ext == '.zip':
-            continue
+    budget = AnalysisBudget()
+    try:
+        analyses = await analyze_archive_entries(archive, entries, progress, budget)
+    except Exception as e:
+        return build_error_response(repo_name, f"Error reading repository archive: {str(e)}")
+    await run_in_threadpool(profiled(repo_manifests.save), owner, repo, request.branch, entries)
+    
+    # Create response
+    progress.phase("aggregating")
+    response = build_analysis_response(repo_name, analyses, budget.stopped)
+    
+    # Cache the result
+    cache_service.cache_result(cache_key, response.dict(), expiry=cache_expiry)
+    
+    return response
+
+async def run_github_analysis_safely(request: AnalysisRequest) -> AnalysisResponse:
+    """
+    Analyze GitHub repository, turning unexpected failures into an error response
+    
+    Args:
+        request: Analysis request with repository URL
         
-        # Get language
-        from app.services.file_service import get_language_from_extension
-        language = get_language_from_extension(ext)
+    Returns:
+        AnalysisResponse: Analysis results
+    """
+    try:
+        return await run_github_analysis(request)
+    except Exception as e:
+        return build_error_response(get_repo_name(str(request.repository_url)), f"Analysis failed: {str(e)}")
+
+def validate_upload(file: UploadFile) -> None:
+    """
+    Reject uploads with unsupported file types
+    
+    Args:
+        file: Uploaded file
         
-        # Initialize language entry
-        if language not in language_contents:
-            language_contents[language] = []
+    Raises:
+        HTTPException: If the file type is not supported
+    """
+    if not validate_file(file):
+        raise HTTPException(
+            status_code=400, 
+            detail="Invalid file type. Supported types: .py, .js, .jsx, .ts, .tsx, .html, .css, .java, .c, .cpp, .go, .rb, .php, .zip"
+        )
+
+@router.post("/file", response_model=AnalysisResponse)
+async def analyze_file(file: UploadFile = File(...)):
+    """
+    Analyze uploaded code file
+    
+    Args:
+        file: Uploaded file (.py, .js, .zip)
         
-        # Read file content
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                language_contents[language].append(f.read())
-        except Exception:
-            # Skip files that can't be read
-            continue
+    Returns:
+        AnalysisResponse: Analysis results
+    """
+    # Validate file
+    validate_upload(file)
     
-    # Extract skills from each file content
-    all_skills = {}
-    primary_language = "Unknown"
-    all_libraries = set()
+    try:
+        content = await file.read()
+    except Exception as e:
+        return build_error_response(file.filename, f"Error processing file: {str(e)}")
     
-    # Process each language and its file contents
-    for language, contents in language_contents.items():
-        # Set primary language to the first one found
-        if primary_language == "Unknown":
-            primary_language = language
-        
-        # Process each file content
-        for content in contents:
-            # Extract skills from content
-            file_skills = skill_extractor.extract_skills(content, f".{language.lower()}")
-            
-            # Merge skills
-            for skill, score in file_skills.items():
-                if skill in all_skills:
-                    all_skills[skill] = max(all_skills[skill], score)
-                else:
-                    all_skills[skill] = score
-                
-                # Add to libraries if not a language itself
-                if skill.lower() != language.lower():
-                    all_libraries.add(skill)
+    return await run_file_analysis(file.filename, content)
+
+@router.post("/github", response_model=AnalysisResponse)
+async def analyze_github(request: AnalysisRequest):
+    """
+    Analyze GitHub repository
     
-    # Create skill score objects
-    skill_scores = []
-    for skill_name, score in all_skills.items():
-        # Get skill info
-        skill_info = resource_manager.get_skill_info(skill_name)
+    Args:
+        request: Analysis request with repository URL
         
-        skill_scores.append(
-            SkillScore(
-                name=skill_name.title(),
-                score=score,
-                category=skill_info.get("category", "Other"),
-                description=skill_info.get("description", f"{skill_name.title()} programming skill"),
-                learning_resources=skill_info.get("resources", [])
-            )
-        )
+    Returns:
+        AnalysisResponse: Analysis results
+    """
+    return await run_github_analysis(request)
+
+class StreamingProgress(AnalysisProgress):
+    """
+    Turns analysis progress into Server-Sent Events
+
+    Every finished batch is merged into the running skill scores, and the
+    scores so far are sent in the same shape as the final response.
+    """
     
-    # Sort skills by score (descending)
-    skill_scores.sort(key=lambda x: x.score, reverse=True)
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.merger = SkillMerger()
+        self.files_total = 0
+        self.files_analyzed = 0
+        self.events: asyncio.Queue = asyncio.Queue()
     
-    # Get recommendations (top 3 skills)
-    recommendations = [skill.name for skill in skill_scores[:3]] if skill_scores else []
+    def phase(self, name: str, total: Optional[int] = None) -> None:
+        if total is not None:
+            self.files_total = total
+            self.files_analyzed = 0
+        self.events.put_nowait(format_sse("phase", {"phase": name, "files_total": self.files_total}))
     
-    # Create response
-    response = AnalysisResponse(
-        filename=repo_name,
-        language=primary_language,
-        libraries=sorted(list(all_libraries)),
-        skills=skill_scores,
-        recommendations=recommendations,
-        timestamp=get_timestamp()
+    def files_done(self, analyses: List[FileAnalysis]) -> None:
+        self.merger.add(analyses)
+        self.files_analyzed += len(analyses)
+        partial = build_merged_response(self.filename, self.merger)
+        self.events.put_nowait(format_sse("skills", {
+            "files_done": self.files_analyzed,
+            "files_total": self.files_total,
+            "analysis": partial.dict(),
+        }))
+
+def stream_analysis(filename: str, run) -> StreamingResponse:
+    """
+    Run an analysis while streaming its progress as Server-Sent Events
+
+    Events are "phase" on each phase change, "skills" with the merged
+    scores after each batch of files, and a final "result" with the
+    complete AnalysisResponse.
+
+    Args:
+        filename: Name of the uploaded file or repository
+        run: Coroutine function taking a progress receiver and returning the response
+
+    Returns:
+        StreamingResponse: Event stream
+    """
+    progress = StreamingProgress(filename)
+    
+    async def analyze():
+        try:
+            response = await run(progress)
+        except Exception as e:
+            response = build_error_response(filename, f"Analysis failed: {str(e)}")
+        progress.events.put_nowait(format_sse("result", response.dict()))
+        progress.events.put_nowait(None)
+    
+    async def events():
+        task = asyncio.create_task(analyze())
+        try:
+            while True:
+                event = await progress.events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            # Stop analyzing if the client goes away
+            task.cancel()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
+
+@router.post("/stream/file")
+async def stream_file_analysis(file: UploadFile = File(...)):
+    """
+    Analyze uploaded code file, streaming partial skill scores
     
-    # Cache the result
-    cache_service.cache_result(cache_key, response.dict())
+    Args:
+        file: Uploaded file (.py, .js, .zip)
+        
+    Returns:
+        StreamingResponse: Server-Sent Events with partial and final results
+    """
+    # Validate file
+    validate_upload(file)
     
-    return response
+    # Read now: the upload is closed once streaming starts
+    filename = file.filename
+    content = await file.read()
+    
+    return stream_analysis(filename, lambda progress: run_file_analysis(filename, content, progress))
 
-@api_router.post("/analyze-repo", response_model=AnalysisResponse)
-async def analyze_repo(request: RepoAnalysisRequest):
+@router.post("/stream/github")
+async def stream_github_analysis(request: AnalysisRequest):
     """
-    Analyze GitHub repository from URL
+    Analyze GitHub repository, streaming partial skill scores
     
     Args:
-        request: Analysis request with GitHub URL
+        request: Analysis request with repository URL
         
     Returns:
-        AnalysisResponse: Analysis results
+        StreamingResponse: Server-Sent Events with partial and final results
+    """
+    repo_name = get_repo_name(str(request.repository_url))
+    return stream_analysis(repo_name, lambda progress: run_github_analysis(request, progress))
+
+def normalize_repo_url(github_url: str) -> Optional[str]:
     """
-    # Extract username and repository name from GitHub URL
-    github_url = str(request.github_url)
+    Reduce a GitHub URL to its repository URL
     
+    Args:
+        github_url: GitHub URL, possibly of a page inside the repository
+        
+    Returns:
+        Optional[str]: https://github.com/owner/repo, or None if invalid
+    """
     # Parse GitHub URL to extract username and repo name
     pattern = r"https?://github\.com/([\w-]+)/([\w.-]+)(?:\.git)?(?:/.*)?$"
     match = re.match(pattern, github_url)
     
     if not match:
-        return AnalysisResponse(
-            filename="Unknown",
-            language="Unknown",
-            libraries=[],
-            skills=[],
-            recommendations=[],
-            error="Invalid GitHub URL format",
-            timestamp=get_timestamp()
-        )
+        return None
     
     username, repo_name = match.groups()
-    repo_url = f"https://github.com/{username}/{repo_name}"
+    if repo_name.endswith(".git"):
+        repo_name = repo_name[:-4]
+    return f"https://github.com/{username}/{repo_name}"
+
+@api_router.post("/analyze-repo", response_model=AnalysisResponse)
+async def analyze_repo(request: RepoAnalysisRequest):
+    """
+    Analyze GitHub repository from URL
+    
+    Args:
+        request: Analysis request with GitHub URL
+        
+    Returns:
+        AnalysisResponse: Analysis results
+    """
+    repo_url = normalize_repo_url(str(request.github_url))
+    
+    if not repo_url:
+        return build_error_response("Unknown", "Invalid GitHub URL format")
     
     # Create an AnalysisRequest object to reuse existing functionality
     analysis_request = AnalysisRequest(
@@ -296,3 +511,139 @@ async def analyze_repo(request: RepoAnalysisRequest):
     
     # Use the existing analyze_github function
     return await analyze_github(analysis_request)
+
+@api_router.post("/analyze-repos", response_model=BatchAnalysisResponse)
+async def analyze_repos(request: BatchRepoAnalysisRequest):
+    """
+    Analyze several GitHub repositories and aggregate a developer profile
+    
+    Repositories are analyzed concurrently, at most MAX_BATCH_CONCURRENCY
+    at a time. Downloads share the pooled HTTP client and file analysis
+    runs in the worker pool, so the event loop stays free.
+    
+    Args:
+        request: GitHub URLs and the branch to analyze in each
+        
+    Returns:
+        BatchAnalysisResponse: Results in request order, and the aggregated profile
+    """
+    if len(request.github_urls) > MAX_BATCH_REPOS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_REPOS} repositories per request")
+    
+    slots = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+    running: Dict[str, asyncio.Task] = {}
+    
+    async def analyze_one(repo_url: str) -> AnalysisResponse:
+        async with slots:
+            return await run_github_analysis_safely(AnalysisRequest(repository_url=repo_url, branch=request.branch))
+    
+    async def invalid(github_url: str) -> AnalysisResponse:
+        return build_error_response(github_url, "Invalid GitHub URL format")
+    
+    tasks = []
+    for github_url in request.github_urls:
+        repo_url = normalize_repo_url(str(github_url))
+        if not repo_url:
+            tasks.append(asyncio.ensure_future(invalid(str(github_url))))
+            continue
+        
+        # Analyze each repository once, however often it is listed
+        if repo_url not in running:
+            running[repo_url] = asyncio.ensure_future(analyze_one(repo_url))
+        tasks.append(running[repo_url])
+    
+    results = await asyncio.gather(*tasks)
+    
+    # Repositories listed twice count once in the profile
+    profile = build_developer_profile([task.result() for task in running.values()])
+    
+    return BatchAnalysisResponse(results=results, profile=profile)
+
+async def analyze_profile_repo(owner: str, repo_info: Dict[str, Any]) -> AnalysisResponse:
+    """
+    Analyze one repository of a user profile
+    
+    The result is also cached under the repository's last push time, so
+    refreshing a profile skips even the commit lookup of repositories
+    nobody pushed to since.
+    
+    Args:
+        owner: Repository owner
+        repo_info: Repository as returned by the list-repos API
+        
+    Returns:
+        AnalysisResponse: Analysis results
+    """
+    name = repo_info["name"]
+    branch = repo_info.get("default_branch") or "main"
+    pushed_at = repo_info.get("pushed_at")
+    
+    cache_key = None
+    if pushed_at:
+        cache_key = cache_service.get_cache_key(f"{owner}/{name}:{branch}@{pushed_at}:{get_results_version()}")
+        cached_response = get_cached_response(cache_key)
+        if cached_response:
+            return cached_response
+    
+    response = await run_github_analysis_safely(
+        AnalysisRequest(repository_url=f"https://github.com/{owner}/{name}", branch=branch)
+    )
+    
+    if cache_key and not response.error:
+        cache_service.cache_result(cache_key, response.dict(), expiry=COMMIT_CACHE_EXPIRY)
+    
+    return response
+
+@api_router.get("/profile/{username}", response_model=UserProfileResponse)
+async def analyze_user_profile(username: str):
+    """
+    Analyze all of a GitHub user's repositories into one profile
+    
+    Repositories are analyzed concurrently like /analyze-repos. Each one's
+    skills count by its size and how recently it was pushed to.
+    
+    Args:
+        username: GitHub username
+        
+    Returns:
+        UserProfileResponse: Merged analysis, developer rank and the repositories used
+    """
+    if not _GITHUB_USERNAME.fullmatch(username):
+        raise HTTPException(status_code=400, detail="Invalid GitHub username")
+    
+    repos, error = await list_user_repos(username)
+    if error:
+        raise HTTPException(status_code=502, detail=error)
+    
+    slots = asyncio.Semaphore(MAX_BATCH_CONCURRENCY)
+    
+    async def analyze_one(repo_info: Dict[str, Any]) -> AnalysisResponse:
+        async with slots:
+            return await analyze_profile_repo(username, repo_info)
+    
+    responses = await asyncio.gather(*(analyze_one(repo_info) for repo_info in repos))
+    weights = [
+        repo_weight(response.lines_of_code, repo_info.get("pushed_at")) if not response.error else 0.0
+        for repo_info, response in zip(repos, responses)
+    ]
+    
+    with trace_phase("scoring"):
+        merged = merge_weighted(username, responses, weights)
+    
+    return UserProfileResponse(
+        username=username,
+        analysis=merged,
+        rank=rank_developer(responses, merged),
+        repositories=[
+            ProfileRepository(
+                name=repo_info["name"],
+                url=f"https://github.com/{username}/{repo_info['name']}",
+                branch=repo_info.get("default_branch") or "main",
+                pushed_at=repo_info.get("pushed_at"),
+                lines_of_code=response.lines_of_code,
+                weight=round(weight, 3),
+                error=response.error,
+            )
+            for repo_info, response, weight in zip(repos, responses, weights)
+        ],
+    )
@@ -0,0 +1,183 @@
+"""
+Routes for background analysis jobs
+"""
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.models.job_models import JobStatusResponse
+from app.models.skill_models import AnalysisRequest, AnalysisResponse
+from app.routes.analyze import build_error_response, run_file_analysis, run_github_analysis, validate_upload
+from app.services.job_service import CANCELLED, Job, LocalJobQueue, QueueFullError
+from app.utils.helpers import format_sse
+
+# Create router
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# Initialize job queue
+job_queue = LocalJobQueue()
+
+# Seconds between keep-alive comments on idle event streams
+KEEPALIVE_INTERVAL = 15
+
+def get_job(job_id: str) -> Job:
+    """
+    Get a job or fail with 404
+
+    Args:
+        job_id: Job id
+
+    Returns:
+        Job: The job
+
+    Raises:
+        HTTPException: If the job is unknown or expired
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+def submit_job(kind: str, target: str, runner) -> JobStatusResponse:
+    """
+    Submit a job or fail with 429 when the queue is full
+
+    Args:
+        kind: Kind of analysis
+        target: File name or repository URL being analyzed
+        runner: Coroutine function running the analysis
+
+    Returns:
+        JobStatusResponse: Status of the queued job
+    """
+    try:
+        job = job_queue.submit(kind, target, runner)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    return JobStatusResponse(**job.to_dict())
+
+@router.post("/file", response_model=JobStatusResponse, status_code=202)
+async def submit_file_job(file: UploadFile = File(...)):
+    """
+    Queue analysis of an uploaded code file
+
+    Args:
+        file: Uploaded file (.py, .js, .zip)
+
+    Returns:
+        JobStatusResponse: Status of the queued job
+    """
+    # Validate file
+    validate_upload(file)
+
+    # Read now: the upload is closed once this request ends
+    filename = file.filename
+    content = await file.read()
+
+    return submit_job("file", filename, lambda progress: run_file_analysis(filename, content, progress))
+
+@router.post("/github", response_model=JobStatusResponse, status_code=202)
+async def submit_github_job(request: AnalysisRequest):
+    """
+    Queue analysis of a GitHub repository
+
+    Args:
+        request: Analysis request with repository URL
+
+    Returns:
+        JobStatusResponse: Status of the queued job
+    """
+    return submit_job("github", str(request.repository_url), lambda progress: run_github_analysis(request, progress))
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    """
+    Get the status and progress of a job
+
+    Args:
+        job_id: Job id
+
+    Returns:
+        JobStatusResponse: Job status
+    """
+    return JobStatusResponse(**get_job(job_id).to_dict())
+
+@router.get("/{job_id}/result", response_model=AnalysisResponse)
+async def get_job_result(job_id: str):
+    """
+    Get the analysis results of a finished job
+
+    Args:
+        job_id: Job id
+
+    Returns:
+        AnalysisResponse: Analysis results
+    """
+    job = get_job(job_id)
+
+    if job.status == CANCELLED:
+        raise HTTPException(status_code=409, detail="Job was cancelled")
+    if not job.finished:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    if job.result is None:
+        return build_error_response(job.target, job.error)
+    return AnalysisResponse(**job.result)
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """
+    Stream job status as Server-Sent Events
+
+    A "progress" event is sent on every change and a final "done" event
+    when the job finishes.
+
+    Args:
+        job_id: Job id
+
+    Returns:
+        StreamingResponse: Event stream
+    """
+    job = get_job(job_id)
+
+    async def events():
+        version = -1
+        while True:
+            if job.version != version:
+                version = job.version
+                yield format_sse("done" if job.finished else "progress", job.to_dict())
+                if job.finished:
+                    return
+            else:
+                # Keep proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+
+            if await request.is_disconnected():
+                return
+            await job_queue.wait_for_change(job, version, KEEPALIVE_INTERVAL)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.delete("/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job
+
+    The response already reports the job as cancelled. Analysis work that
+    has not started never runs; work already running in a worker finishes
+    in the background and its result is dropped.
+
+    Args:
+        job_id: Job id
+
+    Returns:
+        JobStatusResponse: Job status
+    """
+    job = job_queue.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return JobStatusResponse(**job.to_dict())
@@ -0,0 +1,67 @@
+"""
+Admin routes for downloading request profiles
+"""
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response
+
+from app.models.profile_models import ProfileSummary
+from app.services.profiling import FORMATS, check_token, profile_store
+
+def require_profiling_token(x_profile_token: Optional[str] = Header(None)) -> None:
+    """
+    Reject requests without the admin profiling token
+
+    Args:
+        x_profile_token: Value of the X-Profile-Token header
+
+    Raises:
+        HTTPException: If profiling is disabled or the token does not match
+    """
+    if not check_token(x_profile_token):
+        raise HTTPException(status_code=403, detail="A valid X-Profile-Token is required")
+
+# Create router
+router = APIRouter(prefix="/profiles", tags=["admin"], dependencies=[Depends(require_profiling_token)])
+
+@router.get("", response_model=List[ProfileSummary])
+async def list_profiles():
+    """
+    List stored request profiles, newest first
+
+    Returns:
+        List[ProfileSummary]: Stored profiles
+    """
+    return [ProfileSummary(**profile.to_dict()) for profile in profile_store.list()]
+
+@router.get("/{profile_id}")
+async def download_profile(profile_id: str, format: Optional[str] = Query(None)):
+    """
+    Download a stored request profile
+
+    Args:
+        profile_id: Profile id
+        format: "collapsed" for sampling profiles, "pstats" or "text" for
+            cProfile profiles (default: the first format of the profile)
+
+    Returns:
+        Response: Profile as an attachment
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+
+    output_format = format or profile.formats[0]
+    if output_format not in profile.formats:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{profile.mode} profiles are available as: {', '.join(profile.formats)}"
+        )
+
+    media_type, extension = FORMATS[output_format]
+    return Response(
+        content=profile.render(output_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{profile.id}.{extension}"'}
+    )
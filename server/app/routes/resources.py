@@ -1,9 +1,11 @@
 """
 Routes for learning resources
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List, Any
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response
+from typing import Optional
 
+from app.core.catalog import catalog_response, make_payload
 from app.core.resources import ResourceManager
 
 # Create router
@@ -13,47 +15,35 @@ router = APIRouter(prefix="/resources", tags=["resources"])
 resource_manager = ResourceManager()
 
 @router.get("/{skill_name}")
-async def get_resources(skill_name: str) -> Dict[str, Any]:
+async def get_resources(skill_name: str, if_none_match: Optional[str] = Header(None)) -> Response:
     """
     Get learning resources for a skill
     
     Args:
-        skill_name: Name of the skill
-        
+        skill_name: Name of the skill, or an alias of it
+        if_none_match: ETag of the client's cached copy
+    
     Returns:
-        Dict[str, Any]: Skill information with resources
+        Response: Skill information with resources
     """
-    # Get skill info
-    skill_info = resource_manager.get_skill_info(skill_name)
+    # Known skills and their aliases are served from the precomputed catalog
+    entry = resource_manager.index.lookup(skill_name)
+    payload = resource_manager.catalog["resources"].get(entry.key) if entry else None
+    if payload:
+        return catalog_response(payload, if_none_match)
     
-    # Return skill info
-    return skill_info
+    # Other skills get generated info, tagged the same way
+    return catalog_response(make_payload(resource_manager.get_skill_info(skill_name)), if_none_match)
 
 @router.get("/")
-async def get_all_skills() -> Dict[str, List[Dict[str, str]]]:
+async def get_all_skills(if_none_match: Optional[str] = Header(None)) -> Response:
     """
     Get all available skills grouped by category
     
+    Args:
+        if_none_match: ETag of the client's cached copy
+    
     Returns:
-        Dict[str, List[Dict[str, str]]]: Skills grouped by category
+        Response: Skills grouped by category
     """
-    # Get all skills from resource manager
-    skills_by_category = {}
-    
-    # Load resources
-    resources = resource_manager._load_resources()
-    
-    # Group skills by category
-    for skill_name, skill_info in resources.items():
-        category = skill_info.get("category", "Other")
-        
-        if category not in skills_by_category:
-            skills_by_category[category] = []
-        
-        skills_by_category[category].append({
-            "name": skill_info.get("name", skill_name.title()),
-            "description": skill_info.get("description", f"{skill_name.title()} programming skill")
-        })
-    
-    # Return skills by category
-    return {"categories": skills_by_category}
+    return catalog_response(resource_manager.catalog["resource_categories"], if_none_match)
@@ -1,9 +1,11 @@
 """
 Routes for skills
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict, List, Any
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response
+from typing import Optional
 
+from app.core.catalog import catalog_response
 from app.core.resources import ResourceManager
 
 # Create router
@@ -13,56 +15,30 @@ router = APIRouter(prefix="/skills", tags=["skills"])
 resource_manager = ResourceManager()
 
 @router.get("/")
-async def get_all_skills() -> Dict[str, List[Dict[str, Any]]]:
+async def get_all_skills(if_none_match: Optional[str] = Header(None)) -> Response:
     """
     Get all available skills
     
-    Returns:
-        Dict[str, List[Dict[str, Any]]]: List of skills with details
-    """
-    # Load resources
-    resources = resource_manager._load_resources()
-    
-    # Create skills list
-    skills = []
-    for skill_name, skill_info in resources.items():
-        skills.append({
-            "name": skill_info.get("name", skill_name.title()),
-            "category": skill_info.get("category", "Other"),
-            "description": skill_info.get("description", f"{skill_name.title()} programming skill")
-        })
+    The list is built when the resources are loaded and served with an
+    ETag, so a repeated request can be answered with 304.
     
-    # Sort skills by name
-    skills.sort(key=lambda x: x["name"])
+    Args:
+        if_none_match: ETag of the client's cached copy
     
-    return {"skills": skills}
+    Returns:
+        Response: List of skills with details, sorted by name
+    """
+    return catalog_response(resource_manager.catalog["skills"], if_none_match)
 
 @router.get("/categories")
-async def get_skill_categories() -> Dict[str, List[Dict[str, Any]]]:
+async def get_skill_categories(if_none_match: Optional[str] = Header(None)) -> Response:
     """
     Get skills grouped by category
     
+    Args:
+        if_none_match: ETag of the client's cached copy
+    
     Returns:
-        Dict[str, List[Dict[str, Any]]]: Skills grouped by category
+        Response: Skills grouped by category, sorted by name
     """
-    # Load resources
-    resources = resource_manager._load_resources()
-    
-    # Group skills by category
-    skills_by_category = {}
-    for skill_name, skill_info in resources.items():
-        category = skill_info.get("category", "Other")
-        
-        if category not in skills_by_category:
-            skills_by_category[category] = []
-        
-        skills_by_category[category].append({
-            "name": skill_info.get("name", skill_name.title()),
-            "description": skill_info.get("description", f"{skill_name.title()} programming skill")
-        })
-    
-    # Sort skills in each category by name
-    for category in skills_by_category:
-        skills_by_category[category].sort(key=lambda x: x["name"])
-    
-    return {"categories": skills_by_category}
+    return catalog_response(resource_manager.catalog["skill_categories"], if_none_match)
@@ -1,9 +1,14 @@
 """
 Cache service for storing analysis results
 """
-from typing import Dict, Any, Optional
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
 import json
 import os
+import re
+import sqlite3
+import threading
 import time
 from pathlib import Path
 import hashlib
@@ -14,97 +19,503 @@ CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
 # Ensure cache directory exists
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-class CacheService:
+# Backend selection: "tiered" (memory + SQLite), "sqlite" or "memory"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "tiered")
+
+# SQLite database shared by all workers on a host
+CACHE_DB_PATH = Path(os.getenv("CACHE_DB_PATH", str(CACHE_DIR / "cache.db")))
+
+# Size caps, in bytes of serialized JSON
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+CACHE_MEMORY_MAX_BYTES = int(os.getenv("CACHE_MEMORY_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Seconds between background expiry sweeps
+CACHE_SWEEP_INTERVAL = int(os.getenv("CACHE_SWEEP_INTERVAL", "300"))
+
+# Seconds within which reads of an entry do not refresh its last access again
+CACHE_ACCESS_RESOLUTION = 60
+
+# Entries written by the file-per-entry cache, named by their MD5 key
+LEGACY_CACHE_FILE = re.compile(r"[0-9a-f]{32}\.json")
+
+class CacheBackend(ABC):
     """
-    Service for caching analysis results
+    Storage backend interface for CacheService
+    
+    Values are JSON-serializable dictionaries and must be treated as
+    read-only by callers.
     """
     
-    def __init__(self, cache_expiry: int = 3600):
+    @abstractmethod
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
         """
-        Initialize cache service
+        Get a live entry
         
         Args:
-            cache_expiry: Cache expiry time in seconds (default: 1 hour)
+            key: Cache key
+        
+        Returns:
+            Optional[Tuple[Dict[str, Any], float]]: Value and expiry timestamp, or None
         """
-        self.cache_expiry = cache_expiry
     
-    def get_cache_key(self, data: str) -> str:
+    @abstractmethod
+    def set_entry(self, key: str, value: Dict[str, Any], expires_at: float, data: str) -> None:
         """
-        Generate cache key from data
+        Store an entry, replacing any existing one atomically
         
         Args:
-            data: Data to generate key from
-            
+            key: Cache key
+            value: Value to store
+            expires_at: Expiry timestamp
+            data: The value encoded as JSON, which also gives its size
+        """
+    
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Delete an entry
+        
+        Args:
+            key: Cache key
+        """
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete all entries"""
+    
+    @abstractmethod
+    def sweep(self) -> int:
+        """
+        Delete expired entries
+        
         Returns:
-            str: Cache key
+            int: Number of entries deleted
         """
-        # Generate MD5 hash of data
-        return hashlib.md5(data.encode()).hexdigest()
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache with per-entry expiry and a byte cap
+    """
     
-    def get_cache_path(self, cache_key: str) -> Path:
+    def __init__(self, max_bytes: int = CACHE_MEMORY_MAX_BYTES):
         """
-        Get cache file path
+        Initialize memory backend
         
         Args:
-            cache_key: Cache key
+            max_bytes: Maximum total size of stored values
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            value, expires_at, _ = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            
+            self._entries.move_to_end(key)
+            return value, expires_at
+    
+    def set_entry(self, key: str, value: Dict[str, Any], expires_at: float, data: str) -> None:
+        # Values larger than the whole cache are not worth keeping
+        size = len(data)
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self.total_bytes += size
             
+            # Evict least recently used entries
+            while self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+    
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+    
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+        return len(expired)
+    
+    def _remove(self, key: str) -> None:
+        """Remove an entry; the caller must hold the lock"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    SQLite cache shared by every worker process on the host
+    
+    Writes are single transactions, so readers never see partial entries.
+    When the stored size exceeds the cap, least recently used entries are
+    deleted. Triggers keep the total size in the cache_size table, so
+    writes do not sum the sizes of all entries, and reads only record an
+    access once per CACHE_ACCESS_RESOLUTION seconds.
+    """
+    
+    def __init__(self, path: Path = CACHE_DB_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        """
+        Initialize SQLite backend
+        
+        Args:
+            path: Database file path
+            max_bytes: Maximum total size of stored values
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        
+        os.makedirs(self.path.parent, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_size_insert AFTER INSERT ON cache "
+                "BEGIN UPDATE cache_size SET total = total + new.size; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_size_update AFTER UPDATE OF size ON cache "
+                "BEGIN UPDATE cache_size SET total = total + new.size - old.size; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS cache_size_delete AFTER DELETE ON cache "
+                "BEGIN UPDATE cache_size SET total = total - old.size; END"
+            )
+            # Seeded after the triggers exist, so entries written meanwhile are in the sum
+            conn.execute("INSERT OR IGNORE INTO cache_size (id, total) SELECT 0, COALESCE(SUM(size), 0) FROM cache")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get this thread's connection, opening it on first use
+        
         Returns:
-            Path: Cache file path
+            sqlite3.Connection: Database connection
         """
-        return CACHE_DIR / f"{cache_key}.json"
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10)
+            # WAL lets readers in other workers proceed during writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
     
-    def get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        entry = self.get_serialized(key)
+        if entry is None:
+            return None
+        
+        data, expires_at = entry
+        try:
+            return json.loads(data), expires_at
+        except ValueError:
+            # Remove invalid cache
+            self.delete(key)
+            return None
+    
+    def get_serialized(self, key: str) -> Optional[Tuple[str, float]]:
         """
-        Get cached result
+        Get a live entry as stored, without decoding it
         
         Args:
-            cache_key: Cache key
+            key: Cache key
+        
+        Returns:
+            Optional[Tuple[str, float]]: JSON-encoded value and expiry timestamp, or None
+        """
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at FROM cache WHERE key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+            if row is None:
+                return None
             
+            if now - row[2] > CACHE_ACCESS_RESOLUTION:
+                conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+    
+    def set_entry(self, key: str, value: Dict[str, Any], expires_at: float, data: str) -> None:
+        size = len(data)
+        if size > self.max_bytes:
+            return
+        
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO cache (key, value, expires_at, accessed_at, size) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at, "
+                "accessed_at = excluded.accessed_at, size = excluded.size",
+                (key, data, expires_at, time.time(), size)
+            )
+            self._enforce_size(conn)
+    
+    def _enforce_size(self, conn: sqlite3.Connection) -> None:
+        """
+        Delete least recently used entries until the size cap is met
+        
+        Args:
+            conn: Connection inside the current transaction
+        """
+        total = self._total_size(conn)
+        if total <= self.max_bytes:
+            return
+        
+        # Drop expired entries first, then the least recently used ones
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        total = self._total_size(conn)
+        
+        rows = conn.execute("SELECT key, size FROM cache ORDER BY accessed_at")
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM cache WHERE key = ?", evicted)
+    
+    def _total_size(self, conn: sqlite3.Connection) -> int:
+        """
+        Get the total size of stored values
+        
+        Args:
+            conn: Database connection
+        
         Returns:
-            Optional[Dict[str, Any]]: Cached result or None if not found or expired
+            int: Total size in bytes
         """
-        # Get cache file path
-        cache_path = self.get_cache_path(cache_key)
+        return conn.execute("SELECT total FROM cache_size").fetchone()[0]
+    
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+    
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache")
+    
+    def sweep(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+class TieredCacheBackend(CacheBackend):
+    """
+    In-process memory tier in front of a shared SQLite tier
+    
+    Entries promoted to memory keep the expiry of the shared entry.
+    """
+    
+    def __init__(self, memory: MemoryCacheBackend, shared: SQLiteCacheBackend):
+        """
+        Initialize tiered backend
         
-        # Check if cache file exists
-        if not cache_path.exists():
-            return None
+        Args:
+            memory: Per-process tier
+            shared: Tier shared across workers
+        """
+        self.memory = memory
+        self.shared = shared
+    
+    def get_entry(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        entry = self.memory.get_entry(key)
+        if entry is not None:
+            return entry
         
-        # Check if cache is expired
-        if time.time() - cache_path.stat().st_mtime > self.cache_expiry:
-            # Remove expired cache
-            os.remove(cache_path)
+        entry = self.shared.get_serialized(key)
+        if entry is None:
             return None
         
-        # Load cache
+        data, expires_at = entry
         try:
-            with open(cache_path, 'r') as f:
-                return json.load(f)
-        except Exception:
+            value = json.loads(data)
+        except ValueError:
             # Remove invalid cache
-            if cache_path.exists():
-                os.remove(cache_path)
+            self.shared.delete(key)
             return None
+        
+        # Promote with the stored encoding, which gives the size
+        self.memory.set_entry(key, value, expires_at, data)
+        return value, expires_at
+    
+    def set_entry(self, key: str, value: Dict[str, Any], expires_at: float, data: str) -> None:
+        self.memory.set_entry(key, value, expires_at, data)
+        self.shared.set_entry(key, value, expires_at, data)
+    
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        self.shared.delete(key)
+    
+    def clear(self) -> None:
+        self.memory.clear()
+        self.shared.clear()
+    
+    def sweep(self) -> int:
+        return self.memory.sweep() + self.shared.sweep()
+
+def remove_legacy_files(cache_dir: Path = CACHE_DIR) -> int:
+    """
+    Delete entries left by the file-per-entry cache
+    
+    Their keys predate the versions results are now cached under, so they
+    can never be read again.
+    
+    Args:
+        cache_dir: Directory the files were written to
+    
+    Returns:
+        int: Number of files deleted
+    """
+    removed = 0
+    for path in cache_dir.glob("*.json"):
+        if LEGACY_CACHE_FILE.fullmatch(path.name):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+def create_backend(name: str = CACHE_BACKEND) -> CacheBackend:
+    """
+    Create a cache backend by name
+    
+    Args:
+        name: "tiered", "sqlite" or "memory"
+    
+    Returns:
+        CacheBackend: Cache backend
+    """
+    if name == "memory":
+        return MemoryCacheBackend()
+    if name == "sqlite":
+        return SQLiteCacheBackend()
+    if name == "tiered":
+        return TieredCacheBackend(MemoryCacheBackend(), SQLiteCacheBackend())
+    raise ValueError(f"Unknown cache backend: {name}")
+
+class CacheService:
+    """
+    Service for caching analysis results
+    """
+    
+    def __init__(self, cache_expiry: int = 3600, backend: Optional[CacheBackend] = None):
+        """
+        Initialize cache service
+        
+        Args:
+            cache_expiry: Cache expiry time in seconds (default: 1 hour)
+            backend: Storage backend (default: selected by CACHE_BACKEND)
+        """
+        self.cache_expiry = cache_expiry
+        self.backend = backend or create_backend()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweep = threading.Event()
     
-    def cache_result(self, cache_key: str, result: Dict[str, Any]) -> None:
+    def get_cache_key(self, data: str) -> str:
+        """
+        Generate cache key from data
+        
+        Args:
+            data: Data to generate key from
+        
+        Returns:
+            str: Cache key
+        """
+        # Generate MD5 hash of data
+        return hashlib.md5(data.encode()).hexdigest()
+    
+    def get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached result
+        
+        Args:
+            cache_key: Cache key
+        
+        Returns:
+            Optional[Dict[str, Any]]: Cached result or None if not found or expired
+        """
+        entry = self.backend.get_entry(cache_key)
+        return entry[0] if entry else None
+    
+    def cache_result(self, cache_key: str, result: Dict[str, Any], expiry: Optional[int] = None) -> None:
         """
         Cache result
         
         Args:
             cache_key: Cache key
             result: Result to cache
+            expiry: Expiry time in seconds (default: the service's cache expiry)
         """
-        # Get cache file path
-        cache_path = self.get_cache_path(cache_key)
-        
-        # Save cache
-        with open(cache_path, 'w') as f:
-            json.dump(result, f)
+        # Serialize once, both to size the entry and to store it
+        data = json.dumps(result)
+        expiry = self.cache_expiry if expiry is None else expiry
+        self.backend.set_entry(cache_key, result, time.time() + expiry, data)
     
     def clear_cache(self) -> None:
         """
         Clear all cache
         """
-        # Remove all cache files
-        for cache_file in CACHE_DIR.glob("*.json"):
-            os.remove(cache_file)
+        self.backend.clear()
+    
+    def start_expiry_sweep(self, interval: int = CACHE_SWEEP_INTERVAL) -> None:
+        """
+        Start deleting expired entries in a background thread
+        
+        Args:
+            interval: Seconds between sweeps
+        """
+        if self._sweeper is not None:
+            return
+        
+        self._stop_sweep.clear()
+        
+        def sweep_loop():
+            try:
+                remove_legacy_files()
+            except OSError:
+                # Left for the next start
+                pass
+            while not self._stop_sweep.wait(interval):
+                try:
+                    self.backend.sweep()
+                except Exception:
+                    # Try again on the next sweep
+                    pass
+        
+        self._sweeper = threading.Thread(target=sweep_loop, name="cache-sweep", daemon=True)
+        self._sweeper.start()
+    
+    def stop_expiry_sweep(self) -> None:
+        """
+        Stop the background expiry sweep
+        """
+        if self._sweeper is None:
+            return
+        
+        self._stop_sweep.set()
+        self._sweeper.join()
+        self._sweeper = None
@@ -0,0 +1,174 @@
+"""
+Worker pool for CPU-bound analysis work
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from app.services.profiling import profiled, profiling_active
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Number of worker processes (0 disables the pool and uses threads only)
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", str(os.cpu_count() or 1)))
+
+# Inputs smaller than this are not worth sending to another process (256KB)
+MIN_PARALLEL_BYTES = int(os.getenv("ANALYSIS_MIN_PARALLEL_BYTES", str(256 * 1024)))
+
+# Shards per worker, so uneven shards still keep every worker busy
+SHARDS_PER_WORKER = 4
+
+_executor: Optional[Executor] = None
+
+def get_executor() -> Optional[Executor]:
+    """
+    Get the shared process pool, creating it on first use
+
+    Returns:
+        Optional[Executor]: Process pool, or None if disabled
+    """
+    global _executor
+
+    if ANALYSIS_WORKERS <= 0:
+        return None
+
+    if _executor is None:
+        # Spawn rather than fork: the server process runs threads
+        _executor = ProcessPoolExecutor(
+            max_workers=ANALYSIS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    return _executor
+
+def shutdown_executor(executor: Optional[Executor] = None) -> None:
+    """
+    Shut down the shared process pool
+
+    Args:
+        executor: Only shut the pool down if it is still this one, so a pool
+            that already replaced it keeps running (default: any pool)
+    """
+    global _executor
+
+    if _executor is None or (executor is not None and _executor is not executor):
+        return
+
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+def shard(items: Sequence[T], weigh: Callable[[T], int], shard_count: int) -> List[List[T]]:
+    """
+    Split items into shards of roughly equal total weight
+
+    Args:
+        items: Items to split
+        weigh: Function returning the weight (e.g. size in bytes) of an item
+        shard_count: Target number of shards
+
+    Returns:
+        List[List[T]]: Non-empty shards, preserving item order
+    """
+    total = sum(weigh(item) for item in items)
+    target = max(total // max(shard_count, 1), 1)
+
+    shards = []
+    current = []
+    current_weight = 0
+    for item in items:
+        current.append(item)
+        current_weight += weigh(item)
+        if current_weight >= target:
+            shards.append(current)
+            current = []
+            current_weight = 0
+
+    if current:
+        shards.append(current)
+
+    return shards
+
+async def run_in_threads(
+    func: Callable[[List[T]], List[R]],
+    items: List[T],
+    weigh: Callable[[T], int],
+) -> List[R]:
+    """
+    Run a batch function over items in the threadpool, one shard at a time
+
+    Large inputs are split into shards, so a cancelled caller stops before
+    the next shard instead of after all of them.
+
+    Args:
+        func: Function mapping a list of items to a list of results
+        items: Items to process
+        weigh: Function returning the weight (e.g. size in bytes) of an item
+
+    Returns:
+        List[R]: Results in input order
+    """
+    total = sum(weigh(item) for item in items)
+    if total < MIN_PARALLEL_BYTES or len(items) == 1:
+        return await run_in_threadpool(profiled(func), items)
+
+    results = []
+    for chunk in shard(items, weigh, max(ANALYSIS_WORKERS, 1) * SHARDS_PER_WORKER):
+        results.extend(await run_in_threadpool(profiled(func), chunk))
+    return results
+
+async def run_sharded(
+    func: Callable[[List[T]], List[R]],
+    items: Sequence[T],
+    weigh: Callable[[T], int],
+) -> List[R]:
+    """
+    Run a batch function over items without blocking the event loop
+
+    Large inputs are sharded across the process pool; small inputs run in
+    a thread. Results are returned in input order.
+
+    If the calling task is cancelled, shards that have not started are
+    cancelled and never run. Shards already running finish in their
+    worker and their results are dropped.
+
+    Args:
+        func: Module-level function mapping a list of items to a list of results
+        items: Items to process
+        weigh: Function returning the weight (e.g. size in bytes) of an item
+
+    Returns:
+        List[R]: Results in input order
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    executor = get_executor()
+    total = sum(weigh(item) for item in items)
+
+    # Profiled requests stay in this process, where the profiler can see them
+    if executor is None or profiling_active() or total < MIN_PARALLEL_BYTES or len(items) == 1:
+        return await run_in_threads(func, items, weigh)
+
+    futures = []
+    try:
+        for chunk in shard(items, weigh, ANALYSIS_WORKERS * SHARDS_PER_WORKER):
+            futures.append(executor.submit(func, chunk))
+        results = await asyncio.gather(*[asyncio.wrap_future(future) for future in futures])
+    except BrokenProcessPool:
+        # A worker died; replace the pool next time and finish in a thread.
+        # Another request may have replaced it already, so only this pool goes
+        shutdown_executor(executor)
+        return await run_in_threads(func, items, weigh)
+    except asyncio.CancelledError:
+        for future in futures:
+            future.cancel()
+        raise
+
+    return [result for chunk in results for result in chunk]
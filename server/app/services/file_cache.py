@@ -0,0 +1,115 @@
+"""
+Content-addressed cache for per-file analysis results
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Maximum number of cached file results
+FILE_CACHE_SIZE = int(os.getenv("FILE_CACHE_SIZE", "50000"))
+
+class FileResultCache:
+    """
+    Bounded LRU cache of per-file results keyed by content hash
+
+    Keys combine the rule-set version, the part of the file name that
+    affects analysis and the file bytes, so identical files are analyzed
+    once regardless of which upload or repository they come from.
+    """
+
+    def __init__(self, max_entries: int = FILE_CACHE_SIZE):
+        """
+        Initialize file result cache
+
+        Args:
+            max_entries: Maximum number of cached results (0 disables caching)
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_cache_key(version: str, name: str, data: bytes) -> str:
+        """
+        Generate cache key from file content
+
+        Args:
+            version: Rule-set version
+            name: Name component that affects analysis (e.g. the extension)
+            data: Raw file content
+
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.sha256()
+        digest.update(version.encode())
+        digest.update(b"\0")
+        digest.update(name.encode())
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        """
+        Get cached result
+
+        Args:
+            cache_key: Cache key
+
+        Returns:
+            Optional[Any]: Cached result or None if not found
+        """
+        with self._lock:
+            result = self._entries.get(cache_key)
+            if result is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return result
+
+    def put(self, cache_key: str, result: Any) -> None:
+        """
+        Cache result, evicting the least recently used entries
+
+        Args:
+            cache_key: Cache key
+            result: Result to cache
+        """
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[cache_key] = result
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached results and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dict[str, Any]: Entry count, capacity, hits, misses and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,14 +1,20 @@
+import io
 import os
 import shutil
 import tempfile
 import zipfile
 from pathlib import Path
 from fastapi import UploadFile
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Iterator, Set, Tuple
+
+from app.core.languages import get_extension, language_from_extension, resolve_language
 
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'.py', '.js', '.jsx', '.ts', '.tsx', '.html', '.css', '.java', '.c', '.cpp', '.go', '.rb', '.php', '.zip'}
 
+# Largest archive member that will be decompressed (1MB)
+MAX_MEMBER_SIZE = int(os.getenv("ANALYSIS_MAX_FILE_BYTES", str(1024 * 1024)))
+
 def validate_file(file: UploadFile) -> bool:
     """
     Validate if the uploaded file has an allowed extension
@@ -50,94 +56,149 @@ async def save_upload(file: UploadFile) -> str:
         # Reset file pointer
         await file.seek(0)
         
-def extract_zip(zip_path: str, extract_dir: Optional[str] = None) -> List[str]:
+def iter_zip_infos(
+    archive: zipfile.ZipFile,
+    extensions: Optional[Set[str]] = ALLOWED_EXTENSIONS,
+    max_member_size: int = MAX_MEMBER_SIZE,
+) -> Iterator[zipfile.ZipInfo]:
+    """
+    Iterate over the analyzable entries of a zip archive's central directory
+    
+    Args:
+        archive: Open zip archive
+        extensions: Allowed file extensions, or None to allow all files
+        max_member_size: Largest uncompressed member size to include
+        
+    Yields:
+        zipfile.ZipInfo: Entry of a member worth reading
+    """
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        
+        # Skip unsupported and nested archives
+        ext = get_extension(info.filename)
+        if extensions is not None and (ext not in extensions or ext == '.zip'):
+            continue
+        
+        # Skip oversized members before decompressing them
+        if info.file_size > max_member_size:
+            continue
+        
+        yield info
+
+def read_zip_member(
+    archive: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    max_member_size: int = MAX_MEMBER_SIZE,
+) -> Optional[bytes]:
     """
-    Extract zip file and return paths to extracted files
+    Decompress a zip member without reading past the size limit
     
     Args:
-        zip_path: Path to the zip file
-        extract_dir: Directory to extract files to (optional)
+        archive: Open zip archive
+        info: Entry of the member to read
+        max_member_size: Largest uncompressed member size to read
         
     Returns:
-        List[str]: Paths to extracted files
+        Optional[bytes]: Member content, or None if it exceeds the limit
     """
-    # Create temporary directory if not provided
-    if extract_dir is None:
-        extract_dir = tempfile.mkdtemp()
+    # Never read past the limit, even if the header is wrong
+    with archive.open(info) as member:
+        content = member.read(max_member_size + 1)
     
-    # Extract zip file
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_dir)
+    return content if len(content) <= max_member_size else None
+
+def iter_zip_members(
+    data: bytes,
+    extensions: Optional[Set[str]] = ALLOWED_EXTENSIONS,
+    max_member_size: int = MAX_MEMBER_SIZE,
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Iterate over the members of an in-memory zip archive
     
-    # Get paths to extracted files
-    file_paths = []
-    for root, _, files in os.walk(extract_dir):
-        for file in files:
-            _, ext = os.path.splitext(file)
-            if ext.lower() in ALLOWED_EXTENSIONS:
-                file_paths.append(os.path.join(root, file))
+    Members are filtered by extension and declared size using the central
+    directory, so skipped members are never decompressed.
     
-    return file_paths
+    Args:
+        data: Zip archive bytes
+        extensions: Allowed file extensions, or None to allow all files
+        max_member_size: Largest uncompressed member size to read
+        
+    Yields:
+        Tuple[str, bytes]: Member path and its uncompressed content
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for info in iter_zip_infos(archive, extensions, max_member_size):
+            content = read_zip_member(archive, info, max_member_size)
+            if content is not None:
+                yield info.filename, content
 
-async def process_file_upload(file: UploadFile) -> Tuple[Dict[str, List[str]], Optional[str]]:
+def decode_content(content: bytes) -> str:
     """
-    Process uploaded file and extract code content
+    Decode file content as UTF-8, ignoring invalid bytes
+    
+    Args:
+        content: Raw file content
+        
+    Returns:
+        str: Decoded text
+    """
+    return content.decode('utf-8', errors='ignore')
+
+async def read_upload_files(file: UploadFile) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """
+    Read uploaded file and return code content with file paths
     
     Args:
         file: The uploaded file
         
     Returns:
-        Tuple[Dict[str, List[str]], Optional[str]]: Dictionary of languages and file contents, and error if any
+        Tuple[List[Tuple[str, str]], Optional[str]]: List of (path, content) pairs, and error if any
     """
     try:
         # Get file extension
-        _, ext = os.path.splitext(file.filename)
-        ext = ext.lower()
+        ext = get_extension(file.filename)
         
         if ext == '.zip':
-            # Handle ZIP file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
+            # Handle ZIP file in memory
             content = await file.read()
-            
-            with temp_file as f:
-                f.write(content)
-            
-            # Extract ZIP file
-            extract_dir = tempfile.mkdtemp()
-            file_paths = extract_zip(temp_file.name, extract_dir)
-            
-            # Read file contents
-            result = {}
-            for file_path in file_paths:
-                _, file_ext = os.path.splitext(file_path)
-                language = get_language_from_extension(file_ext)
-                
-                if language not in result:
-                    result[language] = []
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        result[language].append(f.read())
-                except Exception:
-                    # Skip files that can't be read
-                    pass
-            
-            # Clean up
-            os.unlink(temp_file.name)
+            result = [
+                (path, decode_content(member))
+                for path, member in iter_zip_members(content)
+            ]
             
             return result, None
         else:
             # Handle single file
             content = await file.read()
-            content_str = content.decode('utf-8', errors='ignore')
-            
-            # Determine language
-            language = get_language_from_extension(ext)
             
-            return {language: [content_str]}, None
+            return [(file.filename, decode_content(content))], None
     
     except Exception as e:
-        return {}, f"Error processing file: {str(e)}"
+        return [], f"Error processing file: {str(e)}"
+
+async def process_file_upload(file: UploadFile) -> Tuple[Dict[str, List[str]], Optional[str]]:
+    """
+    Process uploaded file and extract code content
+    
+    Args:
+        file: The uploaded file
+        
+    Returns:
+        Tuple[Dict[str, List[str]], Optional[str]]: Dictionary of languages and file contents, and error if any
+    """
+    files, error = await read_upload_files(file)
+    if error:
+        return {}, error
+    
+    # Group file contents by language
+    result = {}
+    for path, content in files:
+        language = resolve_language(path)
+        result.setdefault(language, []).append(content)
+    
+    return result, None
 
 def get_language_from_extension(ext: str) -> str:
     """
@@ -149,20 +210,4 @@ def get_language_from_extension(ext: str) -> str:
     Returns:
         str: Language name
     """
-    language_map = {
-        '.py': 'Python',
-        '.js': 'JavaScript',
-        '.jsx': 'JavaScript',
-        '.ts': 'TypeScript',
-        '.tsx': 'TypeScript',
-        '.html': 'HTML',
-        '.css': 'CSS',
-        '.java': 'Java',
-        '.c': 'C',
-        '.cpp': 'C++',
-        '.go': 'Go',
-        '.rb': 'Ruby',
-        '.php': 'PHP',
-    }
-    
-    return language_map.get(ext.lower(), 'Unknown')
+    return language_from_extension(ext) or 'Unknown'
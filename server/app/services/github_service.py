@@ -0,0 +1,346 @@
+"""
+GitHub service for downloading repository archives
+"""
+import asyncio
+import io
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from app.services.file_service import ALLOWED_EXTENSIONS, iter_zip_members
+from app.services.profiling import profiled
+from app.services.tracing import record_count, traced
+
+# Base URLs for archive downloads and the REST API (overridable to point at a local stand-in)
+GITHUB_URL = os.getenv("GITHUB_URL", "https://github.com").rstrip("/")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+# Optional token for higher API rate limits
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+
+# Largest archive we are willing to download (50MB)
+MAX_ARCHIVE_SIZE = int(os.getenv("GITHUB_MAX_ARCHIVE_SIZE", str(50 * 1024 * 1024)))
+
+# Maximum number of archives downloaded at the same time
+MAX_CONCURRENT_FETCHES = int(os.getenv("GITHUB_MAX_CONCURRENT_FETCHES", "4"))
+
+# Network timeouts in seconds
+FETCH_TIMEOUT = httpx.Timeout(float(os.getenv("GITHUB_FETCH_TIMEOUT", "60")), connect=10.0)
+
+# Connection pool limits
+FETCH_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+# Download chunk size (64KB)
+CHUNK_SIZE = 64 * 1024
+
+_GITHUB_URL_PATTERN = re.compile(r'https?://github\.com/([^/]+)/([^/]+)')
+
+# Most repositories analyzed for one user profile
+MAX_PROFILE_REPOS = int(os.getenv("GITHUB_MAX_PROFILE_REPOS", "30"))
+
+# Number of branches whose last ETag is remembered
+MAX_TRACKED_BRANCHES = 10000
+
+# Last seen ETag and commit SHA for each (owner, repo, branch)
+_head_etags: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+
+_client: Optional[httpx.AsyncClient] = None
+_fetch_slots: Optional[asyncio.Semaphore] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def parse_github_url(repo_url: str) -> Optional[Tuple[str, str]]:
+    """
+    Extract owner and repository name from a GitHub URL
+
+    Args:
+        repo_url: GitHub repository URL, e.g. https://github.com/owner/repo
+
+    Returns:
+        Optional[Tuple[str, str]]: Owner and repository name, or None if invalid
+    """
+    match = _GITHUB_URL_PATTERN.match(repo_url)
+    if not match:
+        return None
+
+    owner, repo = match.groups()
+    if repo.endswith(".git"):
+        repo = repo[:-4]
+
+    return owner, repo
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for the running event loop
+
+    Returns:
+        httpx.AsyncClient: Pooled HTTP client
+    """
+    global _client, _fetch_slots, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        # Pooled connections cannot be shared between event loops
+        _client = httpx.AsyncClient(timeout=FETCH_TIMEOUT, limits=FETCH_LIMITS, follow_redirects=True)
+        _fetch_slots = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        _client_loop = loop
+
+    return _client
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client"""
+    global _client, _fetch_slots, _client_loop
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _fetch_slots = None
+        _client_loop = None
+
+@traced("fetch")
+async def resolve_commit_sha(owner: str, repo: str, branch: str = "main") -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve the head commit SHA of a branch
+
+    The request is conditional on the last seen ETag, so an unchanged
+    branch costs a single 304 response.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        branch: Branch name
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: Commit SHA, and error if any
+    """
+    key = (owner, repo, branch)
+    headers = {"Accept": "application/vnd.github.sha"}
+    if GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+
+    known = _head_etags.get(key)
+    if known:
+        headers["If-None-Match"] = known[0]
+
+    client = get_http_client()
+
+    try:
+        response = await client.get(f"{GITHUB_API_URL}/repos/{owner}/{repo}/commits/{branch}", headers=headers)
+    except httpx.TimeoutException:
+        return None, "Error resolving branch: request timed out"
+    except Exception as e:
+        return None, f"Error resolving branch: {str(e)}"
+
+    if response.status_code == 304 and known:
+        return known[1], None
+
+    if response.status_code != 200:
+        return None, f"Failed to resolve branch: HTTP {response.status_code}"
+
+    sha = response.text.strip()
+    if not re.fullmatch(r"[0-9a-f]{40}", sha):
+        return None, "Failed to resolve branch: unexpected response"
+
+    etag = response.headers.get("etag")
+    if etag:
+        _head_etags.pop(key, None)
+        _head_etags[key] = (etag, sha)
+        if len(_head_etags) > MAX_TRACKED_BRANCHES:
+            # Forget the least recently changed branch
+            del _head_etags[next(iter(_head_etags))]
+
+    return sha, None
+
+@traced("fetch")
+async def list_user_repos(username: str, limit: int = MAX_PROFILE_REPOS) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    List the public repositories a user owns, most recently pushed first
+    
+    Pages of the list-repos API are followed until the limit is reached.
+    Forks and archived repositories are skipped.
+    
+    Args:
+        username: GitHub username
+        limit: Maximum number of repositories to return
+        
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[str]]: Repositories as returned by
+            the API, and error if any
+    """
+    headers = {"Accept": "application/vnd.github+json"}
+    if GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+    
+    client = get_http_client()
+    url = f"{GITHUB_API_URL}/users/{username}/repos"
+    params = {"type": "owner", "sort": "pushed", "direction": "desc", "per_page": 100}
+    repos: List[Dict[str, Any]] = []
+    
+    while url and len(repos) < limit:
+        try:
+            response = await client.get(url, headers=headers, params=params)
+        except httpx.TimeoutException:
+            return [], "Error listing repositories: request timed out"
+        except Exception as e:
+            return [], f"Error listing repositories: {str(e)}"
+        
+        if response.status_code == 404:
+            return [], f"GitHub user {username} not found"
+        if response.status_code != 200:
+            return [], f"Failed to list repositories: HTTP {response.status_code}"
+        
+        repos.extend(repo for repo in response.json() if not repo.get("fork") and not repo.get("archived"))
+        
+        # The next page URL already carries the query
+        url = response.links.get("next", {}).get("url")
+        params = None
+    
+    repos.sort(key=lambda repo: repo.get("pushed_at") or "", reverse=True)
+    return repos[:limit], None
+
+@traced("fetch")
+async def fetch_repo_archive(
+    owner: str,
+    repo: str,
+    branch: str = "main",
+    commit_sha: Optional[str] = None,
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Download a repository zip archive into memory
+
+    The archive is streamed and the download is aborted as soon as it
+    exceeds MAX_ARCHIVE_SIZE.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        branch: Branch to download
+        commit_sha: Commit to download instead of the branch head, if known
+
+    Returns:
+        Tuple[Optional[bytes], Optional[str]]: Archive content, and error if any
+    """
+    if commit_sha:
+        archive_url = f"{GITHUB_URL}/{owner}/{repo}/archive/{commit_sha}.zip"
+    else:
+        archive_url = f"{GITHUB_URL}/{owner}/{repo}/archive/refs/heads/{branch}.zip"
+    client = get_http_client()
+
+    try:
+        async with _fetch_slots:
+            async with client.stream("GET", archive_url) as response:
+                if response.status_code != 200:
+                    return None, f"Failed to download repository: HTTP {response.status_code}"
+
+                # Reject oversized archives before reading them when possible
+                content_length = response.headers.get("content-length")
+                if content_length and int(content_length) > MAX_ARCHIVE_SIZE:
+                    return None, archive_too_large()
+
+                buffer = io.BytesIO()
+                async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                    buffer.write(chunk)
+                    if buffer.tell() > MAX_ARCHIVE_SIZE:
+                        return None, archive_too_large()
+
+                record_count("bytes_fetched", buffer.tell())
+                return buffer.getvalue(), None
+
+    except httpx.TimeoutException:
+        return None, "Error downloading repository: request timed out"
+    except Exception as e:
+        return None, f"Error downloading repository: {str(e)}"
+
+def archive_too_large() -> str:
+    """
+    Get the error message for an oversized archive
+
+    Returns:
+        str: Error message
+    """
+    return f"Repository archive exceeds the {MAX_ARCHIVE_SIZE // (1024 * 1024)}MB limit"
+
+def strip_archive_root(path: str) -> str:
+    """
+    Strip the top-level directory GitHub wraps archive members in
+
+    Args:
+        path: Archive member path
+
+    Returns:
+        str: Path relative to the repository root
+    """
+    return path.split("/", 1)[1] if "/" in path else path
+
+@traced("unzip")
+def read_archive_files(archive: bytes, extensions: Optional[Set[str]]) -> List[Tuple[str, bytes]]:
+    """
+    Read the analyzable files of a repository archive
+
+    Args:
+        archive: Zip archive content
+        extensions: File extensions to include, or None for all files
+
+    Returns:
+        List[Tuple[str, bytes]]: (path relative to the repository root, content) pairs
+    """
+    return [
+        (strip_archive_root(path), data)
+        for path, data in iter_zip_members(archive, extensions=extensions)
+    ]
+
+async def fetch_github_archive(
+    repo_url: str,
+    branch: str = "main",
+    commit_sha: Optional[str] = None,
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    Download the zip archive of a GitHub repository
+
+    Args:
+        repo_url: GitHub repository URL
+        branch: Branch to download
+        commit_sha: Commit to download instead of the branch head, if known
+
+    Returns:
+        Tuple[Optional[bytes], Optional[str]]: Archive content, and error if any
+    """
+    parsed = parse_github_url(repo_url)
+    if not parsed:
+        return None, "Invalid GitHub repository URL"
+
+    owner, repo = parsed
+    return await fetch_repo_archive(owner, repo, branch, commit_sha)
+
+async def fetch_github_files(
+    repo_url: str,
+    branch: str = "main",
+    extensions: Optional[Set[str]] = ALLOWED_EXTENSIONS,
+    commit_sha: Optional[str] = None,
+) -> Tuple[List[Tuple[str, bytes]], Optional[str]]:
+    """
+    Download a GitHub repository and read its analyzable files
+
+    Nothing is written to disk; only members with matching extensions are
+    decompressed.
+
+    Args:
+        repo_url: GitHub repository URL
+        branch: Branch to download
+        extensions: File extensions to include, or None for all files
+        commit_sha: Commit to download instead of the branch head, if known
+
+    Returns:
+        Tuple[List[Tuple[str, bytes]], Optional[str]]: (path, content) pairs, and error if any
+    """
+    archive, error = await fetch_github_archive(repo_url, branch, commit_sha)
+    if error:
+        return [], error
+
+    try:
+        # Decompress off the event loop
+        return await run_in_threadpool(profiled(read_archive_files), archive, extensions), None
+    except Exception as e:
+        return [], f"Error reading repository archive: {str(e)}"
@@ -0,0 +1,283 @@
+"""
+Background job queue for long-running analyses
+"""
+import asyncio
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.services.pipeline import AnalysisProgress, FileAnalysis
+
+# Analyses running at the same time; further jobs wait in the queue
+MAX_RUNNING_JOBS = int(os.getenv("ANALYSIS_MAX_RUNNING_JOBS", "4"))
+
+# Jobs queued or running at the same time before new submissions are refused
+MAX_PENDING_JOBS = int(os.getenv("ANALYSIS_MAX_PENDING_JOBS", "100"))
+
+# Seconds finished jobs are kept for polling
+JOB_RETENTION = int(os.getenv("ANALYSIS_JOB_RETENTION", "3600"))
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATUSES = {COMPLETED, FAILED, CANCELLED}
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is full"""
+
+@dataclass
+class Job:
+    """State of a submitted analysis"""
+    id: str
+    kind: str
+    target: str
+    status: str = QUEUED
+    phase: str = QUEUED
+    files_total: int = 0
+    files_done: int = 0
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    version: int = 0
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job will not change anymore"""
+        return self.status in FINISHED_STATUSES
+
+    def touch(self) -> None:
+        """Record a state change and wake up waiting watchers"""
+        self.version += 1
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the public state of the job
+
+        Returns:
+            Dict[str, Any]: Job status fields
+        """
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "target": self.target,
+            "status": self.status,
+            "phase": self.phase,
+            "files_total": self.files_total,
+            "files_done": self.files_done,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+class JobProgress(AnalysisProgress):
+    """Records analysis progress on a job"""
+
+    def __init__(self, job: Job):
+        self.job = job
+
+    def phase(self, name: str, total: Optional[int] = None) -> None:
+        self.job.phase = name
+        if total is not None:
+            self.job.files_total = total
+            self.job.files_done = 0
+        self.job.touch()
+
+    def files_done(self, analyses: List[FileAnalysis]) -> None:
+        self.job.files_done += len(analyses)
+        self.job.touch()
+
+# An analysis run by a job: receives the job's progress, returns the response
+JobRunner = Callable[[AnalysisProgress], Awaitable[Any]]
+
+class LocalJobQueue:
+    """
+    In-process job queue
+
+    Jobs run as tasks on the server's event loop. A semaphore bounds how
+    many analyses run at the same time; the others wait in submission
+    order. Jobs are lost when the process restarts.
+    """
+
+    def __init__(
+        self,
+        max_running: int = MAX_RUNNING_JOBS,
+        max_pending: int = MAX_PENDING_JOBS,
+        retention: int = JOB_RETENTION,
+    ):
+        """
+        Initialize job queue
+
+        Args:
+            max_running: Maximum number of jobs running at the same time
+            max_pending: Maximum number of unfinished jobs
+            retention: Seconds finished jobs are kept
+        """
+        self.max_running = max_running
+        self.max_pending = max_pending
+        self.retention = retention
+        self.jobs: Dict[str, Job] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def submit(self, kind: str, target: str, runner: JobRunner) -> Job:
+        """
+        Submit an analysis
+
+        Args:
+            kind: Kind of analysis (e.g. "file", "github")
+            target: File name or repository URL being analyzed
+            runner: Coroutine function running the analysis
+
+        Returns:
+            Job: The queued job
+
+        Raises:
+            QueueFullError: If too many jobs are unfinished
+        """
+        self.prune()
+
+        pending = sum(1 for job in self.jobs.values() if not job.finished)
+        if pending >= self.max_pending:
+            raise QueueFullError("Too many analyses in progress, try again later")
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_running)
+
+        job = Job(id=uuid.uuid4().hex, kind=kind, target=target)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, runner))
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job by id
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Optional[Job]: The job, or None if unknown or expired
+        """
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancel a queued or running job
+
+        The job is marked cancelled before this returns. A queued job never
+        starts. A running job stops at its next step: files not yet read
+        are never read, and shards of the current batch that have not
+        started are cancelled. Shards already running in a worker process
+        or thread finish in the background, and their results are dropped.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Optional[Job]: The job, or None if unknown or expired
+        """
+        job = self.jobs.get(job_id)
+        if job and not job.finished:
+            if job.task:
+                job.task.cancel()
+            self._finish(job, CANCELLED)
+        return job
+
+    async def wait_for_change(self, job: Job, version: int, timeout: float) -> None:
+        """
+        Wait until a job changes after the given version
+
+        Args:
+            job: Job to watch
+            version: Last version seen by the caller
+            timeout: Maximum seconds to wait
+        """
+        if job.version != version or job.finished:
+            return
+
+        try:
+            await asyncio.wait_for(job.changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def prune(self) -> None:
+        """Forget finished jobs older than the retention period"""
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def shutdown(self) -> None:
+        """Cancel all unfinished jobs"""
+        for job in self.jobs.values():
+            if not job.finished and job.task:
+                job.task.cancel()
+
+    async def _run(self, job: Job, runner: JobRunner) -> None:
+        """
+        Run a job once a slot is free, recording its outcome
+
+        Args:
+            job: Job to run
+            runner: Coroutine function running the analysis
+        """
+        try:
+            async with self._slots:
+                job.status = RUNNING
+                job.phase = "starting"
+                job.started_at = time.time()
+                job.touch()
+
+                response = await runner(JobProgress(job))
+
+            result = response.dict() if hasattr(response, "dict") else response
+            error = result.get("error") if isinstance(result, dict) else None
+        except asyncio.CancelledError:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            self._finish(job, FAILED, error=f"Analysis failed: {str(e)}")
+        else:
+            self._finish(job, FAILED if error else COMPLETED, error=error, result=result)
+
+    def _finish(
+        self,
+        job: Job,
+        status: str,
+        error: Optional[str] = None,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Record the outcome of a job, unless it already has one
+
+        A job cancelled while its analysis was finishing stays cancelled.
+
+        Args:
+            job: Finished job
+            status: Final status
+            error: Error message, if any
+            result: Analysis response, if any
+        """
+        if job.finished:
+            return
+
+        job.status = status
+        job.phase = status
+        job.error = error
+        job.result = result
+        job.finished_at = time.time()
+        job.touch()
@@ -0,0 +1,195 @@
+"""
+Per-repository manifests for incremental re-analysis
+"""
+import io
+import zipfile
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from app.services.cache_service import CacheService
+from app.services.file_service import ALLOWED_EXTENSIONS, iter_zip_infos, read_zip_member
+from app.services.github_service import strip_archive_root
+from app.services.pipeline import RULES_VERSION, AnalysisBudget, AnalysisProgress, FileAnalysis, analyze_sources_async
+from app.services.tracing import traced
+
+# Manifests outlive analysis results: they are only useful for repeat runs (30 days)
+MANIFEST_EXPIRY = 30 * 24 * 3600
+
+@dataclass
+class ArchiveEntry:
+    """A file in a repository archive, with its previous result if unchanged"""
+    path: str
+    crc: int
+    size: int
+    analysis: Optional[FileAnalysis] = None
+    info: Optional[zipfile.ZipInfo] = None
+
+@traced("unzip")
+def read_archive_changes(
+    archive: bytes,
+    previous: Dict[str, Dict[str, Any]],
+    extensions: Optional[Set[str]] = ALLOWED_EXTENSIONS,
+) -> List[ArchiveEntry]:
+    """
+    Compare a repository archive against a previous manifest
+
+    The CRC-32 and size stored in the zip central directory identify
+    unchanged files. Only the central directory is read; added and modified
+    members are decompressed later, as they are analyzed.
+
+    Args:
+        archive: Zip archive content
+        previous: Manifest files from the previous run
+        extensions: File extensions to include, or None for all files
+
+    Returns:
+        List[ArchiveEntry]: Entries in archive order, carrying either the
+            previous analysis or the zip entry to analyze
+    """
+    entries = []
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        for info in iter_zip_infos(zip_file, extensions):
+            path = strip_archive_root(info.filename)
+            entry = ArchiveEntry(path=path, crc=info.CRC, size=info.file_size)
+
+            known = previous.get(path)
+            if known and known["crc"] == info.CRC and known["size"] == info.file_size:
+                entry.analysis = FileAnalysis(**known["analysis"])
+            else:
+                entry.info = info
+
+            entries.append(entry)
+
+    return entries
+
+def iter_entry_contents(archive: bytes, entries: List[ArchiveEntry], read: List[ArchiveEntry]) -> Iterator[Tuple[str, bytes]]:
+    """
+    Decompress the members of archive entries one at a time
+
+    Args:
+        archive: Zip archive content
+        entries: Entries to read
+        read: Receives each entry as its content is yielded
+
+    Yields:
+        Tuple[str, bytes]: Path relative to the repository root and content
+    """
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        for entry in entries:
+            data = read_zip_member(zip_file, entry.info)
+            if data is None:
+                continue
+            read.append(entry)
+            yield entry.path, data
+
+class RepoManifestService:
+    """
+    Stores, per repository and branch, the files of the last analyzed
+    archive with their checksums and per-file results
+    """
+
+    def __init__(self, cache_service: Optional[CacheService] = None):
+        """
+        Initialize manifest service
+
+        Args:
+            cache_service: Cache used to store manifests
+        """
+        self.cache_service = cache_service or CacheService(cache_expiry=MANIFEST_EXPIRY)
+
+    def get_manifest_key(self, owner: str, repo: str, branch: str) -> str:
+        """
+        Generate manifest key for a repository branch
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Branch name
+
+        Returns:
+            str: Cache key
+        """
+        return self.cache_service.get_cache_key(f"manifest:{owner}/{repo}:{branch}")
+
+    def load(self, owner: str, repo: str, branch: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the manifest files of a repository branch
+
+        Manifests written with other analysis rules are ignored.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Branch name
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Checksums and analysis per path, empty if none
+        """
+        manifest = self.cache_service.get_cached_result(self.get_manifest_key(owner, repo, branch))
+        if not manifest or manifest.get("rules_version") != RULES_VERSION:
+            return {}
+        return manifest["files"]
+
+    def save(self, owner: str, repo: str, branch: str, entries: List[ArchiveEntry]) -> None:
+        """
+        Store the manifest of a repository branch
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Branch name
+            entries: Archive entries; entries left unanalyzed are not stored
+        """
+        manifest = {
+            "rules_version": RULES_VERSION,
+            "files": {
+                entry.path: {"crc": entry.crc, "size": entry.size, "analysis": asdict(entry.analysis)}
+                for entry in entries
+                if entry.analysis is not None
+            },
+        }
+        self.cache_service.cache_result(self.get_manifest_key(owner, repo, branch), manifest)
+
+async def analyze_archive_entries(
+    archive: bytes,
+    entries: List[ArchiveEntry],
+    progress: Optional[AnalysisProgress] = None,
+    budget: Optional[AnalysisBudget] = None,
+) -> List[FileAnalysis]:
+    """
+    Analyze the changed entries of an archive, reusing the rest
+
+    Changed members are decompressed window by window as they are analyzed.
+    Reused results cost nothing, so they count towards the skills found but
+    not towards the budget.
+
+    Args:
+        archive: Zip archive content
+        entries: Entries from read_archive_changes
+        progress: Optional receiver of progress events
+        budget: Limits on what to read, recording why analysis stopped early
+
+    Returns:
+        List[FileAnalysis]: Analysis records in archive order, for the
+            entries reused or analyzed before any early stop
+    """
+    budget = budget or AnalysisBudget()
+    changed = [entry for entry in entries if entry.analysis is None]
+    reused = [entry.analysis for entry in entries if entry.analysis is not None]
+    budget.observe(reused, count=False)
+
+    if progress is not None:
+        # Unchanged files count as done straight away
+        progress.phase("analyzing", total=len(reused) + min(len(changed), budget.max_files))
+        if reused:
+            progress.files_done(reused)
+
+    read: List[ArchiveEntry] = []
+    results = await analyze_sources_async(iter_entry_contents(archive, changed, read), progress, budget)
+
+    for entry, analysis in zip(read, results):
+        entry.analysis = analysis
+        # The zip entry is no longer needed once analyzed
+        entry.info = None
+
+    return [entry.analysis for entry in entries if entry.analysis is not None]
@@ -1,34 +1,27 @@
 import os
 import re
 import zipfile
-import tempfile
 from typing import Dict, List, Set, Tuple, Optional
 from pathlib import Path
 from fastapi import UploadFile
 
-from app.services.file_service import extract_zip, ALLOWED_EXTENSIONS
-from app.utils.helpers import get_file_paths, clone_github_repo
+from app.core.languages import get_extension, resolve_language
+from app.core.js_source import JSX_EXTENSIONS, extract_js_packages
+from app.core.python_source import parse_python_source
+from app.services.file_service import decode_content, iter_zip_members
+from app.services.github_service import fetch_github_files
 
 class CodeParser:
     """Parser for code files and repositories"""
     
     def __init__(self):
-        # Patterns for detecting libraries
+        # Patterns for detecting libraries in Python code that does not parse
         self.patterns = {
             "Python": [
                 r'import\s+(\w+)',
                 r'from\s+(\w+)(?:\.\w+)?\s+import',
                 r'import\s+(\w+)\s+as\s+\w+',
             ],
-            "JavaScript": [
-                r'import\s+.*\s+from\s+[\'"]([^\.][^\'"/]+)[\'"]',
-                r'import\s+[\'"]([^\.][^\'"/]+)[\'"]',
-                r'require\([\'"]([^\.][^\'"/]+)[\'"]\)',
-            ],
-            "TypeScript": [
-                r'import\s+.*\s+from\s+[\'"]([^\.][^\'"/]+)[\'"]',
-                r'import\s+[\'"]([^\.][^\'"/]+)[\'"]',
-            ]
         }
         
         # Standard libraries to exclude
@@ -54,21 +47,15 @@ class CodeParser:
         
         try:
             if ext == '.zip':
-                # Handle ZIP file
-                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-                with temp_file as f:
-                    content = await file.read()
-                    f.write(content)
-                
-                # Extract ZIP file
-                extract_dir = tempfile.mkdtemp()
-                file_paths = extract_zip(temp_file.name, extract_dir)
-                
-                # Parse extracted files
-                results = self._parse_files(file_paths)
+                # Handle ZIP file in memory
+                content = await file.read()
+                files = [
+                    (path, decode_content(member))
+                    for path, member in iter_zip_members(content)
+                ]
                 
-                # Clean up
-                os.unlink(temp_file.name)
+                # Parse archive members
+                results = self._parse_sources(files)
                 
                 return results, None
             else:
@@ -77,17 +64,17 @@ class CodeParser:
                 content_str = content.decode('utf-8', errors='ignore')
                 
                 # Determine language
-                language = self._get_language_from_ext(ext)
+                language = resolve_language(file.filename)
                 
                 # Parse libraries
-                libraries = self._parse_content(content_str, language)
+                libraries = self._parse_content(content_str, language, get_extension(file.filename))
                 
                 return {language: libraries}, None
         
         except Exception as e:
             return {}, f"Error parsing file: {str(e)}"
     
-    def parse_github_repo(self, repo_url: str, branch: str = "main") -> Tuple[Dict[str, List[str]], Optional[str]]:
+    async def parse_github_repo(self, repo_url: str, branch: str = "main") -> Tuple[Dict[str, List[str]], Optional[str]]:
         """
         Parse GitHub repository
         
@@ -98,55 +85,40 @@ class CodeParser:
         Returns:
             Tuple[Dict[str, List[str]], Optional[str]]: Dictionary of languages and libraries, and error if any
         """
-        # Clone repository
-        repo_dir, error = clone_github_repo(repo_url, branch)
+        # Download repository files
+        files, error = await fetch_github_files(repo_url, branch)
         if error:
             return {}, error
         
-        # Get file paths
-        file_paths = get_file_paths(repo_dir, ALLOWED_EXTENSIONS)
-        
         # Parse files
-        results = self._parse_files(file_paths)
+        results = self._parse_sources([(path, decode_content(data)) for path, data in files])
         
         return results, None
     
-    def _parse_files(self, file_paths: List[str]) -> Dict[str, List[str]]:
+    def _parse_sources(self, files: List[Tuple[str, str]]) -> Dict[str, List[str]]:
         """
-        Parse multiple files
+        Parse multiple file contents
         
         Args:
-            file_paths: List of file paths
+            files: List of (path, content) pairs
             
         Returns:
             Dict[str, List[str]]: Dictionary of languages and libraries
         """
         results = {}
         
-        for file_path in file_paths:
-            # Get file extension
-            _, ext = os.path.splitext(file_path)
-            ext = ext.lower()
-            
+        for file_path, content in files:
             # Determine language
-            language = self._get_language_from_ext(ext)
+            language = resolve_language(file_path)
             
-            # Read file content
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                
-                # Parse libraries
-                libraries = self._parse_content(content, language)
-                
-                # Add to results
-                if language in results:
-                    results[language].extend(libraries)
-                else:
-                    results[language] = libraries
-            except:
-                # Skip files that can't be read
-                continue
+            # Parse libraries
+            libraries = self._parse_content(content, language, get_extension(file_path))
+            
+            # Add to results
+            if language in results:
+                results[language].extend(libraries)
+            else:
+                results[language] = libraries
         
         # Remove duplicates
         for language in results:
@@ -154,39 +126,56 @@ class CodeParser:
         
         return results
     
-    def _get_language_from_ext(self, ext: str) -> str:
+    def extract_libraries(self, content: str, language: str, ext: str = "") -> List[str]:
         """
-        Get language from file extension
+        Extract libraries imported by file content
         
         Args:
-            ext: File extension
+            content: File content
+            language: Programming language
+            ext: File extension, which tells whether JavaScript may hold JSX
             
         Returns:
-            str: Language name
+            List[str]: Sorted list of libraries
         """
-        language_map = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.jsx': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.tsx': 'TypeScript',
-            '.html': 'HTML',
-            '.css': 'CSS',
-        }
+        return sorted(self._parse_content(content, language, ext))
+    
+    def filter_libraries(self, imports: List[str], language: str) -> List[str]:
+        """
+        Drop standard libraries from imported packages
         
-        return language_map.get(ext, 'Unknown')
+        Args:
+            imports: Imported top-level packages
+            language: Programming language
+            
+        Returns:
+            List[str]: Sorted list of libraries
+        """
+        standard_libs = self.standard_libs.get(language, set())
+        return sorted({lib for lib in imports if lib not in standard_libs})
     
-    def _parse_content(self, content: str, language: str) -> List[str]:
+    def _parse_content(self, content: str, language: str, ext: str = "") -> List[str]:
         """
         Parse content for libraries
         
         Args:
             content: File content
             language: Programming language
+            ext: File extension
             
         Returns:
             List[str]: List of libraries
         """
+        if language == "Python":
+            # Parse real import statements; fall back to patterns if the code does not parse
+            source = parse_python_source(content)
+            if source is not None:
+                return self.filter_libraries(source.imports, language)
+        
+        if language in ['JavaScript', 'TypeScript']:
+            # Tokenize instead of matching patterns, which backtrack on minified code
+            return self.filter_libraries(extract_js_packages(content, ext in JSX_EXTENSIONS), language)
+        
         libraries = set()
         
         # Get patterns for language
@@ -199,9 +188,4 @@ class CodeParser:
                 if lib not in self.standard_libs.get(language, set()):
                     libraries.add(lib)
         
-        # Special case for React
-        if language in ['JavaScript', 'TypeScript']:
-            if 'import React' in content or 'from \'react\'' in content or 'from "react"' in content:
-                libraries.add('react')
-        
         return list(libraries)
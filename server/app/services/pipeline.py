@@ -0,0 +1,640 @@
+"""
+Per-file analysis pipeline shared by all analysis endpoints
+"""
+import hashlib
+import io
+import json
+import os
+import zipfile
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.languages import EXTENSION_LANGUAGES, LANGUAGE_PATTERNS, get_extension, language_from_extension
+from app.core.line_counter import COMMENT_SYNTAX, LINE_COUNT_EXTENSIONS, LINE_COUNT_FILENAMES
+from app.core.python_source import parse_python_source
+from app.core.skills import PATTERN_MATCH_CAP, PATTERN_MATCH_WEIGHT, PATTERN_MAX_CONFIDENCE, SkillExtractor
+from app.services.executor import run_sharded
+from app.services.file_cache import FileResultCache
+from app.services.file_service import ALLOWED_EXTENSIONS, MAX_MEMBER_SIZE, decode_content, iter_zip_infos, read_zip_member
+from app.services.parser import CodeParser
+from app.services.profiling import profiled
+from app.services.tracing import PhaseTimings, record_count, record_phases, traced
+from app.utils.code_analysis import analyze_source_content, calculate_file_complexity, count_source_lines
+
+# Bump when per-file analysis logic changes so cached results are not reused
+ANALYSIS_VERSION = 6
+
+# Shared analyzers
+skill_extractor = SkillExtractor()
+code_parser = CodeParser()
+
+def get_rules_version() -> str:
+    """
+    Get a version string identifying the rules used for per-file analysis
+    
+    Returns:
+        str: Hash of the analysis version and every rule table
+    """
+    rules = {
+        "version": ANALYSIS_VERSION,
+        "extensions": EXTENSION_LANGUAGES,
+        "languages": LANGUAGE_PATTERNS,
+        "skills": skill_extractor.patterns,
+        "weights": [PATTERN_MATCH_WEIGHT, PATTERN_MAX_CONFIDENCE, PATTERN_MATCH_CAP],
+        "libraries": code_parser.patterns,
+        "standard_libs": {language: sorted(libs) for language, libs in code_parser.standard_libs.items()},
+        "comments": {language: asdict(syntax) for language, syntax in COMMENT_SYNTAX.items()},
+        "line_count_languages": [LINE_COUNT_EXTENSIONS, LINE_COUNT_FILENAMES],
+    }
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:16]
+
+RULES_VERSION = get_rules_version()
+
+# Per-file results shared by every upload and repository
+file_cache = FileResultCache()
+
+# Files analyzed between progress reports
+PROGRESS_BATCH_SIZE = int(os.getenv("ANALYSIS_PROGRESS_BATCH_SIZE", "100"))
+
+# Files, and bytes of their content, held in memory at once by one analysis (16MB)
+WINDOW_FILES = int(os.getenv("ANALYSIS_WINDOW_FILES", "256"))
+WINDOW_BYTES = int(os.getenv("ANALYSIS_WINDOW_BYTES", str(16 * 1024 * 1024)))
+
+# Files, and bytes of their content, one analysis reads at most (256MB)
+MAX_FILES = int(os.getenv("ANALYSIS_MAX_FILES", "20000"))
+MAX_TOTAL_BYTES = int(os.getenv("ANALYSIS_MAX_TOTAL_BYTES", str(256 * 1024 * 1024)))
+
+# Consecutive files that find no new skill and raise no score before an
+# analysis stops early, as reading further would not change its skills.
+# Off by default (0), since line counts and complexity then cover only the files read
+SATURATION_FILES = int(os.getenv("ANALYSIS_SATURATION_FILES", "0"))
+
+# Why an analysis stopped before reading every file
+STOPPED_MAX_FILES = "max_files"
+STOPPED_MAX_BYTES = "max_bytes"
+STOPPED_SATURATED = "saturated"
+
+@dataclass
+class FileAnalysis:
+    """Everything the endpoints need to know about one source file"""
+    path: str
+    language: str
+    size: int
+    libraries: List[str] = field(default_factory=list)
+    skills: Dict[str, float] = field(default_factory=dict)
+    lines_of_code: int = 0
+    loc_language: str = "Unknown"
+    complexity: float = 0.0
+    complexity_blocks: int = 0
+
+@dataclass
+class AnalysisBudget:
+    """
+    Limits on what one analysis reads, and how much of them it used
+    
+    A budget belongs to a single analysis. Once it is exhausted, or the
+    skills found stop changing, stopped says why and no more files are read.
+    """
+    max_files: int = MAX_FILES
+    max_bytes: int = MAX_TOTAL_BYTES
+    max_file_bytes: int = MAX_MEMBER_SIZE
+    window_files: int = WINDOW_FILES
+    window_bytes: int = WINDOW_BYTES
+    saturation_files: int = SATURATION_FILES
+    files: int = 0
+    bytes: int = 0
+    stopped: Optional[str] = None
+    # Best score of each skill so far, and files since one last changed
+    scores: Dict[str, float] = field(default_factory=dict)
+    unchanged_files: int = 0
+    
+    def admit(self, size: int) -> bool:
+        """
+        Spend the budget on one more file
+        
+        Args:
+            size: File size in bytes
+            
+        Returns:
+            bool: True if the file may be analyzed, False once the budget is exhausted
+        """
+        if self.stopped:
+            return False
+        if self.files >= self.max_files:
+            self.stopped = STOPPED_MAX_FILES
+            return False
+        if self.bytes + size > self.max_bytes:
+            self.stopped = STOPPED_MAX_BYTES
+            return False
+        
+        self.files += 1
+        self.bytes += size
+        return True
+    
+    def observe(self, analyses: Iterable[FileAnalysis], count: bool = True) -> None:
+        """
+        Track the skills found, stopping once they saturate
+        
+        Args:
+            analyses: Analysis records, in the order files were read
+            count: Count the files towards saturation; False for results
+                reused from earlier runs, which cost nothing to include
+        """
+        for analysis in analyses:
+            changed = False
+            for skill, score in analysis.skills.items():
+                if score > self.scores.get(skill, 0.0):
+                    self.scores[skill] = score
+                    changed = True
+            
+            if changed:
+                self.unchanged_files = 0
+            elif count:
+                self.unchanged_files += 1
+        
+        if self.saturation_files and self.unchanged_files >= self.saturation_files and not self.stopped:
+            self.stopped = STOPPED_SATURATED
+
+class AnalysisProgress:
+    """
+    Receives progress events from a running analysis
+    
+    The default implementation ignores them; job tracking and streaming
+    endpoints override the methods they need.
+    """
+    
+    def phase(self, name: str, total: Optional[int] = None) -> None:
+        """
+        Called when the analysis enters a new phase
+        
+        Args:
+            name: Phase name (e.g. "downloading", "analyzing")
+            total: Number of files the phase will process, if known
+        """
+    
+    def files_done(self, analyses: List[FileAnalysis]) -> None:
+        """
+        Called after each batch of files is analyzed
+        
+        Args:
+            analyses: Analysis records of the batch, in input order
+        """
+
+def analyze_source(path: str, data: bytes, timings: Optional[PhaseTimings] = None) -> FileAnalysis:
+    """
+    Analyze a single file in one visit
+    
+    Args:
+        path: File path, used to resolve the language
+        data: Raw file content
+        timings: Optional receiver of the time spent in each phase
+        
+    Returns:
+        FileAnalysis: Analysis record for the file
+    """
+    timings = timings or PhaseTimings()
+    
+    with timings.phase("language"):
+        ext = get_extension(path)
+        language = language_from_extension(ext)
+    
+    if not language:
+        # Unsupported file: only count lines, in memory where its comment grammar is known
+        with timings.phase("lines"):
+            lines, loc_language = analyze_source_content(path, data)
+        return FileAnalysis(
+            path=path,
+            language="Unknown",
+            size=len(data),
+            lines_of_code=lines,
+            loc_language=loc_language,
+        )
+    
+    # Decode once and reuse the text for every analysis
+    with timings.phase("decode"):
+        content = decode_content(data)
+    
+    # Python yields its imports and complexity from a single parse
+    python_source = None
+    if language == "Python":
+        with timings.phase("parse"):
+            python_source = parse_python_source(content)
+    
+    with timings.phase("extraction"):
+        if python_source is not None:
+            libraries = code_parser.filter_libraries(python_source.imports, language)
+        else:
+            libraries = code_parser.extract_libraries(content, language, ext)
+        skills = skill_extractor.extract_skills(content, ext)
+    
+    with timings.phase("complexity"):
+        if python_source is not None:
+            complexity, blocks = python_source.complexity, python_source.complexity_blocks
+        else:
+            complexity, blocks = calculate_file_complexity(content, language)
+    
+    with timings.phase("lines"):
+        lines = count_source_lines(content, language)
+    
+    return FileAnalysis(
+        path=path,
+        language=language,
+        size=len(data),
+        libraries=libraries,
+        skills=skills,
+        lines_of_code=lines,
+        loc_language=language,
+        complexity=complexity,
+        complexity_blocks=blocks,
+    )
+
+def analyze_sources_timed(files: Iterable[Tuple[str, bytes]]) -> List[Tuple[FileAnalysis, Dict[str, float]]]:
+    """
+    Analyze multiple files, timing the phases of each
+    
+    Worker processes cannot see the request being traced, so the timings
+    travel back with the results.
+    
+    Args:
+        files: Iterable of (path, content) pairs
+        
+    Returns:
+        List[Tuple[FileAnalysis, Dict[str, float]]]: Analysis records with
+            seconds spent per phase, in input order
+    """
+    results = []
+    for path, data in files:
+        timings = PhaseTimings()
+        results.append((analyze_source(path, data, timings), timings.durations))
+    return results
+
+def get_file_cache_key(path: str, data: bytes) -> str:
+    """
+    Get the content-addressed cache key of a file
+    
+    Only the part of the path that affects analysis is included: the
+    extension for supported files, the file name otherwise.
+    
+    Args:
+        path: File path
+        data: Raw file content
+        
+    Returns:
+        str: Cache key
+    """
+    ext = get_extension(path)
+    name = ext if language_from_extension(ext) else os.path.basename(path)
+    return file_cache.get_cache_key(RULES_VERSION, name, data)
+
+async def analyze_sources_async(
+    files: Iterable[Tuple[str, bytes]],
+    progress: Optional[AnalysisProgress] = None,
+    budget: Optional[AnalysisBudget] = None,
+) -> List[FileAnalysis]:
+    """
+    Analyze multiple files off the event loop, sharded across worker processes
+    
+    Files are pulled from the iterable one window at a time, so a lazy
+    iterable, like the members of an archive, is never held in memory
+    whole. Each window is analyzed before the next one is read, and
+    analysis stops early once the budget is exhausted or the skills found
+    saturate.
+    
+    Files whose content was analyzed before are served from the file cache;
+    only the remaining files are analyzed. With a progress receiver, windows
+    hold at most PROGRESS_BATCH_SIZE files and are reported one by one.
+    
+    Args:
+        files: Iterable of (path, content) pairs
+        progress: Optional receiver of per-batch progress
+        budget: Limits on what to read (default: the configured limits)
+        
+    Returns:
+        List[FileAnalysis]: Analysis records in input order, for the files read
+    """
+    budget = budget or AnalysisBudget()
+    window_files = budget.window_files
+    if progress is not None:
+        window_files = min(window_files, PROGRESS_BATCH_SIZE)
+    
+    members = iter(files)
+    analyses = []
+    try:
+        while not budget.stopped:
+            window = await run_in_threadpool(profiled(read_window), members, budget, window_files)
+            if not window:
+                break
+            record_count("files_read", len(window))
+            
+            batch = await analyze_batch(window)
+            # The window is released before the next one is read
+            del window
+            
+            if progress is not None:
+                progress.files_done(batch)
+            analyses.extend(batch)
+            budget.observe(batch)
+    finally:
+        # Close archives read lazily, even when stopping early
+        close = getattr(members, "close", None)
+        if close is not None:
+            close()
+    
+    return analyses
+
+@traced("unzip")
+def read_window(
+    members: Iterator[Tuple[str, bytes]],
+    budget: AnalysisBudget,
+    window_files: int,
+) -> List[Tuple[str, bytes]]:
+    """
+    Read the next window of files, as far as the budget allows
+    
+    Args:
+        members: Iterator of (path, content) pairs, read lazily
+        budget: Budget each file is admitted against
+        window_files: Most files in the window
+        
+    Returns:
+        List[Tuple[str, bytes]]: Next files to analyze, empty once done
+    """
+    window = []
+    window_bytes = 0
+    for path, data in members:
+        if not budget.admit(len(data)):
+            break
+        window.append((path, data))
+        window_bytes += len(data)
+        if len(window) >= window_files or window_bytes >= budget.window_bytes:
+            break
+    return window
+
+async def analyze_batch(files: List[Tuple[str, bytes]]) -> List[FileAnalysis]:
+    """
+    Analyze a batch of files, serving known content from the file cache
+    
+    Args:
+        files: (path, content) pairs
+        
+    Returns:
+        List[FileAnalysis]: Analysis records in input order
+    """
+    keys = [get_file_cache_key(path, data) for path, data in files]
+    
+    # Look up each distinct file once, collecting the ones to analyze
+    known: Dict[str, FileAnalysis] = {}
+    misses = {}
+    for index, cache_key in enumerate(keys):
+        if cache_key in known or cache_key in misses:
+            continue
+        cached = file_cache.get(cache_key)
+        if cached is not None:
+            known[cache_key] = cached
+        else:
+            misses[cache_key] = files[index]
+    
+    record_count("file_cache_hits", len(known))
+    record_count("file_cache_misses", len(misses))
+    
+    results = await run_sharded(
+        analyze_sources_timed,
+        list(misses.values()),
+        weigh=lambda item: len(item[1])
+    )
+    
+    durations: Dict[str, float] = {}
+    for cache_key, (analysis, timings) in zip(misses, results):
+        file_cache.put(cache_key, analysis)
+        known[cache_key] = analysis
+        for phase, seconds in timings.items():
+            durations[phase] = durations.get(phase, 0.0) + seconds
+    
+    record_phases(durations)
+    record_count("files_analyzed", len(results))
+    
+    # Cached records are shared, so give each file its own path
+    return [
+        replace(known[cache_key], path=path)
+        for (path, _), cache_key in zip(files, keys)
+    ]
+
+@traced("unzip")
+def list_zip_members(
+    content: bytes,
+    extensions: Optional[Set[str]],
+    max_member_size: int = MAX_MEMBER_SIZE,
+) -> Tuple[zipfile.ZipFile, List[zipfile.ZipInfo]]:
+    """
+    Open a zip archive and list its analyzable members without decompressing them
+    
+    Args:
+        content: Zip archive bytes
+        extensions: Member extensions to include, or None for all files
+        max_member_size: Largest uncompressed member size to include
+        
+    Returns:
+        Tuple[zipfile.ZipFile, List[zipfile.ZipInfo]]: Open archive, and entries to read
+    """
+    archive = zipfile.ZipFile(io.BytesIO(content))
+    return archive, list(iter_zip_infos(archive, extensions, max_member_size))
+
+def iter_zip_contents(
+    archive: zipfile.ZipFile,
+    infos: List[zipfile.ZipInfo],
+    max_member_size: int = MAX_MEMBER_SIZE,
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Decompress zip members one at a time, closing the archive when done
+    
+    Args:
+        archive: Open zip archive
+        infos: Entries to read
+        max_member_size: Largest uncompressed member size to read
+        
+    Yields:
+        Tuple[str, bytes]: Member path and its uncompressed content
+    """
+    with archive:
+        for info in infos:
+            content = read_zip_member(archive, info, max_member_size)
+            if content is not None:
+                yield info.filename, content
+
+async def analyze_upload_content(
+    filename: str,
+    content: bytes,
+    extensions: Optional[Set[str]] = ALLOWED_EXTENSIONS,
+    progress: Optional[AnalysisProgress] = None,
+    budget: Optional[AnalysisBudget] = None,
+) -> Tuple[List[FileAnalysis], Optional[str]]:
+    """
+    Analyze the content of an uploaded file or zip archive
+    
+    Archive members are decompressed window by window as they are analyzed.
+    
+    Args:
+        filename: Name of the uploaded file
+        content: Uploaded bytes
+        extensions: Archive member extensions to analyze, or None for all files
+        progress: Optional receiver of progress events
+        budget: Limits on what to read, recording why analysis stopped early
+        
+    Returns:
+        Tuple[List[FileAnalysis], Optional[str]]: Analysis records, and error if any
+    """
+    budget = budget or AnalysisBudget()
+    reporter = progress or AnalysisProgress()
+    record_count("bytes_received", len(content))
+    
+    try:
+        if get_extension(filename) == '.zip':
+            reporter.phase("reading")
+            archive, infos = await run_in_threadpool(
+                profiled(list_zip_members), content, extensions, budget.max_file_bytes
+            )
+            members = iter_zip_contents(archive, infos, budget.max_file_bytes)
+            total = len(infos)
+        else:
+            members = iter([(filename, content)])
+            total = 1
+        
+        reporter.phase("analyzing", total=min(total, budget.max_files))
+        return await analyze_sources_async(members, progress, budget), None
+    
+    except Exception as e:
+        return [], f"Error processing file: {str(e)}"
+
+async def analyze_upload(
+    file: UploadFile,
+    extensions: Optional[Set[str]] = ALLOWED_EXTENSIONS,
+    progress: Optional[AnalysisProgress] = None,
+    budget: Optional[AnalysisBudget] = None,
+) -> Tuple[List[FileAnalysis], Optional[str]]:
+    """
+    Analyze an uploaded file or zip archive
+    
+    Args:
+        file: The uploaded file
+        extensions: Archive member extensions to analyze, or None for all files
+        progress: Optional receiver of progress events
+        budget: Limits on what to read, recording why analysis stopped early
+        
+    Returns:
+        Tuple[List[FileAnalysis], Optional[str]]: Analysis records, and error if any
+    """
+    try:
+        content = await file.read()
+        return await analyze_upload_content(file.filename, content, extensions, progress, budget)
+    
+    except Exception as e:
+        return [], f"Error processing file: {str(e)}"
+    finally:
+        # Reset file pointer
+        await file.seek(0)
+
+class SkillMerger:
+    """
+    Merges per-file skills incrementally, keeping the highest score for each skill
+    
+    Merging batches one after another gives the same result as merging all
+    files at once, so partial results can be reported while analysis runs.
+    """
+    
+    def __init__(self):
+        self.skills: Dict[str, float] = {}
+        self.primary_language = "Unknown"
+        self.libraries: Set[str] = set()
+        self.lines_of_code = 0
+        self.complexity = 0.0
+        self.complexity_blocks = 0
+    
+    def add(self, analyses: Iterable[FileAnalysis]) -> None:
+        """
+        Merge more analysis records
+        
+        Args:
+            analyses: Analysis records
+        """
+        all_skills = self.skills
+        
+        for analysis in analyses:
+            # Set primary language to the first one found
+            if self.primary_language == "Unknown":
+                self.primary_language = analysis.language
+            
+            self.lines_of_code += analysis.lines_of_code
+            self.complexity += analysis.complexity
+            self.complexity_blocks += analysis.complexity_blocks
+            
+            for skill, score in analysis.skills.items():
+                if skill in all_skills:
+                    all_skills[skill] = max(all_skills[skill], score)
+                else:
+                    all_skills[skill] = score
+                
+                # Add to libraries if not a language itself
+                if skill.lower() != analysis.language.lower():
+                    self.libraries.add(skill)
+    
+    def result(self) -> Tuple[Dict[str, float], str, Set[str]]:
+        """
+        Get the merged skills
+        
+        Returns:
+            Tuple[Dict[str, float], str, Set[str]]: Skill scores, primary language, and libraries
+        """
+        return dict(self.skills), self.primary_language, set(self.libraries)
+    
+    def average_complexity(self) -> float:
+        """
+        Get the average cyclomatic complexity of the merged files
+        
+        Returns:
+            float: Average cyclomatic complexity score
+        """
+        return round(self.complexity / max(self.complexity_blocks, 1), 1)
+
+def average_complexity(analyses: Iterable[FileAnalysis]) -> float:
+    """
+    Calculate average cyclomatic complexity across files
+    
+    Args:
+        analyses: Analysis records
+        
+    Returns:
+        float: Average cyclomatic complexity score
+    """
+    total_complexity = 0.0
+    total_blocks = 0
+    
+    for analysis in analyses:
+        total_complexity += analysis.complexity
+        total_blocks += analysis.complexity_blocks
+    
+    return round(total_complexity / max(total_blocks, 1), 1)
+
+def summarize_lines(analyses: Iterable[FileAnalysis]) -> Tuple[int, Dict[str, int], int]:
+    """
+    Summarize lines of code across files
+    
+    Args:
+        analyses: Analysis records
+        
+    Returns:
+        Tuple[int, Dict[str, int], int]: Total lines, lines per language, and number of files with code
+    """
+    total_lines = 0
+    language_counts = {}
+    file_count = 0
+    
+    for analysis in analyses:
+        if analysis.lines_of_code > 0:
+            total_lines += analysis.lines_of_code
+            file_count += 1
+            language_counts[analysis.loc_language] = language_counts.get(analysis.loc_language, 0) + analysis.lines_of_code
+    
+    return total_lines, language_counts, file_count
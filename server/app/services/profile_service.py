@@ -0,0 +1,189 @@
+"""
+Developer profiles aggregated over several repository analyses
+"""
+import math
+import os
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+
+from app.core.score import SkillScorer
+from app.models.analysis_models import DeveloperRankResponse
+from app.models.skill_models import AnalysisResponse, DeveloperProfile, SkillScore
+from app.services.tracing import traced
+from app.utils.code_analysis import calculate_skill_level_distribution, calculate_tech_diversity, determine_developer_rank
+from app.utils.helpers import get_timestamp
+
+# Days after which a repository counts half as much in a weighted profile
+RECENCY_HALF_LIFE_DAYS = float(os.getenv("PROFILE_RECENCY_HALF_LIFE_DAYS", "365"))
+
+skill_scorer = SkillScorer()
+
+@traced("scoring")
+def build_developer_profile(responses: List[AnalysisResponse]) -> DeveloperProfile:
+    """
+    Aggregate the analyses of a developer's repositories
+
+    Failed analyses are left out.
+
+    Args:
+        responses: Analysis results, one per repository
+
+    Returns:
+        DeveloperProfile: Aggregated profile
+    """
+    analyzed = [response for response in responses if not response.error]
+
+    # Keep the highest score of each skill
+    best: Dict[str, SkillScore] = {}
+    for response in analyzed:
+        for skill in response.skills:
+            known = best.get(skill.name)
+            if known is None or skill.score > known.score:
+                best[skill.name] = skill
+
+    skills = sorted(best.values(), key=lambda x: x.score, reverse=True)
+
+    # Score categories over everything each language was used with
+    language_libraries: Dict[str, Set[str]] = {}
+    for response in analyzed:
+        language_libraries.setdefault(response.language, set()).update(response.libraries)
+
+    categories = skill_scorer.score_skills({
+        language: sorted(libraries) for language, libraries in language_libraries.items()
+    })
+
+    return DeveloperProfile(
+        repositories=len(analyzed),
+        languages=dict(Counter(response.language for response in analyzed).most_common()),
+        libraries=sorted(set().union(*(response.libraries for response in analyzed))),
+        skills=skills,
+        categories=categories,
+        level_distribution=calculate_skill_level_distribution([skill.dict() for skill in skills]),
+        recommendations=[skill.name for skill in skills[:3]],
+    )
+
+def repo_weight(lines_of_code: Optional[int], pushed_at: Optional[str], now: Optional[datetime] = None) -> float:
+    """
+    Weigh a repository by its size and how recently it was pushed to
+
+    Size counts logarithmically, so one huge repository does not drown out
+    the rest; recency halves every RECENCY_HALF_LIFE_DAYS.
+
+    Args:
+        lines_of_code: Lines of code, None if unknown
+        pushed_at: ISO 8601 time of the last push, None if unknown
+        now: Current time (default: now)
+
+    Returns:
+        float: Repository weight, 0 for repositories without code
+    """
+    size = math.log1p(lines_of_code) if lines_of_code is not None else 1.0
+
+    recency = 1.0
+    if pushed_at:
+        try:
+            pushed = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
+        except ValueError:
+            pushed = None
+        if pushed is not None:
+            if pushed.tzinfo is None:
+                pushed = pushed.replace(tzinfo=timezone.utc)
+            age_days = max(((now or datetime.now(timezone.utc)) - pushed).total_seconds() / 86400, 0.0)
+            recency = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+    return size * recency
+
+def merge_weighted(filename: str, responses: List[AnalysisResponse], weights: List[float]) -> AnalysisResponse:
+    """
+    Merge repository analyses into one, weighting each repository
+
+    A skill scores the weighted average of its score over all
+    repositories, counting 0 where it was not detected.
+
+    Args:
+        filename: Name of the merged analysis, e.g. the username
+        responses: Analysis results, one per repository
+        weights: Weight of each repository
+
+    Returns:
+        AnalysisResponse: Merged analysis results
+    """
+    analyzed = [
+        (response, weight) for response, weight in zip(responses, weights)
+        if not response.error and weight > 0
+    ]
+    total_weight = sum(weight for _, weight in analyzed)
+
+    if not analyzed:
+        return AnalysisResponse(
+            filename=filename,
+            language="Unknown",
+            libraries=[],
+            skills=[],
+            recommendations=[],
+            error="No repository with code could be analyzed",
+            timestamp=get_timestamp()
+        )
+
+    weighted_scores: Dict[str, float] = {}
+    skill_info: Dict[str, SkillScore] = {}
+    language_weights: Dict[str, float] = {}
+    libraries: Set[str] = set()
+    lines_of_code = 0
+    complexity_total = 0.0
+    complexity_lines = 0
+
+    for response, weight in analyzed:
+        for skill in response.skills:
+            weighted_scores[skill.name] = weighted_scores.get(skill.name, 0.0) + weight * skill.score
+            skill_info.setdefault(skill.name, skill)
+
+        if response.language != "Unknown":
+            language_weights[response.language] = language_weights.get(response.language, 0.0) + weight
+        libraries.update(response.libraries)
+
+        lines_of_code += response.lines_of_code or 0
+        if response.complexity is not None and response.lines_of_code:
+            complexity_total += response.complexity * response.lines_of_code
+            complexity_lines += response.lines_of_code
+
+    skills = [
+        skill_info[name].copy(update={"score": min(1.0, round(score / total_weight, 2))})
+        for name, score in weighted_scores.items()
+    ]
+    # Skills of repositories that barely count are dropped
+    skills = [skill for skill in skills if skill.score > 0]
+    skills.sort(key=lambda x: x.score, reverse=True)
+
+    return AnalysisResponse(
+        filename=filename,
+        language=max(language_weights, key=language_weights.get) if language_weights else "Unknown",
+        libraries=sorted(libraries),
+        skills=skills,
+        recommendations=[skill.name for skill in skills[:3]],
+        lines_of_code=lines_of_code,
+        complexity=round(complexity_total / complexity_lines, 1) if complexity_lines else None,
+        timestamp=get_timestamp()
+    )
+
+def rank_developer(responses: List[AnalysisResponse], merged: AnalysisResponse) -> DeveloperRankResponse:
+    """
+    Rank a developer from their merged repository analyses
+
+    Args:
+        responses: Analysis results, one per repository
+        merged: Result of merge_weighted
+
+    Returns:
+        DeveloperRankResponse: Developer ranking results
+    """
+    complexity_score = merged.complexity or 0.0
+    languages = {response.language for response in responses if not response.error}
+    diversity_score = calculate_tech_diversity(languages, merged.libraries)
+
+    return DeveloperRankResponse(
+        complexity_score=complexity_score,
+        diversity_score=diversity_score,
+        rank=determine_developer_rank(complexity_score, diversity_score)
+    )
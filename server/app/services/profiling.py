@@ -0,0 +1,459 @@
+"""
+On-demand profiling of individual requests
+"""
+import cProfile
+import functools
+import hmac
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Token admins send in X-Profile-Token; profiling is disabled without one
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+
+# Seconds between stack samples in sampling mode
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# Finished profiles kept for download; the oldest are dropped first
+PROFILE_STORE_SIZE = int(os.getenv("PROFILE_STORE_SIZE", "20"))
+
+# Functions listed in text reports of cProfile profiles
+PROFILE_TEXT_LIMIT = 60
+
+# Module the event loop waits for I/O in
+SELECTOR_MODULE = os.sep + "selectors.py"
+
+# Profiling modes
+CPROFILE = "cprofile"
+SAMPLING = "sampling"
+
+# Download formats: media type and file extension
+FORMATS = {
+    "collapsed": ("text/plain; charset=utf-8", "txt"),
+    "pstats": ("application/octet-stream", "pstats"),
+    "text": ("text/plain; charset=utf-8", "txt"),
+}
+
+def check_token(token: Optional[str]) -> bool:
+    """
+    Check an admin profiling token
+
+    Args:
+        token: Token sent with the request
+
+    Returns:
+        bool: True if profiling is enabled and the token matches
+    """
+    if not PROFILING_TOKEN or not token:
+        return False
+    return hmac.compare_digest(token.encode(), PROFILING_TOKEN.encode())
+
+class RequestProfile(ABC):
+    """
+    Profile of one request, across every thread working on it
+
+    Threads join with attach() and leave with detach(); the event loop
+    thread is attached for the whole request, so work other requests do on
+    it at the same time shows up as well.
+    """
+
+    # Formats the profile can be downloaded in, the first being the default
+    formats: Tuple[str, ...] = ()
+
+    def __init__(self, mode: str, target: str):
+        """
+        Initialize a profile
+
+        Args:
+            mode: Profiling mode
+            target: Path of the profiled request
+        """
+        self.id = uuid.uuid4().hex
+        self.mode = mode
+        self.target = target
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.running = True
+        # Attachments per thread ident, as calls may nest
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def attach(self) -> None:
+        """Start profiling the current thread"""
+        if not self.running:
+            return
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._threads.get(ident, 0)
+            self._threads[ident] = depth + 1
+        if depth == 0:
+            self._start_thread()
+
+    def detach(self) -> None:
+        """Stop profiling the current thread once every attach is undone"""
+        ident = threading.get_ident()
+        with self._lock:
+            depth = self._threads.get(ident, 0) - 1
+            if depth < 0:
+                return
+            if depth:
+                self._threads[ident] = depth
+            else:
+                del self._threads[ident]
+        if depth == 0:
+            self._stop_thread()
+
+    def finish(self) -> None:
+        """Stop collecting; threads attached later are not profiled"""
+        self.running = False
+        self.finished_at = time.time()
+
+    def _start_thread(self) -> None:
+        """Start collecting on the current thread"""
+
+    def _stop_thread(self) -> None:
+        """Stop collecting on the current thread"""
+
+    @abstractmethod
+    def render(self, output_format: str) -> bytes:
+        """
+        Render the profile
+
+        Args:
+            output_format: One of self.formats
+
+        Returns:
+            bytes: Profile in the format
+        """
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the public description of the profile
+
+        Returns:
+            Dict[str, Any]: Profile summary fields
+        """
+        return {
+            "profile_id": self.id,
+            "mode": self.mode,
+            "target": self.target,
+            "formats": list(self.formats),
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+class CProfileRequestProfile(RequestProfile):
+    """Deterministic profile of every function call, with cProfile"""
+
+    formats = ("pstats", "text")
+
+    def __init__(self, target: str):
+        """
+        Initialize a profile
+
+        Args:
+            target: Path of the profiled request
+        """
+        super().__init__(CPROFILE, target)
+        # cProfile profiles the thread it is enabled on, so each thread gets its own
+        self._profilers: Dict[int, cProfile.Profile] = {}
+
+    def _start_thread(self) -> None:
+        """Enable a profiler on the current thread"""
+        ident = threading.get_ident()
+        with self._lock:
+            profiler = self._profilers.get(ident)
+            if profiler is None:
+                profiler = self._profilers[ident] = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+ allows one active profiler per process, which
+            # then sees every thread; the one already enabled covers this one
+            pass
+
+    def _stop_thread(self) -> None:
+        """Disable the profiler of the current thread"""
+        profiler = self._profilers.get(threading.get_ident())
+        if profiler is not None:
+            profiler.disable()
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """
+        Merge the statistics of every thread
+
+        Returns:
+            Optional[pstats.Stats]: Merged statistics, or None if nothing was profiled
+        """
+        with self._lock:
+            profilers = list(self._profilers.values())
+
+        stats = None
+        for profiler in profilers:
+            profiler.create_stats()
+            if not profiler.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profiler, stream=io.StringIO())
+            else:
+                stats.add(profiler)
+        return stats
+
+    def render(self, output_format: str) -> bytes:
+        """
+        Render the profile as a pstats dump or a text report
+
+        Args:
+            output_format: "pstats" or "text"
+
+        Returns:
+            bytes: Profile in the format
+        """
+        stats = self.stats()
+        if output_format == "pstats":
+            # What pstats.Stats.dump_stats writes, loadable with pstats.Stats(path)
+            return marshal.dumps(stats.stats if stats else {})
+
+        if stats is None:
+            return b"No function calls were profiled\n"
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TEXT_LIMIT)
+        return stream.getvalue().encode()
+
+class SamplingRequestProfile(RequestProfile):
+    """
+    Statistical profile from sampling the stacks of attached threads
+
+    A background thread records the stack of every attached thread each
+    PROFILE_SAMPLE_INTERVAL seconds, so overhead stays low and does not
+    grow with the number of function calls.
+    """
+
+    formats = ("collapsed",)
+
+    def __init__(self, target: str, interval: float = PROFILE_SAMPLE_INTERVAL):
+        """
+        Initialize a profile and start sampling
+
+        Args:
+            target: Path of the profiled request
+            interval: Seconds between samples
+        """
+        super().__init__(SAMPLING, target)
+        self.interval = interval
+        self.samples: Dict[str, int] = {}
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profile-{self.id[:8]}", daemon=True)
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        """Record the stacks of attached threads until the profile finishes"""
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                idents = list(self._threads)
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is None or frame.f_code.co_filename.endswith(SELECTOR_MODULE):
+                    # The event loop waiting for I/O is idle, not slow
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    def finish(self) -> None:
+        """Stop sampling"""
+        super().finish()
+        self._stopped.set()
+        self._sampler.join()
+
+    def render(self, output_format: str) -> bytes:
+        """
+        Render the profile as collapsed stacks
+
+        Each line is a stack from the outermost frame in, separated by
+        semicolons, then its sample count; flame graph tools read this
+        format directly.
+
+        Args:
+            output_format: "collapsed"
+
+        Returns:
+            bytes: Profile in the format
+        """
+        lines = [f"{stack} {count}" for stack, count in sorted(self.samples.items())]
+        return ("\n".join(lines) + "\n" if lines else "").encode()
+
+@functools.lru_cache(maxsize=4096)
+def frame_label(code: Any) -> str:
+    """
+    Name a code object in a collapsed stack
+
+    Args:
+        code: Code object of a frame
+
+    Returns:
+        str: "path/to/module.py:Qualified.name", with the path relative to
+            the import path it was loaded from
+    """
+    filename = code.co_filename
+    for entry in sorted((entry for entry in sys.path if entry), key=len, reverse=True):
+        if filename.startswith(entry + os.sep):
+            filename = filename[len(entry) + 1:]
+            break
+    name = getattr(code, "co_qualname", code.co_name)
+    # Semicolons separate frames and spaces the count
+    return f"{filename}:{name}".replace(";", ",").replace(" ", "_")
+
+# Profile modes by name
+PROFILE_MODES = {
+    CPROFILE: CProfileRequestProfile,
+    SAMPLING: SamplingRequestProfile,
+}
+
+class ProfileStore:
+    """Finished profiles kept in memory for download"""
+
+    def __init__(self, max_profiles: int = PROFILE_STORE_SIZE):
+        """
+        Initialize an empty store
+
+        Args:
+            max_profiles: Profiles kept before the oldest are dropped
+        """
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, profile: RequestProfile) -> None:
+        """
+        Store a profile
+
+        Args:
+            profile: Finished profile
+        """
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        """
+        Get a stored profile
+
+        Args:
+            profile_id: Profile id
+
+        Returns:
+            Optional[RequestProfile]: Profile, or None if unknown or dropped
+        """
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[RequestProfile]:
+        """
+        List stored profiles, newest first
+
+        Returns:
+            List[RequestProfile]: Profiles
+        """
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+# Profiles of this process
+profile_store = ProfileStore()
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+# Held while a request is profiled; profiles of concurrent requests would mix
+_profiling = threading.Lock()
+
+def start_profile(mode: str, target: str) -> Optional[Tuple[RequestProfile, Token]]:
+    """
+    Start profiling the current request on the current thread
+
+    Args:
+        mode: Profiling mode, a key of PROFILE_MODES
+        target: Path of the request
+
+    Returns:
+        Optional[Tuple[RequestProfile, Token]]: The profile and the token to
+            end it with, or None if another request is being profiled
+    """
+    if not _profiling.acquire(blocking=False):
+        return None
+    try:
+        profile = PROFILE_MODES[mode](target)
+    except BaseException:
+        _profiling.release()
+        raise
+    profile.attach()
+    return profile, _current_profile.set(profile)
+
+def end_profile(profile: RequestProfile, token: Token) -> None:
+    """
+    Stop profiling the current request and store its profile
+
+    Args:
+        profile: Profile from start_profile
+        token: Token from start_profile
+    """
+    try:
+        profile.detach()
+        profile.finish()
+        profile_store.put(profile)
+    finally:
+        _current_profile.reset(token)
+        _profiling.release()
+
+def profiling_active() -> bool:
+    """
+    Check whether the current request is being profiled
+
+    Returns:
+        bool: True while a profile is collecting
+    """
+    profile = _current_profile.get()
+    return profile is not None and profile.running
+
+def profiled(func: F) -> F:
+    """
+    Profile a function wherever it runs, if the current request is profiled
+
+    Wrap functions handed to worker threads, so the threads join the
+    profile of the request while they work on it.
+
+    Args:
+        func: Function to run in another thread
+
+    Returns:
+        F: The function, wrapped if a profile is collecting
+    """
+    profile = _current_profile.get()
+    if profile is None or not profile.running:
+        return func
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        profile.attach()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.detach()
+
+    return run
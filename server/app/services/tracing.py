@@ -0,0 +1,405 @@
+"""
+Per-request phase timings and process-wide metrics
+"""
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, TypeVar
+
+from fastapi.responses import JSONResponse
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Prefix of every exported metric name
+METRICS_PREFIX = "skilllens"
+
+# Upper bounds, in seconds, of the request duration histogram buckets
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Counters recorded during analysis, with their metric descriptions
+COUNTERS = {
+    "bytes_received": "Bytes of uploaded files",
+    "bytes_fetched": "Bytes of repository archives downloaded from GitHub",
+    "files_read": "Files read from uploads and archives",
+    "files_analyzed": "Files analyzed rather than served from a cache",
+    "file_cache_hits": "Per-file results served from the file cache",
+    "file_cache_misses": "Per-file results missing from the file cache",
+    "result_cache_hits": "Repository results served from the result cache",
+    "result_cache_misses": "Repository results missing from the result cache",
+}
+
+# Caches whose hit rate is reported, by counter prefix
+CACHES = ("file_cache", "result_cache")
+
+class PhaseTimings:
+    """
+    Time spent in named phases, summed over every time a phase runs
+
+    Phases that overlap, like concurrent downloads, each count in full, so
+    the sum can exceed the wall-clock time.
+    """
+
+    def __init__(self):
+        """Initialize with no phases"""
+        self.durations: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a block as part of a phase
+
+        Args:
+            name: Phase name
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Add time to a phase
+
+        Args:
+            name: Phase name
+            seconds: Time spent
+        """
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+class RequestTrace(PhaseTimings):
+    """
+    Phase timings and counters of one request
+
+    Threads serving the request add to it concurrently, so updates are locked.
+    Once the request is finished, later updates go to the process metrics.
+    """
+
+    def __init__(self):
+        """Initialize an empty trace"""
+        super().__init__()
+        self.counters: Dict[str, int] = {}
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Add time to a phase
+
+        Args:
+            name: Phase name
+            seconds: Time spent
+        """
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter
+
+        Args:
+            name: Counter name
+            value: Increment
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> Tuple[Dict[str, float], Dict[str, int]]:
+        """
+        Copy the trace consistently
+
+        Returns:
+            Tuple[Dict[str, float], Dict[str, int]]: Seconds by phase and counter values
+        """
+        with self._lock:
+            return dict(self.durations), dict(self.counters)
+
+    def server_timing(self, total: float) -> str:
+        """
+        Format the trace as a Server-Timing header value
+
+        Args:
+            total: Request duration in seconds
+
+        Returns:
+            str: Phase durations in milliseconds, then counters and cache hit rates
+        """
+        durations, counters = self.snapshot()
+
+        entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in durations.items()]
+        entries.append(f"total;dur={total * 1000:.1f}")
+        entries.extend(f'{name};desc="{value}"' for name, value in counters.items())
+        for cache in CACHES:
+            rate = hit_rate(counters.get(f"{cache}_hits", 0), counters.get(f"{cache}_misses", 0))
+            if rate is not None:
+                entries.append(f'{cache}_hit_rate;desc="{rate:.2f}"')
+        return ", ".join(entries)
+
+def hit_rate(hits: int, misses: int) -> Optional[float]:
+    """
+    Get the share of lookups that hit
+
+    Args:
+        hits: Lookups that hit
+        misses: Lookups that missed
+
+    Returns:
+        Optional[float]: Hit rate, or None without lookups
+    """
+    lookups = hits + misses
+    return hits / lookups if lookups else None
+
+def escape_label(value: str) -> str:
+    """
+    Escape a Prometheus label value
+
+    Args:
+        value: Raw value
+
+    Returns:
+        str: Value safe inside double quotes
+    """
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class MetricsRegistry:
+    """
+    Process-wide totals of requests, phases and counters
+
+    Rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = REQUEST_DURATION_BUCKETS):
+        """
+        Initialize empty metrics
+
+        Args:
+            buckets: Upper bounds of the request duration histogram buckets
+        """
+        self.buckets = buckets
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        # Per route: bucket counts, sum and count of request durations
+        self.durations: Dict[str, Tuple[List[int], float, int]] = {}
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTERS}
+        self._lock = threading.Lock()
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float, trace: RequestTrace) -> None:
+        """
+        Record a finished request and the phases and counters of its trace
+
+        Args:
+            route: Route path template
+            method: HTTP method
+            status: Response status code
+            seconds: Request duration
+            trace: Trace of the request
+        """
+        key = (route, method, str(status))
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+            buckets, total, count = self.durations.get(route) or ([0] * len(self.buckets), 0.0, 0)
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    buckets[index] += 1
+            self.durations[route] = (buckets, total + seconds, count + 1)
+
+        durations, counters = trace.snapshot()
+        self.observe_phases(durations)
+        for name, value in counters.items():
+            self.count(name, value)
+
+    def observe_phases(self, durations: Mapping[str, float]) -> None:
+        """
+        Add time to phases
+
+        Args:
+            durations: Seconds by phase name
+        """
+        with self._lock:
+            for name, seconds in durations.items():
+                self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter
+
+        Args:
+            name: Counter name
+            value: Increment
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            str: Metrics text
+        """
+        with self._lock:
+            requests = dict(self.requests)
+            durations = {route: (list(buckets), total, count) for route, (buckets, total, count) in self.durations.items()}
+            phases = dict(self.phases)
+            counters = dict(self.counters)
+
+        lines = []
+
+        def header(name: str, kind: str, description: str) -> str:
+            metric = f"{METRICS_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {kind}")
+            return metric
+
+        metric = header("requests_total", "counter", "Requests handled, by route, method and status")
+        for (route, method, status), value in sorted(requests.items()):
+            lines.append(f'{metric}{{route="{escape_label(route)}",method="{method}",status="{status}"}} {value}')
+
+        metric = header("request_duration_seconds", "histogram", "Request duration until the response starts")
+        for route, (buckets, total, count) in sorted(durations.items()):
+            label = f'route="{escape_label(route)}"'
+            for bound, value in zip(self.buckets, buckets):
+                lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {value}')
+            lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"{metric}_sum{{{label}}} {total}")
+            lines.append(f"{metric}_count{{{label}}} {count}")
+
+        metric = header("phase_seconds_total", "counter", "Time spent in each analysis phase")
+        for name, seconds in sorted(phases.items()):
+            lines.append(f'{metric}{{phase="{escape_label(name)}"}} {seconds}')
+
+        for name, value in sorted(counters.items()):
+            metric = header(f"{name}_total", "counter", COUNTERS.get(name, name.replace("_", " ").capitalize()))
+            lines.append(f"{metric} {value}")
+
+        for cache in CACHES:
+            rate = hit_rate(counters.get(f"{cache}_hits", 0), counters.get(f"{cache}_misses", 0))
+            metric = header(f"{cache}_hit_ratio", "gauge", f"Share of {cache.replace('_', ' ')} lookups that hit since start")
+            lines.append(f"{metric} {rate if rate is not None else 0.0}")
+
+        return "\n".join(lines) + "\n"
+
+# Metrics of this process
+metrics = MetricsRegistry()
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+def start_trace() -> Tuple[RequestTrace, Token]:
+    """
+    Start tracing the current request
+
+    Returns:
+        Tuple[RequestTrace, Token]: The trace, and the token to end it with
+    """
+    trace = RequestTrace()
+    return trace, _current_trace.set(trace)
+
+def end_trace(token: Token) -> None:
+    """
+    Stop tracing the current request
+
+    Args:
+        token: Token from start_trace
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.finished = True
+    _current_trace.reset(token)
+
+def _active_trace() -> Optional[RequestTrace]:
+    """
+    Get the trace of the running request, if it is still running
+
+    Returns:
+        Optional[RequestTrace]: Trace, or None outside requests
+    """
+    trace = _current_trace.get()
+    return trace if trace is not None and not trace.finished else None
+
+def record_phases(durations: Mapping[str, float]) -> None:
+    """
+    Add time to phases of the running request, or directly to the metrics
+
+    Args:
+        durations: Seconds by phase name
+    """
+    trace = _active_trace()
+    if trace is None:
+        metrics.observe_phases(durations)
+        return
+    for name, seconds in durations.items():
+        trace.add(name, seconds)
+
+def record_count(name: str, value: int = 1) -> None:
+    """
+    Increment a counter of the running request, or directly of the metrics
+
+    Args:
+        name: Counter name
+        value: Increment
+    """
+    trace = _active_trace()
+    if trace is None:
+        metrics.count(name, value)
+    else:
+        trace.count(name, value)
+
+@contextmanager
+def trace_phase(name: str) -> Iterator[None]:
+    """
+    Time a block as part of a phase of the running request
+
+    Args:
+        name: Phase name
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phases({name: time.perf_counter() - start})
+
+def traced(name: str) -> Callable[[F], F]:
+    """
+    Decorate a function or coroutine function so each call counts as a phase
+
+    Args:
+        name: Phase name
+
+    Returns:
+        Callable[[F], F]: Decorator
+    """
+    def decorate(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def run_async(*args, **kwargs):
+                with trace_phase(name):
+                    return await func(*args, **kwargs)
+            return run_async
+
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            with trace_phase(name):
+                return func(*args, **kwargs)
+        return run
+
+    return decorate
+
+class TracedJSONResponse(JSONResponse):
+    """JSON response whose encoding counts as the serialization phase"""
+
+    def render(self, content: Any) -> bytes:
+        """
+        Encode content as JSON
+
+        Args:
+            content: JSON-serializable content
+
+        Returns:
+            bytes: Response body
+        """
+        with trace_phase("serialization"):
+            return super().render(content)
@@ -1,12 +1,52 @@
+import io
 import os
 import time
-import tempfile
-from typing import Dict, List, Tuple, Any
-import radon.complexity as radon_cc
-from radon.visitors import ComplexityVisitor
+from typing import Dict, Iterable, List, Tuple, Any
 import pygount
 from pathlib import Path
 
+from app.core.line_counter import COMMENT_SYNTAX, count_lines, line_count_language
+from app.core.python_source import parse_python_source
+
+def calculate_file_complexity(content: str, language: str) -> Tuple[float, int]:
+    """
+    Calculate cyclomatic complexity for a single file
+    
+    Args:
+        content: Code content
+        language: Language of the code
+        
+    Returns:
+        Tuple[float, int]: Total complexity and number of blocks it covers
+    """
+    total_complexity = 0.0
+    total_blocks = 0
+    
+    # Python complexity comes from the syntax tree, as radon computes it
+    if language.lower() == "python":
+        source = parse_python_source(content)
+        if source is not None:
+            total_complexity = source.complexity
+            total_blocks = source.complexity_blocks
+    else:
+        # For non-Python files, use a simple estimation based on code structure
+        # This is a very basic approximation
+        lines = content.split('\n')
+        control_structures = 0
+        for line in lines:
+            line = line.strip()
+            # Count control structures as indicators of complexity
+            if any(keyword in line for keyword in ['if ', 'else ', 'for ', 'while ', 'switch', 'case ', 'try ', 'catch ']):
+                control_structures += 1
+        
+        if len(lines) > 0:
+            # Simple approximation: control structures / lines of code * 10
+            estimated_complexity = (control_structures / len(lines)) * 10
+            total_complexity += estimated_complexity
+            total_blocks += 1
+    
+    return total_complexity, total_blocks
+
 def calculate_cyclomatic_complexity(code_contents: Dict[str, List[str]]) -> float:
     """
     Calculate average cyclomatic complexity for code contents
@@ -22,56 +62,26 @@ def calculate_cyclomatic_complexity(code_contents: Dict[str, List[str]]) -> floa
     
     for language, contents in code_contents.items():
         for content in contents:
-            # Only process Python files with radon
-            if language.lower() == "python":
-                try:
-                    # Parse the code and calculate complexity
-                    visitor = ComplexityVisitor.from_code(content)
-                    if visitor.functions or visitor.classes:
-                        for func in visitor.functions:
-                            total_complexity += func.complexity
-                            total_blocks += 1
-                        
-                        for cls in visitor.classes:
-                            for method in cls.methods:
-                                total_complexity += method.complexity
-                                total_blocks += 1
-                except Exception:
-                    # Skip files that can't be parsed
-                    pass
-            else:
-                # For non-Python files, use a simple estimation based on code structure
-                # This is a very basic approximation
-                lines = content.split('\n')
-                control_structures = 0
-                for line in lines:
-                    line = line.strip()
-                    # Count control structures as indicators of complexity
-                    if any(keyword in line for keyword in ['if ', 'else ', 'for ', 'while ', 'switch', 'case ', 'try ', 'catch ']):
-                        control_structures += 1
-                
-                if len(lines) > 0:
-                    # Simple approximation: control structures / lines of code * 10
-                    estimated_complexity = (control_structures / len(lines)) * 10
-                    total_complexity += estimated_complexity
-                    total_blocks += 1
+            complexity, blocks = calculate_file_complexity(content, language)
+            total_complexity += complexity
+            total_blocks += blocks
     
     # Return average complexity, default to 1.0 if no blocks were analyzed
     return round(total_complexity / max(total_blocks, 1), 1)
 
-def calculate_tech_diversity(code_contents: Dict[str, List[str]], libraries: List[str]) -> int:
+def calculate_tech_diversity(languages: Iterable[str], libraries: List[str]) -> int:
     """
     Calculate tech stack diversity based on languages and libraries
     
     Args:
-        code_contents: Dictionary mapping languages to lists of code content
+        languages: Detected languages (a dictionary keyed by language also works)
         libraries: List of detected libraries
         
     Returns:
         int: Tech stack diversity score
     """
     # Count unique languages and libraries
-    unique_languages = set(lang.lower() for lang in code_contents.keys() if lang.lower() != "unknown")
+    unique_languages = set(lang.lower() for lang in languages if lang.lower() != "unknown")
     unique_libraries = set(lib.lower() for lib in libraries)
     
     # Return total count of unique technologies
@@ -150,6 +160,36 @@ def calculate_category_average(skills: List[Dict[str, Any]], category: str) -> i
     
     return round(avg_score)
 
+def count_lines_of_code(content: str) -> int:
+    """
+    Count non-empty, non-comment lines (simple heuristic)
+    
+    Args:
+        content: File content
+        
+    Returns:
+        int: Lines of code
+    """
+    lines = content.split('\n')
+    code_lines = [line for line in lines if line.strip() and not line.strip().startswith(('#', '//', '/*', '*', '<!--'))]
+    return len(code_lines)
+
+def count_source_lines(content: str, language: str) -> int:
+    """
+    Count lines of code using the comment grammar of a language
+    
+    Args:
+        content: File content
+        language: Language of the code
+        
+    Returns:
+        int: Lines of code
+    """
+    syntax = COMMENT_SYNTAX.get(language)
+    if syntax is None:
+        return count_lines_of_code(content)
+    return count_lines(content, syntax).code
+
 def analyze_file_content(file_path: str) -> Tuple[int, str]:
     """
     Analyze a single file to count lines of code and detect language
@@ -161,20 +201,36 @@ def analyze_file_content(file_path: str) -> Tuple[int, str]:
         Tuple[int, str]: Lines of code and detected language
     """
     try:
-        # Use pygount to count lines and detect language
-        analysis = pygount.source_analysis(file_path, "pygount")
+        with open(file_path, 'rb') as f:
+            content = f.read()
+    except Exception:
+        return 0, "unknown"
+    
+    return analyze_source_content(file_path, content)
+
+def analyze_source_content(file_path: str, content: bytes) -> Tuple[int, str]:
+    """
+    Analyze in-memory file content to count lines of code and detect language
+    
+    Args:
+        file_path: Path of the file, used for language detection
+        content: File content as bytes
+        
+    Returns:
+        Tuple[int, str]: Lines of code and detected language
+    """
+    # Languages with a known comment grammar are counted directly
+    language = line_count_language(file_path)
+    if language is not None:
+        return count_lines(content.decode('utf-8', errors='ignore'), COMMENT_SYNTAX[language]).code, language
+    
+    try:
+        # Let pygount guess other languages, on an in-memory handle
+        analysis = pygount.SourceAnalysis.from_file(file_path, "pygount", file_handle=io.BytesIO(content))
         return analysis.code, analysis.language
     except Exception:
         # Fallback to simple line counting if pygount fails
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-                lines = content.split('\n')
-                # Filter out empty lines and comments (simple heuristic)
-                code_lines = [line for line in lines if line.strip() and not line.strip().startswith(('#', '//', '/*', '*', '<!--'))]
-                return len(code_lines), os.path.splitext(file_path)[1].lstrip('.')
-        except Exception:
-            return 0, "unknown"
+        return count_lines_of_code(content.decode('utf-8', errors='ignore')), os.path.splitext(file_path)[1].lstrip('.')
 
 def analyze_upload_content(content: bytes, filename: str) -> Tuple[int, Dict[str, int], float]:
     """
@@ -189,25 +245,13 @@ def analyze_upload_content(content: bytes, filename: str) -> Tuple[int, Dict[str
     """
     start_time = time.time()
     
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp_file:
-        temp_file.write(content)
-        temp_path = temp_file.name
+    # Analyze the content in memory
+    lines, language = analyze_source_content(filename, content)
     
-    try:
-        # Analyze the file
-        lines, language = analyze_file_content(temp_path)
-        
-        # Calculate processing time
-        processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
-        
-        return lines, {language: lines}, processing_time
-    finally:
-        # Clean up temporary file
-        try:
-            os.unlink(temp_path)
-        except Exception:
-            pass
+    # Calculate processing time
+    processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+    
+    return lines, {language: lines}, processing_time
 
 def analyze_directory_content(directory_path: str) -> Tuple[int, Dict[str, int], float, int]:
     """
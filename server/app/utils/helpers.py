@@ -1,10 +1,7 @@
+import json
 import os
-import re
-import requests
-import tempfile
-import zipfile
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List
 from pathlib import Path
 
 def get_timestamp() -> str:
@@ -16,55 +13,18 @@ def get_timestamp() -> str:
     """
     return datetime.now().isoformat()
 
-def clone_github_repo(repo_url: str, branch: str = "main") -> Tuple[str, Optional[str]]:
+def format_sse(event: str, data: Any) -> str:
     """
-    Clone a GitHub repository using HTTP requests (no git required)
+    Format a Server-Sent Events message
     
     Args:
-        repo_url: GitHub repository URL
-        branch: Branch to clone
+        event: Event name
+        data: JSON-serializable event payload
         
     Returns:
-        Tuple[str, Optional[str]]: Path to cloned repo and error message if any
+        str: Encoded event
     """
-    # Extract owner and repo name from URL
-    # Example: https://github.com/owner/repo
-    match = re.match(r'https://github.com/([^/]+)/([^/]+)', repo_url)
-    if not match:
-        return None, "Invalid GitHub repository URL"
-    
-    owner, repo = match.groups()
-    repo = repo.rstrip('.git')
-    
-    # Create archive URL
-    archive_url = f"https://github.com/{owner}/{repo}/archive/refs/heads/{branch}.zip"
-    
-    try:
-        # Download repository as ZIP
-        response = requests.get(archive_url, stream=True)
-        if response.status_code != 200:
-            return None, f"Failed to download repository: HTTP {response.status_code}"
-        
-        # Save ZIP file
-        temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-        with temp_zip as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
-        # Extract ZIP file
-        extract_dir = tempfile.mkdtemp()
-        with zipfile.ZipFile(temp_zip.name, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        
-        # Clean up ZIP file
-        os.unlink(temp_zip.name)
-        
-        # Return path to extracted repo
-        repo_dir = os.path.join(extract_dir, f"{repo}-{branch}")
-        return repo_dir, None
-    
-    except Exception as e:
-        return None, f"Error cloning repository: {str(e)}"
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
 
 def get_file_paths(directory: str, allowed_extensions: set) -> List[str]:
     """
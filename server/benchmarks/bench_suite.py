@@ -0,0 +1,371 @@
+"""
+Benchmark the analysis hot paths on synthetic corpora and compare to a baseline
+
+Each scenario drives one target (skill extraction, library parsing,
+complexity, directory summaries or an API endpoint, called in-process)
+over one generated corpus, and reports throughput, per-operation latency
+and peak memory. Scenarios run in their own process, so peak RSS belongs
+to a single scenario. Analysis runs in that process (ANALYSIS_WORKERS=0)
+and caches stay in memory unless the environment says otherwise.
+
+Baselines are machine-specific: record one with --save-baseline on the
+machine you compare on, then rerun after a change. Regressions beyond the
+tolerance make the run exit with status 1.
+
+Usage (from the server directory):
+    python -m benchmarks.bench_suite [--scale X] [--repeat N] [--scenario GLOB]
+    python -m benchmarks.bench_suite --save-baseline
+"""
+import argparse
+import fnmatch
+import functools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.corpus import generate_corpus, write_corpus, zip_corpus
+
+# Default location of the stored baseline
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Scenarios by name: corpus kind and target
+SCENARIOS = {
+    "skills/python-files": ("python-files", "skills"),
+    "skills/minified-js": ("minified-js", "skills"),
+    "skills/monorepo": ("monorepo", "skills"),
+    "parser/python-files": ("python-files", "parser"),
+    "parser/minified-js": ("minified-js", "parser"),
+    "parser/monorepo": ("monorepo", "parser"),
+    "complexity/python-files": ("python-files", "complexity"),
+    "complexity/monorepo": ("monorepo", "complexity"),
+    "directory/deep-tree": ("deep-tree", "directory"),
+    "directory/monorepo": ("monorepo", "directory"),
+    "endpoint-file/monorepo": ("monorepo", "endpoint-file"),
+    "endpoint-file/deep-tree": ("deep-tree", "endpoint-file"),
+    "endpoint-file/minified-js": ("minified-js", "endpoint-file"),
+    "endpoint-summary/monorepo": ("monorepo", "endpoint-summary"),
+}
+
+# Compared metrics, and whether higher values are better
+COMPARED_METRICS = {
+    "files_per_second": True,
+    "p99_ms": False,
+    "peak_rss_mb": False,
+}
+
+Operations = List[Callable[[], Any]]
+
+@contextmanager
+def skills_operations(files: List[Tuple[str, str]]) -> Iterator[Operations]:
+    """
+    Extract skills from each file
+
+    Args:
+        files: (path, content) pairs
+    """
+    from app.core.languages import get_extension
+    from app.core.skills import SkillExtractor
+
+    extractor = SkillExtractor()
+    yield [functools.partial(extractor.extract_skills, content, get_extension(path)) for path, content in files]
+
+@contextmanager
+def parser_operations(files: List[Tuple[str, str]]) -> Iterator[Operations]:
+    """
+    Extract the libraries of each file
+
+    Args:
+        files: (path, content) pairs
+    """
+    from app.core.languages import get_extension, language_from_extension
+    from app.services.parser import CodeParser
+
+    parser = CodeParser()
+    yield [
+        functools.partial(parser.extract_libraries, content, language_from_extension(get_extension(path)) or 'Unknown')
+        for path, content in files
+    ]
+
+@contextmanager
+def complexity_operations(files: List[Tuple[str, str]]) -> Iterator[Operations]:
+    """
+    Calculate the complexity of each file
+
+    Args:
+        files: (path, content) pairs
+    """
+    from app.core.languages import get_extension, language_from_extension
+    from app.utils.code_analysis import calculate_cyclomatic_complexity
+
+    yield [
+        functools.partial(calculate_cyclomatic_complexity, {language_from_extension(get_extension(path)) or 'Unknown': [content]})
+        for path, content in files
+    ]
+
+@contextmanager
+def directory_operations(files: List[Tuple[str, str]]) -> Iterator[Operations]:
+    """
+    Summarize the corpus written to a directory, in one operation
+
+    Args:
+        files: (path, content) pairs
+    """
+    from app.utils.code_analysis import analyze_directory_content
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_corpus(files, directory)
+        yield [functools.partial(analyze_directory_content, directory)]
+
+def endpoint_operations(path: str) -> Callable[[List[Tuple[str, str]]], Any]:
+    """
+    Build the operations of posting the zipped corpus to an endpoint
+
+    The per-file cache is cleared before every request, so each one
+    analyzes the whole archive.
+
+    Args:
+        path: Endpoint path
+
+    Returns:
+        Callable: Context manager yielding the operations
+    """
+    @contextmanager
+    def operations(files: List[Tuple[str, str]]) -> Iterator[Operations]:
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.services.pipeline import file_cache
+
+        archive = zip_corpus(files)
+
+        def post() -> None:
+            file_cache.clear()
+            response = client.post(path, files={"file": ("corpus.zip", archive, "application/zip")})
+            if response.status_code != 200 or response.json().get("error"):
+                raise RuntimeError(f"{path} failed with {response.status_code}: {response.text[:200]}")
+
+        with TestClient(app) as client:
+            yield [post]
+
+    return operations
+
+# Operation builders by target
+TARGETS = {
+    "skills": skills_operations,
+    "parser": parser_operations,
+    "complexity": complexity_operations,
+    "directory": directory_operations,
+    "endpoint-file": endpoint_operations("/analyze/analyze/file"),
+    "endpoint-summary": endpoint_operations("/api/api/upload_summary"),
+}
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Get a nearest-rank percentile
+
+    Args:
+        values: Sorted values
+        fraction: Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        float: Percentile value
+    """
+    index = max(0, min(len(values) - 1, int(round(fraction * len(values) + 0.5)) - 1))
+    return values[index]
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Get the peak resident set size of this process
+
+    Returns:
+        Optional[float]: Peak RSS in MB, or None where it cannot be read
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_scenario(name: str, scale: float, seed: int, repeat: int, warmup: int) -> Dict[str, Any]:
+    """
+    Run one scenario and measure it
+
+    Throughput comes from the fastest run; latency percentiles cover every
+    operation of every timed run.
+
+    Args:
+        name: Scenario name
+        scale: Corpus size multiplier
+        seed: Corpus random seed
+        repeat: Timed runs
+        warmup: Untimed runs before them
+
+    Returns:
+        Dict[str, Any]: Metrics
+    """
+    os.environ.setdefault("ANALYSIS_WORKERS", "0")
+    os.environ.setdefault("CACHE_BACKEND", "memory")
+
+    kind, target = SCENARIOS[name]
+    files = generate_corpus(kind, scale, seed)
+    total_bytes = sum(len(content.encode("utf-8")) for _, content in files)
+
+    latencies: List[float] = []
+    best = float("inf")
+    with TARGETS[target](files) as operations:
+        for run in range(warmup + repeat):
+            start = time.perf_counter()
+            for operation in operations:
+                operation_start = time.perf_counter()
+                operation()
+                if run >= warmup:
+                    latencies.append(time.perf_counter() - operation_start)
+            if run >= warmup:
+                best = min(best, time.perf_counter() - start)
+
+    latencies.sort()
+    peak = peak_rss_mb()
+    return {
+        "files": len(files),
+        "bytes": total_bytes,
+        "operations": len(operations),
+        "files_per_second": round(len(files) / best, 1),
+        "mb_per_second": round(total_bytes / best / 1e6, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "peak_rss_mb": round(peak, 1) if peak is not None else None,
+    }
+
+def run_isolated(name: str, scale: float, seed: int, repeat: int, warmup: int) -> Dict[str, Any]:
+    """
+    Run one scenario in a fresh process
+
+    Args:
+        name: Scenario name
+        scale: Corpus size multiplier
+        seed: Corpus random seed
+        repeat: Timed runs
+        warmup: Untimed runs before them
+
+    Returns:
+        Dict[str, Any]: Metrics
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(run_scenario, name, scale, seed, repeat, warmup).result()
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Print how results changed from the baseline
+
+    Args:
+        results: Results of this run
+        baseline: Stored baseline results
+        tolerance: Relative change beyond which a metric counts as regressed
+
+    Returns:
+        List[str]: Descriptions of the regressions
+    """
+    if (results["scale"], results["seed"]) != (baseline.get("scale"), baseline.get("seed")):
+        print(f"baseline was recorded with scale {baseline.get('scale')} and seed {baseline.get('seed')}; not comparing")
+        return []
+
+    regressions = []
+    print(f"\n{'scenario':28} {'metric':17} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, metrics in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}: {old} -> {new}")
+            print(f"{name:28} {metric:17} {old:>10} {new:>10} {change:>+8.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="corpus size multiplier")
+    parser.add_argument("--seed", type=int, default=42, help="corpus random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per scenario")
+    parser.add_argument("--scenario", action="append", help="scenario name or glob, may repeat (default: all)")
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    parser.add_argument("--in-process", action="store_true", help="run scenarios in this process; peak RSS accumulates")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="relative change that counts as a regression")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (kind, target) in SCENARIOS.items():
+            print(f"{name:28} {target} on {kind}")
+        return
+
+    patterns = args.scenario or ["*"]
+    names = [name for name in SCENARIOS if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+    if not names:
+        parser.error(f"no scenario matches {', '.join(patterns)}")
+
+    run = run_scenario if args.in_process else run_isolated
+    results = {
+        "scale": args.scale,
+        "seed": args.seed,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "scenarios": {},
+    }
+
+    print(f"{'scenario':28} {'files':>6} {'MB':>6} {'files/s':>10} {'MB/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8}")
+    for name in names:
+        metrics = run(name, args.scale, args.seed, args.repeat, args.warmup)
+        results["scenarios"][name] = metrics
+        rss = metrics["peak_rss_mb"] if metrics["peak_rss_mb"] is not None else "n/a"
+        print(
+            f"{name:28} {metrics['files']:>6} {metrics['bytes'] / 1e6:>6.2f} {metrics['files_per_second']:>10} "
+            f"{metrics['mb_per_second']:>8} {metrics['p50_ms']:>9} {metrics['p99_ms']:>9} {rss:>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nbaseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nno baseline at {args.baseline}; record one with --save-baseline")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
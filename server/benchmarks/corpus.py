@@ -0,0 +1,241 @@
+"""
+Synthetic repository corpora for benchmarks
+
+Every corpus is generated from a seed, so the same kind, scale and seed
+always give byte-identical files.
+"""
+import io
+import os
+import random
+import zipfile
+from typing import Callable, Dict, List, Tuple
+
+# Module names imported by generated Python files
+PYTHON_PACKAGES = ["os", "sys", "json", "pandas", "numpy", "flask", "django", "requests", "sqlalchemy", "torch"]
+
+# Package names imported by generated JavaScript and TypeScript files
+JS_PACKAGES = ["react", "axios", "lodash", "express", "@angular/core", "vue", "@prisma/client", "redux"]
+
+def python_module(rng: random.Random, functions: int) -> str:
+    """
+    Generate a Python module with imports, classes and branching functions
+
+    Args:
+        rng: Random generator
+        functions: Number of functions
+
+    Returns:
+        str: Source code
+    """
+    lines = [f"import {name}" for name in rng.sample(PYTHON_PACKAGES, 3)]
+    lines.append(f"from {rng.choice(PYTHON_PACKAGES)} import helper")
+    lines.append("")
+    lines.append(f"class Model{rng.randint(0, 999)}:")
+    lines.append('    """A generated model"""')
+    lines.append("")
+    lines.append("    def save(self, value):")
+    lines.append("        return value if value else None")
+    for index in range(functions):
+        lines.append("")
+        lines.append(f"def handler_{index}(items, limit={rng.randint(1, 100)}):")
+        lines.append("    # Keep items under the limit")
+        lines.append("    result = []")
+        lines.append("    for item in items:")
+        lines.append("        if item > limit and item % 2 == 0:")
+        lines.append("            result.append(item)")
+        lines.append("        elif item < 0 or item is None:")
+        lines.append("            continue")
+        lines.append("    try:")
+        lines.append("        return [value * 2 for value in result if value]")
+        lines.append("    except ValueError:")
+        lines.append("        return []")
+    return "\n".join(lines) + "\n"
+
+def js_module(rng: random.Random, functions: int, typed: bool = False) -> str:
+    """
+    Generate a JavaScript or TypeScript module
+
+    Args:
+        rng: Random generator
+        functions: Number of functions
+        typed: Add TypeScript type annotations
+
+    Returns:
+        str: Source code
+    """
+    lines = [f"import {{ thing{index} }} from '{name}';" for index, name in enumerate(rng.sample(JS_PACKAGES, 3))]
+    lines.append("import helpers from './helpers';")
+    lines.append(f"const lazy = () => import('{rng.choice(JS_PACKAGES)}');")
+    lines.append("")
+    annotation = ": number[]" if typed else ""
+    for index in range(functions):
+        lines.append(f"export function handler{index}(items{annotation}) {{")
+        lines.append("  // Keep even items")
+        lines.append("  const pattern = /import .* from 'fake'/g;")
+        lines.append(f"  const label = `handler ${{items.length}} of {index}`;")
+        lines.append("  return items.filter((item) => item % 2 === 0 && !pattern.test(label));")
+        lines.append("}")
+        lines.append("")
+    return "\n".join(lines)
+
+def minified_bundle(rng: random.Random, size: int) -> str:
+    """
+    Generate a minified JavaScript bundle on a single line
+
+    Args:
+        rng: Random generator
+        size: Approximate size in bytes
+
+    Returns:
+        str: Source code
+    """
+    parts = []
+    length = 0
+    index = 0
+    while length < size:
+        package = rng.choice(JS_PACKAGES)
+        part = (
+            f'var a{index}=require("{package}"),b{index}=function(e,t){{return e&&t?e+t:"import x from y"}};'
+            f"function c{index}(e){{for(var t=0;t<e.length;t++)if(e[t]/2>1)return/=[a-z]+/.test(e[t]);return`${{e}}`}}"
+        )
+        parts.append(part)
+        length += len(part)
+        index += 1
+    return "".join(parts)
+
+def generate_python_files(scale: float, seed: int) -> List[Tuple[str, str]]:
+    """
+    Generate many small Python files
+
+    Args:
+        scale: Size multiplier
+        seed: Random seed
+
+    Returns:
+        List[Tuple[str, str]]: (path, content) pairs
+    """
+    rng = random.Random(seed)
+    return [
+        (f"project/pkg{index % 10}/module_{index}.py", python_module(rng, rng.randint(1, 12)))
+        for index in range(int(400 * scale))
+    ]
+
+def generate_minified_js(scale: float, seed: int) -> List[Tuple[str, str]]:
+    """
+    Generate minified JavaScript bundles
+
+    Args:
+        scale: Size multiplier
+        seed: Random seed
+
+    Returns:
+        List[Tuple[str, str]]: (path, content) pairs
+    """
+    rng = random.Random(seed)
+    return [
+        (f"project/dist/bundle_{index}.min.js", minified_bundle(rng, rng.randint(128, 384) * 1024))
+        for index in range(max(1, int(4 * scale)))
+    ]
+
+def generate_deep_tree(scale: float, seed: int) -> List[Tuple[str, str]]:
+    """
+    Generate files nested many directories deep
+
+    Args:
+        scale: Size multiplier
+        seed: Random seed
+
+    Returns:
+        List[Tuple[str, str]]: (path, content) pairs
+    """
+    rng = random.Random(seed)
+    files = []
+    for index in range(int(300 * scale)):
+        depth = rng.randint(8, 24)
+        directory = "/".join(f"level{level}_{rng.randint(0, 3)}" for level in range(depth))
+        if index % 2:
+            files.append((f"project/{directory}/module_{index}.py", python_module(rng, rng.randint(1, 4))))
+        else:
+            files.append((f"project/{directory}/module_{index}.js", js_module(rng, rng.randint(1, 4))))
+    return files
+
+def generate_monorepo(scale: float, seed: int) -> List[Tuple[str, str]]:
+    """
+    Generate a mixed-language monorepo with manifests and docs
+
+    Args:
+        scale: Size multiplier
+        seed: Random seed
+
+    Returns:
+        List[Tuple[str, str]]: (path, content) pairs
+    """
+    rng = random.Random(seed)
+    files = []
+    for package in range(max(1, int(8 * scale))):
+        root = f"monorepo/packages/service{package}"
+        for index in range(rng.randint(5, 15)):
+            files.append((f"{root}/backend/module_{index}.py", python_module(rng, rng.randint(2, 8))))
+            files.append((f"{root}/web/component_{index}.jsx", js_module(rng, rng.randint(2, 6))))
+            files.append((f"{root}/web/store_{index}.ts", js_module(rng, rng.randint(1, 4), typed=True)))
+        files.append((f"{root}/cmd/main.go", 'package main\n\nimport "fmt"\n\nfunc main() {\n\tfmt.Println("hi")\n}\n'))
+        files.append((f"{root}/src/App.java", "import org.springframework.boot.SpringApplication;\n\npublic class App {}\n"))
+        files.append((f"{root}/README.md", f"# Service {package}\n\n<!-- generated -->\nRun `make`.\n"))
+        files.append((f"{root}/package.json", '{"dependencies": {"react": "^18.0.0", "axios": "^1.0.0"}}\n'))
+        files.append((f"{root}/requirements.txt", "flask==3.0.0\npandas==2.1.0\n"))
+    return files
+
+# Corpus generators by kind
+CORPORA: Dict[str, Callable[[float, int], List[Tuple[str, str]]]] = {
+    "python-files": generate_python_files,
+    "minified-js": generate_minified_js,
+    "deep-tree": generate_deep_tree,
+    "monorepo": generate_monorepo,
+}
+
+def generate_corpus(kind: str, scale: float = 1.0, seed: int = 42) -> List[Tuple[str, str]]:
+    """
+    Generate a corpus
+
+    Args:
+        kind: Corpus kind, a key of CORPORA
+        scale: Size multiplier
+        seed: Random seed
+
+    Returns:
+        List[Tuple[str, str]]: (path, content) pairs
+    """
+    return CORPORA[kind](scale, seed)
+
+def zip_corpus(files: List[Tuple[str, str]]) -> bytes:
+    """
+    Pack a corpus into a zip archive
+
+    Entries get a fixed timestamp, so the archive is reproducible.
+
+    Args:
+        files: (path, content) pairs
+
+    Returns:
+        bytes: Zip archive
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path, content in files:
+            info = zipfile.ZipInfo(path, date_time=(2024, 1, 1, 0, 0, 0))
+            archive.writestr(info, content, compress_type=zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+def write_corpus(files: List[Tuple[str, str]], directory: str) -> None:
+    """
+    Write a corpus to disk
+
+    Args:
+        files: (path, content) pairs
+        directory: Directory to write under
+    """
+    for path, content in files:
+        target = os.path.join(directory, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "w", encoding="utf-8") as f:
+            f.write(content)
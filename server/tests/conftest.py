@@ -0,0 +1,64 @@
+"""
+Shared fixtures: an isolated app and a local GitHub stand-in
+"""
+import asyncio
+import os
+
+# Keep tests hermetic and fast: in-memory caches, no worker processes, and
+# no requests to the real GitHub. Set before the app is imported.
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["ANALYSIS_WORKERS"] = "0"
+os.environ["GITHUB_URL"] = "http://127.0.0.1:9"
+os.environ["GITHUB_API_URL"] = "http://127.0.0.1:9"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import analyze
+from app.services import github_service
+from app.services.pipeline import file_cache
+from fake_github import FakeGitHub
+
+@pytest.fixture(scope="session")
+def github_server():
+    """FakeGitHub serving for the whole session"""
+    fake = FakeGitHub()
+    fake.start()
+    yield fake
+    fake.stop()
+
+@pytest.fixture
+def github(github_server, monkeypatch):
+    """FakeGitHub with no repositories, which the app fetches from"""
+    github_server.reset()
+    monkeypatch.setattr(github_service, "GITHUB_URL", github_server.url)
+    monkeypatch.setattr(github_service, "GITHUB_API_URL", github_server.api_url)
+    github_service._head_etags.clear()
+    yield github_server
+    github_service._head_etags.clear()
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    """Start every test without cached results"""
+    analyze.cache_service.clear_cache()
+    analyze.repo_manifests.cache_service.clear_cache()
+    file_cache.clear()
+
+@pytest.fixture
+def client():
+    """Test client of the app"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a new event loop, closing the HTTP client it used"""
+    def run_coroutine(coroutine):
+        async def main():
+            try:
+                return await coroutine
+            finally:
+                await github_service.close_http_client()
+        return asyncio.run(main())
+    return run_coroutine
@@ -0,0 +1,214 @@
+"""
+Local stand-in for the GitHub endpoints the server talks to
+
+Serves branch and commit archives (through a redirect, like github.com),
+the commit SHA endpoint with ETags, and the list-repos API, from
+repositories held in memory.
+"""
+import hashlib
+import io
+import json
+import threading
+import time
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+@dataclass
+class FakeBranch:
+    """Head of a branch: its commit SHA and files"""
+    sha: str
+    files: Dict[str, bytes]
+    pushed_at: str = "2024-01-01T00:00:00Z"
+
+@dataclass
+class FakeGitHub:
+    """
+    GitHub stand-in running on a local port
+
+    Knobs change how archives are served, and counters record what the
+    server under test asked for.
+    """
+    branches: Dict[Tuple[str, str, str], FakeBranch] = field(default_factory=dict)
+    # Seconds each archive response waits before sending its body
+    archive_delay: float = 0.0
+    # Send archives without a Content-Length header
+    chunked: bool = False
+    requests: Counter = field(default_factory=Counter)
+    in_flight: int = 0
+    max_in_flight: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def api_url(self) -> str:
+        """Base URL of the REST API"""
+        return f"{self.url}/api"
+
+    def start(self) -> None:
+        """Start serving in a background thread"""
+        fake = self
+
+        class Handler(FakeGitHubHandler):
+            github = fake
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self) -> None:
+        """Forget repositories, knobs and counters"""
+        self.branches.clear()
+        self.archive_delay = 0.0
+        self.chunked = False
+        self.requests.clear()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def push(self, owner: str, repo: str, branch: str, files: Dict[str, bytes]) -> str:
+        """
+        Replace the files of a branch with a new commit
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            branch: Branch name
+            files: Repository files by path
+
+        Returns:
+            str: SHA of the new commit
+        """
+        digest = hashlib.sha1()
+        for path in sorted(files):
+            digest.update(path.encode() + b"\0" + files[path] + b"\0")
+        sha = digest.hexdigest()
+        self.branches[(owner, repo, branch)] = FakeBranch(sha=sha, files=dict(files))
+        return sha
+
+    def archive(self, owner: str, repo: str, ref: str) -> Optional[bytes]:
+        """
+        Build the zip archive of a branch or commit
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+            ref: Branch name or commit SHA
+
+        Returns:
+            Optional[bytes]: Archive, or None if the ref is unknown
+        """
+        for (branch_owner, branch_repo, name), branch in self.branches.items():
+            if (branch_owner, branch_repo) == (owner, repo) and ref in (name, branch.sha):
+                buffer = io.BytesIO()
+                with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+                    for path, content in branch.files.items():
+                        archive.writestr(f"{repo}-{ref}/{path}", content)
+                return buffer.getvalue()
+        return None
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """Request handler of FakeGitHub"""
+
+    github: FakeGitHub
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+
+        # /owner/repo/archive/refs/heads/branch.zip or /owner/repo/archive/sha.zip
+        if len(parts) >= 4 and parts[2] == "archive":
+            ref = parts[-1][:-len(".zip")]
+            return self.send(302, headers={"Location": f"/codeload/{parts[0]}/{parts[1]}/zip/{ref}"})
+
+        if parts[0] == "codeload" and len(parts) == 5:
+            return self.send_archive(parts[1], parts[2], parts[4])
+
+        # /api/repos/owner/repo/commits/branch
+        if parts[:2] == ["api", "repos"] and len(parts) == 6 and parts[4] == "commits":
+            return self.send_commit_sha(parts[2], parts[3], parts[5])
+
+        # /api/users/user/repos
+        if parts[:2] == ["api", "users"] and len(parts) == 4 and parts[3] == "repos":
+            return self.send_repos(parts[2])
+
+        self.send(404, b'{"message": "Not Found"}')
+
+    def send_archive(self, owner: str, repo: str, ref: str) -> None:
+        github = self.github
+        archive = github.archive(owner, repo, ref)
+        if archive is None:
+            return self.send(404, b"Not Found")
+
+        with github._lock:
+            github.requests["archive"] += 1
+            github.in_flight += 1
+            github.max_in_flight = max(github.max_in_flight, github.in_flight)
+        try:
+            time.sleep(github.archive_delay)
+            if not github.chunked:
+                return self.send(200, archive, {"Content-Type": "application/zip"})
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/zip")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(archive), 4096):
+                chunk = archive[start:start + 4096]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on the download
+            pass
+        finally:
+            with github._lock:
+                github.in_flight -= 1
+
+    def send_commit_sha(self, owner: str, repo: str, branch: str) -> None:
+        head = self.github.branches.get((owner, repo, branch))
+        if head is None:
+            return self.send(404, b'{"message": "Not Found"}')
+
+        etag = f'"{head.sha}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.github.requests["commits_not_modified"] += 1
+            return self.send(304, headers={"ETag": etag})
+
+        self.github.requests["commits"] += 1
+        self.send(200, head.sha.encode(), {"ETag": etag, "Content-Type": "application/vnd.github.sha"})
+
+    def send_repos(self, user: str) -> None:
+        self.github.requests["repos"] += 1
+        repos = [
+            {
+                "name": repo,
+                "full_name": f"{owner}/{repo}",
+                "default_branch": branch,
+                "fork": False,
+                "pushed_at": head.pushed_at,
+            }
+            for (owner, repo, branch), head in self.github.branches.items()
+            if owner == user
+        ]
+        self.send(200, json.dumps(repos).encode(), {"Content-Type": "application/json"})
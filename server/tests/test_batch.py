@@ -0,0 +1,54 @@
+"""
+Tests for analyzing several repositories in one request
+"""
+from app.routes import analyze
+
+FLASK_APP = b"import flask\n\napp = flask.Flask(__name__)\n"
+REACT_APP = b"import React from 'react';\n\nexport default function App() {}\n"
+
+def analyze_repos(client, *github_urls):
+    response = client.post("/api/api/analyze-repos", json={"github_urls": list(github_urls), "branch": "main"})
+    assert response.status_code == 200
+    return response.json()
+
+def test_repeated_repositories_are_analyzed_once(github, client):
+    github.push("alice", "api", "main", {"app.py": FLASK_APP})
+    github.push("alice", "web", "main", {"App.js": REACT_APP})
+    # The delay keeps both downloads in flight together
+    github.archive_delay = 0.2
+
+    batch = analyze_repos(
+        client,
+        "https://github.com/alice/api",
+        "https://github.com/alice/web",
+        "https://github.com/alice/api.git",
+        "https://github.com/alice/api/tree/main/src",
+    )
+
+    assert github.requests["archive"] == 2
+    results = batch["results"]
+    assert [result["filename"] for result in results] == ["api", "web", "api", "api"]
+    assert results[0] == results[2] == results[3]
+    # Listed three times, counted once
+    assert batch["profile"]["repositories"] == 2
+    assert batch["profile"]["languages"] == {"Python": 1, "JavaScript": 1}
+
+def test_invalid_urls_keep_their_position(github, client):
+    github.push("alice", "api", "main", {"app.py": FLASK_APP})
+
+    batch = analyze_repos(client, "https://gitlab.com/alice/api", "https://github.com/alice/api")
+
+    first, second = batch["results"]
+    assert first["error"] == "Invalid GitHub URL format"
+    assert second["error"] is None
+    assert batch["profile"]["repositories"] == 1
+
+def test_too_many_repositories_are_rejected(client, monkeypatch):
+    monkeypatch.setattr(analyze, "MAX_BATCH_REPOS", 2)
+
+    response = client.post(
+        "/api/api/analyze-repos",
+        json={"github_urls": [f"https://github.com/alice/repo{i}" for i in range(3)]},
+    )
+
+    assert response.status_code == 400
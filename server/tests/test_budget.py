@@ -0,0 +1,90 @@
+"""
+Tests for the limits that stop an analysis early
+"""
+import functools
+import io
+import zipfile
+
+from app.routes import analysis
+from app.services.pipeline import (
+    STOPPED_MAX_BYTES, STOPPED_MAX_FILES, STOPPED_SATURATED,
+    AnalysisBudget, FileAnalysis, analyze_upload_content,
+)
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for path, content in files.items():
+            archive.writestr(path, content)
+    return buffer.getvalue()
+
+MODULES = make_zip({f"module_{index}.py": f"import os\nvalue = {index}\n".encode() for index in range(5)})
+
+def test_max_files_stops_analysis(run):
+    budget = AnalysisBudget(max_files=2)
+
+    analyses, error = run(analyze_upload_content("repo.zip", MODULES, budget=budget))
+
+    assert error is None
+    assert len(analyses) == 2
+    assert budget.stopped == STOPPED_MAX_FILES
+
+def test_max_bytes_stops_analysis(run):
+    size = len(b"import os\nvalue = 0\n")
+    budget = AnalysisBudget(max_bytes=3 * size)
+
+    analyses, error = run(analyze_upload_content("repo.zip", MODULES, budget=budget))
+
+    assert len(analyses) == 3
+    assert budget.stopped == STOPPED_MAX_BYTES
+
+def test_whole_upload_within_budget(run):
+    budget = AnalysisBudget()
+
+    analyses, error = run(analyze_upload_content("repo.zip", MODULES, budget=budget))
+
+    assert len(analyses) == 5
+    assert budget.stopped is None
+
+def test_saturation_is_off_by_default():
+    budget = AnalysisBudget()
+
+    budget.observe([FileAnalysis(path="a.py", language="Python", size=1)] * 10000)
+
+    assert budget.stopped is None
+
+def test_saturation_stops_once_skills_stop_changing():
+    budget = AnalysisBudget(saturation_files=3)
+    found = FileAnalysis(path="a.py", language="Python", size=1, skills={"Python": 0.5})
+    unchanged = FileAnalysis(path="b.py", language="Python", size=1, skills={"Python": 0.4})
+
+    budget.observe([found, unchanged, unchanged])
+    assert budget.stopped is None
+
+    budget.observe([unchanged])
+    assert budget.stopped == STOPPED_SATURATED
+
+def test_reused_results_do_not_count_towards_saturation():
+    budget = AnalysisBudget(saturation_files=1)
+
+    budget.observe([FileAnalysis(path="a.py", language="Python", size=1)], count=False)
+
+    assert budget.stopped is None
+
+def test_developer_rank_reports_partial_analysis(client, monkeypatch):
+    monkeypatch.setattr(analysis, "AnalysisBudget", functools.partial(AnalysisBudget, max_files=2))
+
+    response = client.post("/api/api/developer_rank", files={"file": ("repo.zip", MODULES, "application/zip")})
+
+    assert response.status_code == 200
+    assert response.json()["partial"] is True
+    assert response.json()["partial_reason"] == STOPPED_MAX_FILES
+
+def test_developer_rank_does_not_stop_on_saturation(client, monkeypatch):
+    # Even where saturation is configured, the rank reads every file
+    monkeypatch.setattr(analysis, "AnalysisBudget", functools.partial(AnalysisBudget, saturation_files=1))
+
+    response = client.post("/api/api/developer_rank", files={"file": ("repo.zip", MODULES, "application/zip")})
+
+    assert response.json()["partial"] is False
+    assert response.json()["partial_reason"] is None
@@ -0,0 +1,93 @@
+"""
+Tests for the cache backends
+"""
+import json
+import sqlite3
+
+from app.services import cache_service
+from app.services.cache_service import (
+    CacheService, MemoryCacheBackend, SQLiteCacheBackend, TieredCacheBackend, remove_legacy_files,
+)
+
+def stored_sizes(backend):
+    conn = backend._connect()
+    total = conn.execute("SELECT total FROM cache_size").fetchone()[0]
+    summed = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+    return total, summed
+
+def test_sqlite_keeps_a_running_size(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / "cache.db")
+    cache = CacheService(backend=backend)
+
+    cache.cache_result("a", {"value": "x" * 100})
+    cache.cache_result("b", {"value": "y" * 10})
+    cache.cache_result("a", {"value": "z"})
+    backend.delete("b")
+    cache.cache_result("c", {"value": 1}, expiry=-1)
+    backend.sweep()
+
+    total, summed = stored_sizes(backend)
+    assert total == summed == len(json.dumps({"value": "z"}))
+
+def test_sqlite_seeds_the_size_of_an_existing_database(tmp_path):
+    path = tmp_path / "cache.db"
+    SQLiteCacheBackend(path).set_entry("a", {}, 2e9, "{}")
+    conn = sqlite3.connect(str(path))
+    conn.execute("DROP TABLE cache_size")
+    conn.commit()
+    conn.close()
+
+    assert stored_sizes(SQLiteCacheBackend(path)) == (2, 2)
+
+def test_sqlite_evicts_least_recently_used(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / "cache.db", max_bytes=30)
+    cache = CacheService(backend=backend)
+
+    for key in ("a", "b", "c"):
+        cache.cache_result(key, {"value": key})
+
+    assert cache.get_cached_result("a") is None
+    assert cache.get_cached_result("c") == {"value": "c"}
+    assert stored_sizes(backend)[0] <= 30
+
+def test_sqlite_reads_do_not_write_every_time(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / "cache.db")
+    backend.set_entry("a", {}, 2e9, "{}")
+    conn = backend._connect()
+    writes = conn.total_changes
+
+    for _ in range(5):
+        assert backend.get_entry("a") == ({}, 2e9)
+
+    assert conn.total_changes == writes
+
+def test_results_are_encoded_once(tmp_path, monkeypatch):
+    shared = SQLiteCacheBackend(tmp_path / "cache.db")
+    memory = MemoryCacheBackend()
+    cache = CacheService(backend=TieredCacheBackend(memory, shared))
+    encoded = []
+    dumps = json.dumps
+
+    def counting_dumps(value):
+        encoded.append(value)
+        return dumps(value)
+
+    monkeypatch.setattr(cache_service.json, "dumps", counting_dumps)
+
+    cache.cache_result("a", {"value": 1})
+    memory.clear()
+    # Promotion back to memory reuses the stored encoding
+    assert cache.get_cached_result("a") == {"value": 1}
+
+    assert len(encoded) == 1
+    assert memory.total_bytes == len('{"value": 1}')
+
+def test_legacy_cache_files_are_removed(tmp_path):
+    legacy = tmp_path / ("0" * 32 + ".json")
+    legacy.write_text("{}")
+    other = tmp_path / "settings.json"
+    other.write_text("{}")
+
+    assert remove_legacy_files(tmp_path) == 1
+    assert not legacy.exists()
+    assert other.exists()
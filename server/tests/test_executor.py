@@ -0,0 +1,74 @@
+"""
+Tests for running analysis work in the process pool
+"""
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import executor
+from app.services.executor import run_sharded, shard, shutdown_executor
+
+class BrokenPool(Executor):
+    """Pool whose workers have all died"""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.shut_down = True
+
+def double(items):
+    return [item * 2 for item in items]
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Make the pool run every input of two or more items"""
+    monkeypatch.setattr(executor, "ANALYSIS_WORKERS", 2)
+    monkeypatch.setattr(executor, "MIN_PARALLEL_BYTES", 0)
+    yield
+    shutdown_executor()
+
+def test_broken_pool_falls_back_to_threads(run, pool, monkeypatch):
+    broken = BrokenPool()
+    monkeypatch.setattr(executor, "_executor", broken)
+
+    results = run(run_sharded(double, range(10), lambda item: 1))
+
+    assert results == [item * 2 for item in range(10)]
+    assert broken.shut_down
+    # The next call starts a new pool
+    assert executor._executor is None
+
+def test_only_the_broken_pool_is_discarded(pool, monkeypatch):
+    broken, replacement = BrokenPool(), BrokenPool()
+    monkeypatch.setattr(executor, "_executor", replacement)
+
+    shutdown_executor(broken)
+
+    assert executor._executor is replacement
+    assert not replacement.shut_down
+
+def test_disabled_pool_runs_in_threads(run, monkeypatch):
+    monkeypatch.setattr(executor, "ANALYSIS_WORKERS", 0)
+    monkeypatch.setattr(executor, "MIN_PARALLEL_BYTES", 0)
+
+    assert executor.get_executor() is None
+    assert run(run_sharded(double, [1, 2, 3], lambda item: 1)) == [2, 4, 6]
+
+def test_process_pool_keeps_input_order(run, pool):
+    # list is importable in the spawned workers, and returns its shard as is
+    results = run(run_sharded(list, range(50), lambda item: item + 1))
+
+    assert results == list(range(50))
+
+def test_shards_balance_weight_and_keep_order():
+    shards = shard([5, 1, 1, 1, 1, 1, 5], lambda item: item, 3)
+
+    assert shards == [[5], [1, 1, 1, 1, 1], [5]]
+    assert shard([], lambda item: item, 3) == []
@@ -0,0 +1,73 @@
+"""
+Tests for reusing per-file results by content
+"""
+import pytest
+
+from app.services import pipeline
+from app.services.file_cache import FileResultCache
+from app.services.pipeline import analyze_batch, file_cache, get_file_cache_key
+
+APP = b"import flask\n\napp = flask.Flask(__name__)\n"
+
+@pytest.fixture
+def analyzed(monkeypatch):
+    """Paths of the files actually analyzed rather than served from the cache"""
+    paths = []
+    analyze = pipeline.analyze_sources_timed
+
+    def recording_analyze(files):
+        paths.extend(path for path, _ in files)
+        return analyze(files)
+
+    monkeypatch.setattr(pipeline, "analyze_sources_timed", recording_analyze)
+    return paths
+
+def test_repeated_content_is_analyzed_once(run, analyzed):
+    analyses = run(analyze_batch([("a/app.py", APP), ("b/app.py", APP)]))
+
+    assert analyzed == ["a/app.py"]
+    assert [analysis.path for analysis in analyses] == ["a/app.py", "b/app.py"]
+    assert analyses[0].libraries == analyses[1].libraries == ["flask"]
+
+def test_later_analyses_hit_the_cache(run, analyzed):
+    run(analyze_batch([("app.py", APP)]))
+
+    analyses = run(analyze_batch([("copy/app.py", APP)]))
+
+    assert analyzed == ["app.py"]
+    assert analyses[0].path == "copy/app.py"
+    assert file_cache.stats()["hits"] == 1
+
+def test_changed_content_is_analyzed_again(run, analyzed):
+    run(analyze_batch([("app.py", APP)]))
+
+    run(analyze_batch([("app.py", APP + b"import requests\n")]))
+
+    assert analyzed == ["app.py", "app.py"]
+
+def test_keys_depend_on_extension_and_content():
+    assert get_file_cache_key("a/app.py", APP) == get_file_cache_key("b/main.py", APP)
+    assert get_file_cache_key("app.py", APP) != get_file_cache_key("app.js", APP)
+    assert get_file_cache_key("app.py", APP) != get_file_cache_key("app.py", APP + b"\n")
+
+def test_keys_depend_on_rules_version():
+    assert FileResultCache.get_cache_key("1", ".py", APP) != FileResultCache.get_cache_key("2", ".py", APP)
+
+def test_least_recently_used_results_are_evicted():
+    cache = FileResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["entries"] == 2
+
+def test_zero_size_disables_caching():
+    cache = FileResultCache(max_entries=0)
+
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
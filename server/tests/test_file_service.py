@@ -0,0 +1,73 @@
+"""
+Tests for reading uploaded zip archives in memory
+"""
+import io
+import tempfile
+import zipfile
+
+from app.services.file_service import iter_zip_members
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path, content in files.items():
+            archive.writestr(path, content)
+    return buffer.getvalue()
+
+def test_reads_analyzable_members():
+    data = make_zip({
+        "pkg/app.py": b"import flask\n",
+        "web/App.jsx": b"import React from 'react';\n",
+        "notes.txt": b"not code",
+        "nested.zip": make_zip({"inner.py": b"import os\n"}),
+    })
+
+    assert dict(iter_zip_members(data)) == {
+        "pkg/app.py": b"import flask\n",
+        "web/App.jsx": b"import React from 'react';\n",
+    }
+
+def test_all_members_without_extension_filter():
+    data = make_zip({"notes.txt": b"text", "dir/": b""})
+
+    assert dict(iter_zip_members(data, extensions=None)) == {"notes.txt": b"text"}
+
+def test_skips_oversized_members():
+    data = make_zip({"small.py": b"x = 1\n", "large.py": b"x" * 100})
+
+    assert [path for path, _ in iter_zip_members(data, max_member_size=10)] == ["small.py"]
+
+def test_skipped_members_are_never_decompressed(monkeypatch):
+    data = make_zip({"small.py": b"x = 1\n", "large.py": b"x" * 100, "notes.txt": b"text"})
+    opened = []
+    open_member = zipfile.ZipFile.open
+
+    def recording_open(archive, name, *args, **kwargs):
+        opened.append(getattr(name, "filename", name))
+        return open_member(archive, name, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, "open", recording_open)
+
+    list(iter_zip_members(data, max_member_size=10))
+
+    assert opened == ["small.py"]
+
+def test_zip_upload_is_analyzed_without_temporary_files(client, monkeypatch):
+    def no_disk(*args, **kwargs):
+        raise AssertionError("upload written to disk")
+
+    monkeypatch.setattr(tempfile, "mkdtemp", no_disk)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_disk)
+    data = make_zip({"app.py": b"import flask\n", "index.js": b"const x = require('express');\n"})
+
+    response = client.post("/api/api/upload_summary", files={"file": ("repo.zip", data, "application/zip")})
+
+    assert response.status_code == 200
+    assert response.json()["total_files"] == 2
+    assert response.json()["most_used_languages"] == {"Python": 1, "JavaScript": 1}
+
+def test_invalid_zip_is_reported(client):
+    response = client.post("/analyze/analyze/file", files={"file": ("repo.zip", b"not a zip", "application/zip")})
+
+    assert response.status_code == 200
+    assert "not a zip file" in response.json()["error"]
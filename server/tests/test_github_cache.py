@@ -0,0 +1,79 @@
+"""
+Tests for keying GitHub analysis results on the resolved commit
+"""
+from app.routes import analyze
+from app.services.github_service import resolve_commit_sha
+
+REPO_URL = "https://github.com/alice/project"
+
+FLASK_APP = b"import flask\nfrom flask import Flask\n\napp = Flask(__name__)\n"
+PANDAS_MODEL = b"import pandas\nimport pandas as pd\n\nframe = pd.DataFrame()\n"
+
+def analyze_repo(client):
+    response = client.post("/analyze/analyze/github", json={"repository_url": REPO_URL, "branch": "main"})
+    assert response.status_code == 200
+    return response.json()
+
+def test_unchanged_branch_is_resolved_with_etag(github, run):
+    sha = github.push("alice", "project", "main", {"app.py": FLASK_APP})
+
+    async def resolve_twice():
+        return [await resolve_commit_sha("alice", "project", "main") for _ in range(2)]
+
+    assert run(resolve_twice()) == [(sha, None), (sha, None)]
+    assert github.requests["commits"] == 1
+    assert github.requests["commits_not_modified"] == 1
+
+def test_push_changes_resolved_sha(github, run):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP})
+    run(resolve_commit_sha("alice", "project", "main"))
+    sha = github.push("alice", "project", "main", {"app.py": b"import django\n"})
+
+    assert run(resolve_commit_sha("alice", "project", "main")) == (sha, None)
+    assert github.requests["commits"] == 2
+
+def test_unknown_branch_is_not_resolved(github, run):
+    sha, error = run(resolve_commit_sha("alice", "project", "main"))
+
+    assert sha is None
+    assert error == "Failed to resolve branch: HTTP 404"
+
+def test_unchanged_commit_is_served_from_cache(github, client):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP})
+
+    first = analyze_repo(client)
+    second = analyze_repo(client)
+
+    assert first["libraries"] == second["libraries"] == ["flask"]
+    assert github.requests["archive"] == 1
+    assert github.requests["commits_not_modified"] == 1
+
+def test_push_is_analyzed_again(github, client):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP})
+    assert analyze_repo(client)["libraries"] == ["flask"]
+
+    github.push("alice", "project", "main", {"app.py": FLASK_APP, "model.py": PANDAS_MODEL})
+
+    assert analyze_repo(client)["libraries"] == ["flask", "pandas"]
+    assert github.requests["archive"] == 2
+
+def test_registry_change_is_analyzed_again(github, client, monkeypatch):
+    # Results embed categories and learning resources from the registry
+    github.push("alice", "project", "main", {"app.py": FLASK_APP})
+    analyze_repo(client)
+
+    monkeypatch.setattr(analyze, "registry_digest", lambda: "0" * 64)
+    analyze_repo(client)
+
+    assert github.requests["archive"] == 2
+
+def test_unresolved_branch_falls_back_to_branch_download(github, client, monkeypatch):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP})
+    monkeypatch.setattr(analyze, "resolve_commit_sha", fake_unresolved)
+
+    assert analyze_repo(client)["libraries"] == ["flask"]
+    assert analyze_repo(client)["libraries"] == ["flask"]
+    assert github.requests["archive"] == 1
+
+async def fake_unresolved(owner, repo, branch):
+    return None, "Failed to resolve branch: HTTP 403"
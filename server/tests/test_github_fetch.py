@@ -0,0 +1,98 @@
+"""
+Tests for downloading repository archives
+"""
+import asyncio
+import io
+import zipfile
+
+import httpx
+
+from app.services import github_service
+from app.services.github_service import fetch_github_files, fetch_repo_archive
+
+REPO_URL = "https://github.com/alice/project"
+
+def test_fetch_archive_follows_redirect(github, run):
+    github.push("alice", "project", "main", {"app.py": b"import flask\n"})
+
+    archive, error = run(fetch_repo_archive("alice", "project", "main"))
+
+    assert error is None
+    assert zipfile.ZipFile(io.BytesIO(archive)).namelist() == ["project-main/app.py"]
+
+def test_fetch_files_strips_archive_root(github, run):
+    github.push("alice", "project", "main", {"app.py": b"import flask\n", "notes.bin": b"\0"})
+
+    files, error = run(fetch_github_files(REPO_URL, "main"))
+
+    assert error is None
+    assert files == [("app.py", b"import flask\n")]
+
+def test_fetch_missing_branch(github, run):
+    archive, error = run(fetch_repo_archive("alice", "project", "main"))
+
+    assert archive is None
+    assert error == "Failed to download repository: HTTP 404"
+
+def test_fetch_invalid_url(github, run):
+    files, error = run(fetch_github_files("https://example.com/alice/project"))
+
+    assert files == []
+    assert error == "Invalid GitHub repository URL"
+
+def test_archive_over_size_limit_is_rejected(github, run, monkeypatch):
+    github.push("alice", "project", "main", {f"module_{index}.py": bytes(range(256)) * 16 for index in range(8)})
+    monkeypatch.setattr(github_service, "MAX_ARCHIVE_SIZE", 1024)
+
+    archive, error = run(fetch_repo_archive("alice", "project", "main"))
+
+    assert archive is None
+    assert error == github_service.archive_too_large()
+
+def test_streamed_archive_over_size_limit_is_rejected(github, run, monkeypatch):
+    # Without a Content-Length the download stops once the limit is passed
+    github.push("alice", "project", "main", {f"module_{index}.py": bytes(range(256)) * 16 for index in range(8)})
+    github.chunked = True
+    monkeypatch.setattr(github_service, "MAX_ARCHIVE_SIZE", 1024)
+
+    archive, error = run(fetch_repo_archive("alice", "project", "main"))
+
+    assert archive is None
+    assert error == github_service.archive_too_large()
+
+def test_streamed_archive_under_size_limit(github, run):
+    github.push("alice", "project", "main", {"app.py": b"import flask\n"})
+    github.chunked = True
+
+    archive, error = run(fetch_repo_archive("alice", "project", "main"))
+
+    assert error is None
+    assert zipfile.ZipFile(io.BytesIO(archive)).namelist() == ["project-main/app.py"]
+
+def test_fetch_timeout(github, run, monkeypatch):
+    github.push("alice", "project", "main", {"app.py": b"import flask\n"})
+    github.archive_delay = 1.0
+    monkeypatch.setattr(github_service, "FETCH_TIMEOUT", httpx.Timeout(0.2))
+
+    archive, error = run(fetch_repo_archive("alice", "project", "main"))
+
+    assert archive is None
+    assert error == "Error downloading repository: request timed out"
+
+def test_concurrent_fetches_are_capped(github, run, monkeypatch):
+    for index in range(6):
+        github.push("alice", f"project{index}", "main", {"app.py": b"import flask\n"})
+    github.archive_delay = 0.2
+    monkeypatch.setattr(github_service, "MAX_CONCURRENT_FETCHES", 2)
+
+    async def fetch_all():
+        return await asyncio.gather(*[
+            fetch_repo_archive("alice", f"project{index}", "main")
+            for index in range(6)
+        ])
+
+    results = run(fetch_all())
+
+    assert [error for _, error in results] == [None] * 6
+    assert github.requests["archive"] == 6
+    assert github.max_in_flight == 2
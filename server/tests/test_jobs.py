@@ -0,0 +1,76 @@
+"""
+Tests for background analysis jobs
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.routes import jobs
+
+FLASK_APP = b"import flask\nfrom flask import Flask\n\napp = Flask(__name__)\n"
+
+def submit_file(client, content=FLASK_APP):
+    response = client.post("/jobs/jobs/file", files={"file": ("app.py", content, "text/x-python")})
+    assert response.status_code == 202
+    return response.json()["job_id"]
+
+def wait_until(client, job_id, statuses, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = client.get(f"/jobs/jobs/{job_id}").json()
+        if job["status"] in statuses or time.monotonic() > deadline:
+            return job
+        time.sleep(0.01)
+
+@pytest.fixture
+def stuck_analysis(monkeypatch):
+    """Make file jobs run until cancelled, recording their cancellation"""
+    calls = {"started": 0, "cancelled": 0}
+
+    async def run_until_cancelled(filename, content, progress=None):
+        calls["started"] += 1
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            calls["cancelled"] += 1
+            raise
+
+    monkeypatch.setattr(jobs, "run_file_analysis", run_until_cancelled)
+    return calls
+
+def test_job_completes_with_result(client):
+    job_id = submit_file(client)
+
+    job = wait_until(client, job_id, {"completed", "failed"})
+
+    assert job["status"] == "completed"
+    assert client.get(f"/jobs/jobs/{job_id}/result").json()["libraries"] == ["flask"]
+
+def test_cancel_reports_running_job_cancelled(client, stuck_analysis):
+    job_id = submit_file(client)
+    assert wait_until(client, job_id, {"running"})["status"] == "running"
+
+    response = client.delete(f"/jobs/jobs/{job_id}")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
+    assert response.json()["finished_at"] is not None
+    assert client.get(f"/jobs/jobs/{job_id}").json()["status"] == "cancelled"
+    assert client.get(f"/jobs/jobs/{job_id}/result").status_code == 409
+    # The analysis itself is cancelled on the server's event loop
+    deadline = time.monotonic() + 5
+    while not stuck_analysis["cancelled"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stuck_analysis["cancelled"] == 1
+
+def test_cancel_finished_job_keeps_its_outcome(client):
+    job_id = submit_file(client)
+    wait_until(client, job_id, {"completed"})
+
+    response = client.delete(f"/jobs/jobs/{job_id}")
+
+    assert response.json()["status"] == "completed"
+
+def test_cancel_unknown_job(client):
+    assert client.delete("/jobs/jobs/unknown").status_code == 404
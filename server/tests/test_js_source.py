@@ -0,0 +1,99 @@
+"""
+Tests for finding the modules JavaScript and TypeScript import
+"""
+import time
+
+import pytest
+
+from app.core.analyzer import detect_libraries
+from app.core.js_source import extract_js_packages, package_name, scan_module_specifiers
+
+@pytest.mark.parametrize("source, specifiers", [
+    ("import a from 'a';\nimport {\n  b,\n  c as d,\n} from \"b\";", ["a", "b"]),
+    ("import * as ns from 'ns'; import 'side-effect'; import type { T } from 'types';", ["ns", "side-effect", "types"]),
+    ("export * from 'all'; export { x } from 'some'; export const y = 1;", ["all", "some"]),
+    ("const m = await import('lazy'); const r = require('cjs');", ["lazy", "cjs"]),
+    ("import from from 'from-named';", ["from-named"]),
+    ("import a from 'a'; import again from 'a';", ["a"]),
+])
+def test_import_forms(source, specifiers):
+    assert scan_module_specifiers(source) == specifiers
+
+@pytest.mark.parametrize("source", [
+    "// import a from 'comment'\n/* require('block') */",
+    "const s = \"import a from 'string'\";",
+    "const t = `import a from 'template' ${x} require('more')`;",
+    "const r = /import a from 'regex'/g;",
+    "obj.require('method'); obj.import('method');",
+    "import.meta.url;",
+])
+def test_skips_text_that_is_not_code(source):
+    assert scan_module_specifiers(source) == []
+
+def test_reads_template_substitutions():
+    source = "const t = `${require('inside')} text ${`${import('nested')}`}`;"
+
+    assert scan_module_specifiers(source) == ["inside", "nested"]
+
+def test_division_is_not_a_regex():
+    source = "const half = total / 2; require('after-division'); const r = a / b / c;"
+
+    assert scan_module_specifiers(source) == ["after-division"]
+
+def test_jsx_text_is_not_code():
+    source = "import a from 'a';\nconst App = () => <div>import x from 'nope'</div>;\n"
+
+    assert scan_module_specifiers(source, jsx=True) == ["a"]
+    # Without JSX, the text reads as an import
+    assert scan_module_specifiers(source) == ["a", "nope"]
+
+def test_jsx_expressions_are_code():
+    source = (
+        "const List = () => (\n"
+        "  <ul className=\"list\" data-x='{' {...props}>\n"
+        "    {items.map(item => <li key={item}>{require('inner')}</li>)}\n"
+        "    <br/>It's {/* require('comment') */} done\n"
+        "  </ul>\n"
+        ");\n"
+        "const Empty = () => <>import y from 'fragment'</>;\n"
+        "require('after');\n"
+    )
+
+    assert scan_module_specifiers(source, jsx=True) == ["inner", "after"]
+
+@pytest.mark.parametrize("source", [
+    "const f = <T,>(value: T) => value;\nimport('after');",
+    "const f = <T extends object>(value: T) => value;\nimport('after');",
+    "if (a < b) { import('after'); }",
+])
+def test_angle_brackets_that_open_no_element(source):
+    assert scan_module_specifiers(source, jsx=True) == ["after"]
+
+def test_minified_code_scans_in_linear_time():
+    source = "import a from 'a';" + "x=y<z?'s':/r/.test(w)/2;" * 20000
+
+    start = time.perf_counter()
+    assert scan_module_specifiers(source, jsx=True) == ["a"]
+
+    assert time.perf_counter() - start < 2.0
+
+@pytest.mark.parametrize("specifier, package", [
+    ("lodash/fp", "lodash"),
+    ("@angular/core/testing", "@angular/core"),
+    ("node:fs", "fs"),
+    ("./local", None),
+    ("@/components/App", None),
+    ("https://cdn.example.com/lib.js", None),
+])
+def test_package_names(specifier, package):
+    assert package_name(specifier) == package
+
+def test_extract_js_packages():
+    source = "import fp from 'lodash/fp'; import map from 'lodash/map'; import x from './x';"
+
+    assert extract_js_packages(source) == ["lodash"]
+
+def test_react_is_found_by_its_specifier():
+    # "import React" alone no longer counts: it also matched comments
+    assert "react" in detect_libraries("import React from 'react';\n", "JavaScript/React")
+    assert "react" not in detect_libraries("// import React in the next version\n", "JavaScript")
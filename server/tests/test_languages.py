@@ -0,0 +1,39 @@
+"""
+Tests for resolving the language of a file
+"""
+import time
+
+from app.core.analyzer import analyze_code
+from app.core.languages import detect_language, resolve_language
+from app.services.parser import CodeParser
+
+def test_extension_is_authoritative():
+    assert resolve_language("src/App.TSX", "import os\ndef main(): pass\n") == "TypeScript"
+
+def test_content_decides_unknown_extensions():
+    assert resolve_language("script", "import os\nfrom sys import argv\ndef main():\n    pass\n") == "Python"
+
+def test_unknown_without_content():
+    assert resolve_language("notes.txt") == "Unknown"
+
+def test_detect_language_is_linear_on_long_lines():
+    # import followed by a long run of whitespace and no "from"
+    content = "import" + " " * 3000 + "x"
+
+    start = time.perf_counter()
+    detect_language(content)
+
+    assert time.perf_counter() - start < 1.0
+
+def test_parser_resolves_languages_of_sources():
+    results = CodeParser()._parse_sources([("app.py", "import flask\n"), ("README", "plain text\n")])
+
+    assert set(results) == {"Python", "Unknown"}
+
+def test_analyzer_reports_react_variants(tmp_path):
+    component = tmp_path / "App.jsx"
+    component.write_text("import React from 'react';\n")
+
+    language, _ = analyze_code(str(component))
+
+    assert language == "JavaScript/React"
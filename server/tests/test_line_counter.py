@@ -0,0 +1,100 @@
+"""
+Tests for counting lines the way pygount does
+"""
+import io
+
+import pygount
+import pytest
+
+from app.core.line_counter import COMMENT_SYNTAX, LineCounts, count_lines
+
+PYTHON_MODULE = '''"""Module docstring"""
+import os
+
+
+def read(path):
+    """
+    Read a file
+    """
+    message = (
+        "first part"
+        rb"second part"
+    )
+    if not path: pass  # nothing to do
+    bypass = [
+    ]
+    return open(path).read()
+'''
+
+def count_python(content):
+    return count_lines(content, COMMENT_SYNTAX["Python"])
+
+def test_docstrings_are_comments():
+    counts = count_python('def f():\n    """\n    Doc\n    """\n    return 1\n')
+
+    assert counts == LineCounts(code=2, comment=3, blank=0)
+
+def test_string_only_lines_are_not_code():
+    counts = count_python('x = (\n    "text"\n    f"more"\n)\n')
+
+    assert counts == LineCounts(code=1, comment=0, blank=1, string=2)
+
+def test_white_words_and_characters_are_not_code():
+    counts = count_python("try:\n    run()\nexcept Error:\n    pass\n    bypass()\n]\n")
+
+    assert counts.code == 4
+    assert counts.blank == 2
+
+def test_c_style_comments_and_strings():
+    counts = count_lines('/* a\n   b */\nint x = 1; // one\n"text";\n\nx++;\n', COMMENT_SYNTAX["C"])
+
+    assert counts == LineCounts(code=2, comment=2, blank=1, string=1)
+
+F_STRINGS = '''name = "world"
+print(
+    f"Hello {name}!"
+    f"{{escaped}} {name!r:>10}"
+    f"""
+    Total: {len(name)
+            + 1}
+    """
+    f"{'literal'}"
+)
+'''
+
+TEMPLATE_LITERALS = '''const label = `
+  ${count} items
+  ${count > 1 ? 'many' : 'one'}
+  plain text
+`;
+const key = "name";
+'''
+
+JSON_DOCUMENT = '''{
+  "name": "client",
+  "os": [
+    "darwin",
+    "linux"
+  ],
+  "private": true
+}
+'''
+
+SURROUNDING_BLANK_LINES = "\n\nimport os\n\n\nos.getcwd()\n\n\n"
+
+@pytest.mark.parametrize("filename, language, content", [
+    ("module.py", "Python", PYTHON_MODULE),
+    ("greeting.py", "Python", F_STRINGS),
+    ("label.js", "JavaScript", TEMPLATE_LITERALS),
+    ("package.json", "JSON", JSON_DOCUMENT),
+    ("padded.py", "Python", SURROUNDING_BLANK_LINES),
+])
+def test_agrees_with_pygount(filename, language, content):
+    analysis = pygount.SourceAnalysis.from_file(filename, "pygount", file_handle=io.BytesIO(content.encode()))
+
+    counts = count_lines(content, COMMENT_SYNTAX[language])
+
+    assert counts.code == analysis.code_count
+    assert counts.comment == analysis.documentation_count
+    assert counts.string == analysis.string_count
+    assert counts.blank == analysis.empty_count
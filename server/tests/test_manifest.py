@@ -0,0 +1,98 @@
+"""
+Tests for re-analyzing only the files a push changed
+"""
+import io
+import zipfile
+from dataclasses import asdict
+
+import pytest
+
+from app.routes import analyze
+from app.services import manifest_service, pipeline
+from app.services.manifest_service import read_archive_changes
+from app.services.pipeline import FileAnalysis, file_cache
+
+REPO_URL = "https://github.com/alice/project"
+
+FLASK_APP = b"import flask\n\napp = flask.Flask(__name__)\n"
+PANDAS_MODEL = b"import pandas as pd\n\nframe = pd.DataFrame()\n"
+DJANGO_VIEWS = b"import django\nfrom django.http import HttpResponse\n"
+
+@pytest.fixture
+def analyzed(monkeypatch):
+    """Paths of the files actually analyzed"""
+    paths = []
+    analyze_files = pipeline.analyze_sources_timed
+
+    def recording_analyze(files):
+        paths.extend(path for path, _ in files)
+        return analyze_files(files)
+
+    monkeypatch.setattr(pipeline, "analyze_sources_timed", recording_analyze)
+    return paths
+
+def analyze_repo(client):
+    response = client.post("/analyze/analyze/github", json={"repository_url": REPO_URL, "branch": "main"})
+    assert response.status_code == 200
+    # Only the manifest may let the next run skip files
+    file_cache.clear()
+    return response.json()
+
+def test_unchanged_files_are_reused(github, client, analyzed):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP, "model.py": PANDAS_MODEL})
+    analyze_repo(client)
+
+    github.push("alice", "project", "main", {"app.py": FLASK_APP, "model.py": PANDAS_MODEL, "views.py": DJANGO_VIEWS})
+    result = analyze_repo(client)
+
+    assert sorted(analyzed) == ["app.py", "model.py", "views.py"]
+    assert result["libraries"] == ["django", "flask", "pandas"]
+
+def test_modified_files_are_analyzed_again(github, client, analyzed):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP, "model.py": PANDAS_MODEL})
+    analyze_repo(client)
+
+    github.push("alice", "project", "main", {"app.py": DJANGO_VIEWS, "model.py": PANDAS_MODEL})
+    result = analyze_repo(client)
+
+    assert sorted(analyzed) == ["app.py", "app.py", "model.py"]
+    assert result["libraries"] == ["django", "pandas"]
+
+def test_deleted_files_are_dropped(github, client, analyzed):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP, "model.py": PANDAS_MODEL})
+    analyze_repo(client)
+
+    github.push("alice", "project", "main", {"model.py": PANDAS_MODEL})
+
+    assert analyze_repo(client)["libraries"] == ["pandas"]
+    assert sorted(analyzed) == ["app.py", "model.py"]
+
+def test_manifest_of_other_rules_is_ignored(github, client, analyzed, monkeypatch):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP})
+    analyze_repo(client)
+
+    monkeypatch.setattr(manifest_service, "RULES_VERSION", "other")
+    assert analyze.repo_manifests.load("alice", "project", "main") == {}
+
+    github.push("alice", "project", "main", {"app.py": FLASK_APP, "model.py": PANDAS_MODEL})
+    analyze_repo(client)
+
+    assert sorted(analyzed) == ["app.py", "app.py", "model.py"]
+
+def test_read_archive_changes_compares_checksums():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("project-main/same.py", FLASK_APP)
+        archive.writestr("project-main/changed.py", PANDAS_MODEL)
+        archive.writestr("project-main/new.py", DJANGO_VIEWS)
+    same = FileAnalysis(path="same.py", language="Python", size=len(FLASK_APP), libraries=["flask"])
+    previous = {
+        "same.py": {"crc": zipfile.crc32(FLASK_APP), "size": len(FLASK_APP), "analysis": asdict(same)},
+        "changed.py": {"crc": 0, "size": len(PANDAS_MODEL), "analysis": asdict(same)},
+    }
+
+    entries = read_archive_changes(buffer.getvalue(), previous)
+
+    assert [entry.path for entry in entries] == ["same.py", "changed.py", "new.py"]
+    assert entries[0].analysis == same and entries[0].info is None
+    assert [entry.analysis for entry in entries[1:]] == [None, None]
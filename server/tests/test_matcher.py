@@ -0,0 +1,47 @@
+"""
+Tests for counting many patterns in one text
+"""
+import re
+from pathlib import Path
+
+import pytest
+
+from app.core.languages import LANGUAGE_PATTERNS
+from app.core.matcher import MultiPatternMatcher, required_literals
+from app.core.skills import SkillExtractor
+
+APP_DIR = Path(__file__).parent.parent / "app"
+
+SAMPLES = [
+    "import numpy as np\nfrom flask import Flask\nimport React from 'react';\n",
+    "@RestController\nclass Api {}\n<div class=\"btn container text-lg bg-red\">tailwind</div>\n",
+    "",
+] + [path.read_text() for path in sorted(APP_DIR.rglob("*.py"))[:20]]
+
+RULE_SETS = [LANGUAGE_PATTERNS] + list(SkillExtractor().patterns.values())
+
+def findall_counts(rules, text):
+    """Counts of the per-pattern re.findall loop the matcher replaces"""
+    return {label: [len(re.findall(pattern, text)) for pattern in patterns] for label, patterns in rules.items()}
+
+@pytest.mark.parametrize("rules", RULE_SETS)
+def test_counts_equal_findall(rules):
+    matcher = MultiPatternMatcher(rules)
+
+    for text in SAMPLES:
+        assert matcher.count(text) == findall_counts(rules, text)
+
+def test_cap_limits_counts():
+    matcher = MultiPatternMatcher({"a": [r"a", r"b"]})
+
+    assert matcher.count("aaaa b", cap=2) == {"a": [2, 1]}
+
+@pytest.mark.parametrize("pattern, literals", [
+    (r"import\s+React", ["import", "React"]),
+    (r"@RestController", ["@RestController"]),
+    (r"colou?r", ["colo"]),
+    (r"a|b", []),
+    (r"(?i)select", []),
+])
+def test_required_literals(pattern, literals):
+    assert required_literals(pattern) == literals
@@ -0,0 +1,40 @@
+"""
+Tests for developer profiles built from a user's repositories
+"""
+from app.routes import analyze
+
+FLASK_APP = b"import flask\nfrom flask import Flask\n\napp = Flask(__name__)\n"
+PANDAS_MODEL = b"import pandas\nimport pandas as pd\n\nframe = pd.DataFrame()\n"
+
+def get_profile(client, username="alice"):
+    response = client.get(f"/api/api/profile/{username}")
+    assert response.status_code == 200
+    return response.json()
+
+def test_profile_merges_repositories(github, client):
+    github.push("alice", "web", "main", {"app.py": FLASK_APP})
+    github.push("alice", "data", "main", {"model.py": PANDAS_MODEL})
+
+    profile = get_profile(client)
+
+    assert profile["analysis"]["libraries"] == ["flask", "pandas"]
+    assert sorted(repo["name"] for repo in profile["repositories"]) == ["data", "web"]
+
+def test_unpushed_repositories_skip_the_commit_lookup(github, client):
+    github.push("alice", "web", "main", {"app.py": FLASK_APP})
+    get_profile(client)
+    resolved = github.requests["commits"] + github.requests["commits_not_modified"]
+
+    get_profile(client)
+
+    assert github.requests["commits"] + github.requests["commits_not_modified"] == resolved
+    assert github.requests["archive"] == 1
+
+def test_registry_change_refreshes_profile(github, client, monkeypatch):
+    github.push("alice", "web", "main", {"app.py": FLASK_APP})
+    get_profile(client)
+
+    monkeypatch.setattr(analyze, "registry_digest", lambda: "0" * 64)
+    get_profile(client)
+
+    assert github.requests["archive"] == 2
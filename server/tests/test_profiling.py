@@ -0,0 +1,87 @@
+"""
+Tests for profiling requests on demand
+"""
+import pytest
+
+from app.routes import profiles
+from app.services import profiling
+from app.services.profiling import ProfileStore
+
+TOKEN = "admin-secret"
+FLASK_APP = ("app.py", b"import flask\n\napp = flask.Flask(__name__)\n", "text/x-python")
+
+@pytest.fixture
+def store(monkeypatch):
+    """Profiling enabled with TOKEN, and an empty profile store"""
+    fresh = ProfileStore()
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", TOKEN)
+    monkeypatch.setattr(profiling, "profile_store", fresh)
+    monkeypatch.setattr(profiles, "profile_store", fresh)
+    return fresh
+
+def profile_analysis(client, headers):
+    return client.post("/analyze/analyze/file", files={"file": FLASK_APP}, headers=headers)
+
+@pytest.mark.parametrize("headers", [
+    {"X-Profile": "cprofile"},
+    {"X-Profile": "cprofile", "X-Profile-Token": "wrong"},
+    {"X-Profile": "cprofile", "X-Profile-Token": ""},
+])
+def test_requests_without_the_token_are_rejected(client, store, headers):
+    response = profile_analysis(client, headers)
+
+    assert response.status_code == 403
+    assert "X-Profile-Id" not in response.headers
+    assert store.list() == []
+
+def test_profiling_is_disabled_without_a_configured_token(client, store, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", None)
+
+    response = profile_analysis(client, {"X-Profile": "cprofile", "X-Profile-Token": "None"})
+
+    assert response.status_code == 403
+    assert client.get("/admin/profiles", headers={"X-Profile-Token": "None"}).status_code == 403
+
+@pytest.mark.parametrize("headers", [{}, {"X-Profile-Token": "wrong"}])
+def test_admin_routes_require_the_token(client, store, headers):
+    assert client.get("/admin/profiles", headers=headers).status_code == 403
+    assert client.get("/admin/profiles/anything", headers=headers).status_code == 403
+
+def test_requests_without_profiling_need_no_token(client, store):
+    response = profile_analysis(client, {"X-Profile-Token": "wrong"})
+
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+
+def test_unknown_mode_is_rejected(client, store):
+    response = profile_analysis(client, {"X-Profile": "perf", "X-Profile-Token": TOKEN})
+
+    assert response.status_code == 400
+    assert store.list() == []
+
+def test_profile_is_stored_for_download(client, store):
+    response = profile_analysis(client, {"X-Profile": "cprofile", "X-Profile-Token": TOKEN})
+
+    assert response.status_code == 200
+    assert response.json()["libraries"] == ["flask"]
+    profile_id = response.headers["X-Profile-Id"]
+
+    admin = {"X-Profile-Token": TOKEN}
+    listed = client.get("/admin/profiles", headers=admin).json()
+    assert [(summary["profile_id"], summary["target"]) for summary in listed] == [(profile_id, "/analyze/analyze/file")]
+
+    text = client.get(f"/admin/profiles/{profile_id}?format=text", headers=admin)
+    assert text.status_code == 200
+    assert f'filename="{profile_id}.txt"' in text.headers["content-disposition"]
+    assert client.get(f"/admin/profiles/{profile_id}?format=collapsed", headers=admin).status_code == 400
+    assert client.get("/admin/profiles/missing", headers=admin).status_code == 404
+
+def test_inline_output_replaces_the_response(client, store):
+    response = profile_analysis(
+        client,
+        {"X-Profile": "sampling", "X-Profile-Token": TOKEN, "X-Profile-Output": "inline"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert store.get(response.headers["X-Profile-Id"]).mode == "sampling"
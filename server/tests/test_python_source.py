@@ -0,0 +1,125 @@
+"""
+Tests for the single-parse analysis of Python source code
+"""
+import textwrap
+
+import pytest
+
+from app.core.python_source import parse_python_source
+
+def source(code):
+    return textwrap.dedent(code).lstrip("\n")
+
+# (code, complexity, blocks): each block scores 1 plus its decision points
+COMPLEXITY_CASES = [
+    ("x = 1\n", 0, 0),
+    ("def f():\n    return 1\n", 1, 1),
+    (source("""
+        def f(a, b):
+            if a and b or a:
+                return 1
+            elif b:
+                return 2
+            return 3 if a else 4
+    """), 6, 1),
+    (source("""
+        def f(items):
+            for item in items:
+                while item:
+                    item -= 1
+            else:
+                pass
+            return [x for x in items if x if x > 1]
+    """), 7, 1),
+    (source("""
+        def f():
+            try:
+                pass
+            except ValueError:
+                pass
+            except KeyError:
+                pass
+            else:
+                pass
+            finally:
+                pass
+    """), 4, 1),
+    (source("""
+        def f(value):
+            match value:
+                case 1:
+                    pass
+                case [x]:
+                    pass
+                case _:
+                    pass
+            assert value and value or value
+    """), 4, 1),
+    (source("""
+        class A:
+            def one(self):
+                return 1
+
+            def two(self, x):
+                def inner():
+                    if x:
+                        return 1
+                return inner
+
+            class B:
+                def ignored(self):
+                    if self:
+                        pass
+
+        async def g(items):
+            async for item in items:
+                pass
+    """), 4, 3),
+]
+
+@pytest.mark.parametrize("code,complexity,blocks", COMPLEXITY_CASES)
+def test_complexity(code, complexity, blocks):
+    parsed = parse_python_source(code)
+
+    assert (parsed.complexity, parsed.complexity_blocks) == (complexity, blocks)
+
+@pytest.mark.parametrize("code", [code for code, _, _ in COMPLEXITY_CASES])
+def test_complexity_matches_radon(code):
+    radon = pytest.importorskip("radon.complexity")
+
+    blocks = [block for block in radon.cc_visit(code) if not hasattr(block, "methods")]
+    parsed = parse_python_source(code)
+
+    assert parsed.complexity == sum(block.complexity for block in blocks)
+    assert parsed.complexity_blocks == len(blocks)
+
+def test_imports_are_absolute_top_level_packages():
+    parsed = parse_python_source(source("""
+        import os.path, json
+        from flask import Flask
+        from . import views
+        from .models import User
+
+        def load():
+            import numpy as np
+            return "import pandas"
+    """))
+
+    assert parsed.imports == ["os", "json", "flask", "numpy"]
+
+def test_definitions_are_counted():
+    parsed = parse_python_source(source("""
+        class A:
+            def f(self):
+                def g():
+                    pass
+
+        async def h():
+            pass
+    """))
+
+    assert (parsed.functions, parsed.classes) == (3, 1)
+
+def test_invalid_code_is_none():
+    assert parse_python_source("def f(:\n") is None
+    assert parse_python_source("x = 1\0") is None
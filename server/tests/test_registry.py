@@ -0,0 +1,94 @@
+"""
+Tests for reloading the rule and resource registry
+"""
+import json
+import os
+
+import pytest
+
+from app.core.registry import RuleRegistry
+
+RESOURCES = {"python": {"name": "Python", "category": "Backend"}}
+SKILL_RULES = {"libraries": {"flask": "Backend"}}
+
+def write(path, content, mtime_ns):
+    path.write_text(json.dumps(content))
+    # Distinct modification times, however coarse the file system clock
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+@pytest.fixture
+def files(tmp_path):
+    resources, skill_rules = tmp_path / "resources.json", tmp_path / "skill_rules.json"
+    write(resources, RESOURCES, 10**18)
+    write(skill_rules, SKILL_RULES, 10**18)
+    return resources, skill_rules
+
+def make_registry(files, check_interval=0.0):
+    resources, skill_rules = files
+    return RuleRegistry(
+        resources_path=resources,
+        skill_rules_path=skill_rules,
+        default_resources=lambda: RESOURCES,
+        default_skill_rules=lambda: SKILL_RULES,
+        check_interval=check_interval,
+        views={"skills": lambda resources, skill_rules: sorted(resources)},
+    )
+
+def test_changed_file_is_reloaded(files):
+    registry = make_registry(files)
+    before = registry.snapshot()
+
+    write(files[0], {**RESOURCES, "rust": {"name": "Rust"}}, 2 * 10**18)
+    after = registry.snapshot()
+
+    assert after.version == before.version + 1
+    assert after.digest != before.digest
+    assert after.view("skills") == ["python", "rust"]
+    # Running requests keep the snapshot they started with
+    assert before.view("skills") == ["python"]
+    assert "rust" not in before.resources
+
+def test_unchanged_files_keep_the_snapshot(files):
+    registry = make_registry(files)
+
+    assert registry.snapshot() is registry.snapshot()
+
+def test_invalid_file_keeps_the_previous_snapshot(files):
+    registry = make_registry(files)
+    before = registry.snapshot()
+
+    files[1].write_text("{not json")
+    os.utime(files[1], ns=(2 * 10**18, 2 * 10**18))
+
+    assert registry.snapshot() is before
+    assert registry.last_error.startswith("Failed to reload registry")
+
+    write(files[1], {"libraries": {"django": "Backend"}}, 3 * 10**18)
+    assert registry.snapshot().skill_rules["libraries"] == {"django": "Backend"}
+    assert registry.last_error is None
+
+def test_checks_are_throttled(files):
+    registry = make_registry(files, check_interval=3600)
+    before = registry.snapshot()
+
+    write(files[0], {}, 2 * 10**18)
+
+    assert registry.snapshot() is before
+    assert registry.reload().resources == {}
+
+def test_digest_is_the_same_in_every_process(files):
+    assert make_registry(files).snapshot().digest == make_registry(files).snapshot().digest
+
+def test_missing_files_are_created_from_defaults(tmp_path):
+    files = (tmp_path / "rules" / "resources.json", tmp_path / "rules" / "skill_rules.json")
+
+    snapshot = make_registry(files).snapshot()
+
+    assert snapshot.resources == RESOURCES
+    assert json.loads(files[1].read_text()) == SKILL_RULES
+
+def test_snapshots_are_read_only(files):
+    snapshot = make_registry(files).snapshot()
+
+    with pytest.raises(TypeError):
+        snapshot.resources["rust"] = {}
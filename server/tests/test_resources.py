@@ -0,0 +1,34 @@
+"""
+Tests for serving learning resources with ETags
+"""
+import pytest
+
+def get_resources(client, skill_name, etag=None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(f"/resources/resources/{skill_name}", headers=headers)
+
+@pytest.mark.parametrize("alias", ["torch", "Torch", "PyTorch"])
+def test_aliases_share_the_canonical_payload(client, alias):
+    canonical = get_resources(client, "pytorch")
+
+    response = get_resources(client, alias)
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == canonical.headers["etag"]
+    assert response.json() == canonical.json()
+
+def test_alias_honours_if_none_match(client):
+    etag = get_resources(client, "pytorch").headers["etag"]
+
+    response = get_resources(client, "torch", etag)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+@pytest.mark.parametrize("skill_name", ["sklearn", "unknown-skill"])
+def test_generated_info_honours_if_none_match(client, skill_name):
+    response = get_resources(client, skill_name)
+    assert response.status_code == 200
+    assert response.json()["resources"]
+
+    assert get_resources(client, skill_name, response.headers["etag"]).status_code == 304
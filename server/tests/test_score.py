@@ -0,0 +1,61 @@
+"""
+Tests for scoring skill categories of many profiles at once
+"""
+from app.core.score import SkillScorer
+from app.utils.code_analysis import calculate_skill_level_distribution
+from app.utils.helpers import calculate_skill_scores
+
+PROFILES = [
+    {"Python": ["flask", "pandas", "numpy", "torch"], "JavaScript": ["react"]},
+    {"JavaScript": ["react", "vue", "express"]},
+    {"Python": ["django"]},
+    {"Rust": ["serde"]},
+    {},
+    {"TypeScript": ["@angular/core", "@prisma/client", "left-pad"], "Go": []},
+]
+
+def reference_scores(scorer, language_libraries):
+    """Category scores the way score_skills computed them one profile at a time"""
+    counts, total = {}, 0
+    for language, libraries in language_libraries.items():
+        for token, weight in [(language, 3)] + [(library, 1) for library in libraries]:
+            category = scorer.index.category(token)
+            if category:
+                counts[category] = counts.get(category, 0) + weight
+                total += weight
+    return {category: score / 100 for category, score in calculate_skill_scores(counts, total).items()}
+
+def test_batch_rows_match_single_profiles():
+    scorer = SkillScorer()
+
+    batch = scorer.score_batch(PROFILES)
+
+    for row, profile in enumerate(PROFILES):
+        skills = batch.skill_scores(row, scorer._get_learning_resources)
+        expected = reference_scores(scorer, profile)
+        assert {skill.name: skill.score for skill in skills} == expected
+        assert [skill.score for skill in skills] == sorted(expected.values(), reverse=True)
+        assert skills == scorer.score_skills(profile)
+
+def test_batch_levels_match_the_level_distribution():
+    scorer = SkillScorer()
+
+    batch = scorer.score_batch(PROFILES)
+
+    for row, profile in enumerate(PROFILES):
+        skills = [skill.dict() for skill in scorer.score_skills(profile)]
+        assert batch.levels(row) == calculate_skill_level_distribution(skills)
+
+def test_unknown_tokens_score_nothing():
+    scorer = SkillScorer()
+
+    batch = scorer.score_batch([{"Brainfuck": ["left-pad"]}])
+
+    assert not batch.detected.any()
+    assert batch.skill_scores(0, scorer._get_learning_resources) == []
+    assert sum(batch.levels(0).values()) == 0
+
+def test_empty_batch():
+    batch = SkillScorer().score_batch([])
+
+    assert batch.counts.shape == (0, len(batch.categories))
@@ -0,0 +1,74 @@
+"""
+Tests for looking up skills by library and language tokens
+"""
+from app.core.skill_classifier import classify_skills
+from app.core.skill_index import SkillIndex, SkillEntry, build_skill_index
+
+RESOURCES = {
+    "pytorch": {"name": "PyTorch", "category": "Machine Learning", "description": "Deep learning"},
+    "React Native": {"name": "React Native", "resources": []},
+}
+SKILL_RULES = {
+    "categories": {"Backend": {"libraries": ["flask"]}},
+    "languages": {"Python": "Backend"},
+    "libraries": {"flask": "Web", "sklearn": "Data Science"},
+}
+
+def test_aliases_resolve_to_the_canonical_skill():
+    index = build_skill_index(RESOURCES, SKILL_RULES)
+
+    assert index.lookup("torch") is index.lookup("pytorch")
+    assert index.lookup("torch").name == "PyTorch"
+    assert index.lookup("Node.js") is index.lookup("node")
+    assert index.lookup("@prisma/client").key == "prisma"
+
+def test_tokens_are_normalized():
+    index = build_skill_index(RESOURCES, SKILL_RULES)
+
+    assert index.lookup("react_native").key == "react-native"
+    assert index.lookup("React Native").name == "React Native"
+    assert index.lookup("PYTHON").key == "python"
+    assert index.lookup("unknown-library") is None
+    assert index.category("unknown-library") is None
+
+def test_later_sources_take_precedence():
+    index = build_skill_index(RESOURCES, SKILL_RULES)
+
+    # skill_rules.json libraries over its categories
+    assert index.category("flask") == "Web"
+    # languages over the fallback categories
+    assert index.category("python") == "Backend"
+    # resources.json over everything
+    assert index.category("pytorch") == "Machine Learning"
+    # resources.json without a category keeps the rules' one
+    assert index.category("react-native") == "Mobile"
+    assert index.lookup("pytorch").description == "Deep learning"
+    assert index.lookup("flask").resources is None
+
+def test_aliases_do_not_hide_real_entries():
+    # "sklearn" has its own rule, so it is not an alias of scikit-learn
+    index = build_skill_index(RESOURCES, SKILL_RULES)
+
+    assert index.category("sklearn") == "Data Science"
+    assert index.category("scikit") == "Machine Learning"
+
+def test_category_ids_follow_sorted_categories():
+    entries = {
+        "vue": SkillEntry(key="vue", name="Vue", category="Frontend"),
+        "django": SkillEntry(key="django", name="Django", category="Backend"),
+        "yaml": SkillEntry(key="yaml", name="Yaml", category=None),
+    }
+    index = SkillIndex(entries)
+
+    assert index.categories == ("Backend", "Frontend")
+    assert index.category_id("vuejs") == 1
+    assert index.category_id("django") == 0
+    assert index.category_id("yaml") is None
+
+def test_classifier_names_aliased_libraries_canonically():
+    index = build_skill_index(RESOURCES, SKILL_RULES)
+
+    skills = classify_skills("Python", ["torch", "left-pad"], index=index)
+
+    assert [skill.name for skill in skills] == ["Python", "PyTorch"]
+    assert skills[1].description == "Deep learning"
@@ -0,0 +1,88 @@
+"""
+Tests for streaming analysis progress as Server-Sent Events
+"""
+import functools
+import io
+import json
+import zipfile
+
+import pytest
+
+from app.routes import analyze
+from app.services.pipeline import AnalysisBudget
+
+FLASK_APP = b"import flask\n\napp = flask.Flask(__name__)\n"
+PANDAS_MODEL = b"import pandas as pd\n\nframe = pd.DataFrame()\n"
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for path, content in files.items():
+            archive.writestr(path, content)
+    return buffer.getvalue()
+
+def parse_events(text):
+    """(event, data) pairs of an event stream"""
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+@pytest.fixture
+def one_file_windows(monkeypatch):
+    """Analyze uploads one file at a time, so each file gets a skills event"""
+    monkeypatch.setattr(analyze, "AnalysisBudget", functools.partial(AnalysisBudget, window_files=1))
+
+def test_file_stream_reports_progress_and_result(client, one_file_windows):
+    data = make_zip({"app.py": FLASK_APP, "model.py": PANDAS_MODEL})
+
+    response = client.post("/analyze/analyze/stream/file", files={"file": ("repo.zip", data, "application/zip")})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[-1] == "result"
+    assert ("phase", {"phase": "analyzing", "files_total": 2}) in events
+
+    skills = [data for name, data in events if name == "skills"]
+    assert [event["files_done"] for event in skills] == [1, 2]
+    assert all(event["files_total"] == 2 for event in skills)
+    # Partial scores grow into the final result
+    result = events[-1][1]
+    assert skills[-1]["analysis"]["skills"] == result["skills"]
+    assert result["lines_of_code"] == skills[-1]["analysis"]["lines_of_code"] == 4
+
+def test_final_result_matches_the_plain_endpoint(client):
+    files = {"file": ("app.py", FLASK_APP, "text/x-python")}
+
+    streamed = parse_events(client.post("/analyze/analyze/stream/file", files=files).text)[-1][1]
+    plain = client.post("/analyze/analyze/file", files=files).json()
+
+    for result in (streamed, plain):
+        result.pop("timestamp")
+    assert streamed == plain
+
+def test_errors_end_the_stream_with_a_result(client):
+    files = {"file": ("repo.zip", b"not a zip", "application/zip")}
+
+    events = parse_events(client.post("/analyze/analyze/stream/file", files=files).text)
+
+    name, result = events[-1]
+    assert name == "result"
+    assert "not a zip file" in result["error"]
+
+def test_github_stream(github, client):
+    github.push("alice", "project", "main", {"app.py": FLASK_APP})
+
+    response = client.post(
+        "/analyze/analyze/stream/github",
+        json={"repository_url": "https://github.com/alice/project", "branch": "main"},
+    )
+
+    events = parse_events(response.text)
+    phases = [data["phase"] for name, data in events if name == "phase"]
+    assert phases[:2] == ["resolving", "downloading"]
+    assert events[-1][0] == "result"
+    assert events[-1][1]["filename"] == "project"
+    assert events[-1][1]["error"] is None
@@ -0,0 +1,86 @@
+"""
+Tests for per-request phase timings and the metrics endpoint
+"""
+import pytest
+
+from app import main
+from app.services import tracing
+from app.services.tracing import MetricsRegistry, RequestTrace
+
+FLASK_APP = ("app.py", b"import flask\n\napp = flask.Flask(__name__)\n", "text/x-python")
+
+@pytest.fixture
+def metrics(monkeypatch):
+    """Fresh process metrics"""
+    fresh = MetricsRegistry()
+    monkeypatch.setattr(main, "metrics", fresh)
+    monkeypatch.setattr(tracing, "metrics", fresh)
+    return fresh
+
+def parse_server_timing(header):
+    """Parameters of each Server-Timing entry, by name"""
+    entries = {}
+    for entry in header.split(", "):
+        name, _, parameter = entry.partition(";")
+        key, _, value = parameter.partition("=")
+        entries[name] = (key, value.strip('"'))
+    return entries
+
+def test_server_timing_reports_phases_and_counters(client, metrics):
+    response = client.post("/analyze/analyze/file", files={"file": FLASK_APP})
+
+    timing = parse_server_timing(response.headers["Server-Timing"])
+    for phase in ("parse", "extraction", "lines", "scoring", "serialization", "total"):
+        key, value = timing[phase]
+        assert key == "dur" and float(value) >= 0
+    assert timing["files_read"] == ("desc", "1")
+    assert timing["file_cache_misses"] == ("desc", "1")
+    assert timing["file_cache_hit_rate"] == ("desc", "0.00")
+
+def test_cached_files_skip_analysis_phases(client, metrics):
+    client.post("/analyze/analyze/file", files={"file": FLASK_APP})
+
+    response = client.post("/analyze/analyze/file", files={"file": FLASK_APP})
+
+    timing = parse_server_timing(response.headers["Server-Timing"])
+    assert "parse" not in timing
+    assert timing["files_analyzed"] == ("desc", "0")
+    assert timing["file_cache_hit_rate"] == ("desc", "1.00")
+
+def test_every_response_has_a_total(client, metrics):
+    timing = parse_server_timing(client.get("/health").headers["Server-Timing"])
+
+    assert "total" in timing
+
+def test_metrics_sum_requests_by_route(client, metrics):
+    client.post("/analyze/analyze/file", files={"file": FLASK_APP})
+    client.post("/analyze/analyze/file", files={"file": FLASK_APP})
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert 'skilllens_requests_total{route="/analyze/analyze/file",method="POST",status="200"} 2' in lines
+    assert 'skilllens_requests_total{route="unmatched",method="GET",status="404"} 1' in lines
+    assert 'skilllens_request_duration_seconds_count{route="/analyze/analyze/file"} 2' in lines
+    assert "skilllens_files_read_total 2" in lines
+    assert "skilllens_file_cache_hit_ratio 0.5" in lines
+    assert any(line.startswith('skilllens_phase_seconds_total{phase="parse"}') for line in lines)
+
+def test_updates_after_the_request_go_to_the_metrics(metrics):
+    trace, token = tracing.start_trace()
+    tracing.record_count("files_read", 2)
+    tracing.end_trace(token)
+
+    tracing.record_count("files_read")
+
+    assert trace.counters == {"files_read": 2}
+    assert metrics.counters["files_read"] == 1
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+
+    registry.observe_request('/a"b', "GET", 200, 0.001, RequestTrace())
+
+    assert 'route="/a\\"b"' in registry.render()